@@ -0,0 +1,123 @@
+import argparse
+import json
+import os
+import sys
+
+# Nothing is drawn, pygame is only imported by the algorithms' modules
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from pathfinding.constants import MOVEMENTS, MOVE_4
+from pathfinding.graph import GRAPH_ALGORITHMS, CSRGraph, GraphAStar
+from pathfinding.grid import Grid
+from pathfinding.headless import run_search
+from pathfinding.heuristics import HEURISTICS
+from pathfinding.map_format import GridMap
+from pathfinding.maze_algorithms import MAZE_ALGORITHMS, generate_maze_map
+from pathfinding.movingai import load_map as load_movingai_map
+from pathfinding.pathfinding_algorithms import ALGORITHMS
+from sorting.headless import run_generated_sort
+from sorting.sorting_algorithms import SORTING_ALGORITHMS
+
+# Headless runs of the sorting and pathfinding algorithms, printing their counters and timings as JSON:
+#   python -m algoassist sort "Quick Sort" --size 1000 --seed 1
+#   python -m algoassist path A* --maze Kruskal --width 101 --height 101 --seed 1
+#   python -m algoassist path JPS --map arena.map --movement "8-way strict" --heuristic Octile
+#   python -m algoassist graph Dijkstra USA-road-d.NY.gr --source 1 --target 200000
+
+def run_sort_command(args):
+    return [run_generated_sort(args.algorithm, args.size, args.seed, not args.descending) for _ in range(args.repeat)]
+
+def run_path_command(args, parser):
+    if args.map:
+        if args.map.endswith(".map"):
+            grid = Grid.from_map(load_movingai_map(args.map))
+        else:
+            with GridMap.load(args.map) as grid_map:
+                grid = Grid.from_map(grid_map)
+    else:
+        grid = Grid.from_map(generate_maze_map(args.maze, args.width, args.height, seed=args.seed))
+    grid.update_valid_neighbors(args.movement)
+
+    # Mazes keep their corners open, on a loaded map the first and last open cells are used
+    open_cells = [(cell.col, cell.row) for row in grid.grid for cell in row if not cell.is_barrier()]
+    if not open_cells:
+        parser.error("the map has no open cells")
+    start = tuple(args.start) if args.start else open_cells[0]
+    goal = tuple(args.goal) if args.goal else open_cells[-1]
+    for col, row in (start, goal):
+        if not (0 <= col < grid.cols and 0 <= row < grid.rows) or grid.grid[row][col].is_barrier():
+            parser.error(f"({col}, {row}) is a barrier or outside the {grid.cols}x{grid.rows} grid")
+
+    # Only ARA* has a time budget, the other searches run to the end
+    options = {}
+    if args.time_budget is not None:
+        if args.algorithm != "ARA*":
+            parser.error("--time-budget only applies to ARA*")
+        options["time_budget"] = args.time_budget
+
+    results = []
+    for _ in range(args.repeat):
+        metrics = run_search(grid, args.algorithm, start, goal, HEURISTICS[args.heuristic], track_memory=args.memory, **options)
+        results.append(dict(metrics.to_dict(), nodes_visited=metrics.nodes_visited, start=start, goal=goal))
+    return results
+
+def run_graph_command(args, parser):
+    graph = CSRGraph.load_dimacs(args.graph, args.coordinates)
+    if args.algorithm == "A*" and graph.positions is None:
+        parser.error("A* needs the node coordinates, pass the .co file with --coordinates")
+    for node in (args.source, args.target):
+        if not 1 <= node <= graph.node_count:
+            parser.error(f"node {node} isn't in the graph (1 to {graph.node_count})")
+
+    results = []
+    for _ in range(args.repeat):
+        algorithm_class = GRAPH_ALGORITHMS[args.algorithm]
+        algorithm = algorithm_class(graph, HEURISTICS[args.heuristic]) if algorithm_class is GraphAStar else algorithm_class(graph)
+        metrics = algorithm.find_path(args.source - 1, args.target - 1)  # DIMACS numbers nodes from 1
+        results.append(dict(metrics.to_dict(), nodes=graph.node_count, edges=graph.edge_count, path_nodes=len(algorithm.path or ())))
+    return results
+
+def main(args=None):
+    # Options shared by both commands
+    run_parser = argparse.ArgumentParser(add_help=False)
+    run_parser.add_argument("--repeat", type=int, default=1, help="runs on the same input, for timing")
+
+    parser = argparse.ArgumentParser(prog="python -m algoassist", description="Run a sorting or pathfinding algorithm without a window and print its counters as JSON.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sort_parser = subparsers.add_parser("sort", parents=[run_parser], help="sort a generated list")
+    sort_parser.add_argument("algorithm", choices=SORTING_ALGORITHMS)
+    sort_parser.add_argument("--size", type=int, default=50, help="number of elements to sort")
+    sort_parser.add_argument("--seed", type=int, help="seed of the list, the same seed gives the same list")
+    sort_parser.add_argument("--descending", action="store_true")
+
+    path_parser = subparsers.add_parser("path", parents=[run_parser], help="search a generated maze or a loaded map")
+    path_parser.add_argument("algorithm", choices=ALGORITHMS)
+    path_parser.add_argument("--map", help="map file, .aamap or MovingAI .map (a maze is generated otherwise)")
+    path_parser.add_argument("--maze", default="Kruskal", choices=MAZE_ALGORITHMS)
+    path_parser.add_argument("--width", type=int, default=41)
+    path_parser.add_argument("--height", type=int, default=41)
+    path_parser.add_argument("--seed", type=int, help="seed of the maze")
+    path_parser.add_argument("--start", type=int, nargs=2, metavar=("COL", "ROW"))
+    path_parser.add_argument("--goal", type=int, nargs=2, metavar=("COL", "ROW"))
+    path_parser.add_argument("--heuristic", default="Manhattan", choices=HEURISTICS)
+    path_parser.add_argument("--movement", default=MOVE_4, choices=MOVEMENTS)
+    path_parser.add_argument("--memory", action="store_true", help="also measure peak memory (much slower)")
+    path_parser.add_argument("--time-budget", type=float, metavar="SECONDS", help="ARA*: seconds to find and improve a path")
+
+    graph_parser = subparsers.add_parser("graph", parents=[run_parser], help="search a DIMACS road network (.gr)")
+    graph_parser.add_argument("algorithm", choices=GRAPH_ALGORITHMS)
+    graph_parser.add_argument("graph", help="DIMACS .gr file")
+    graph_parser.add_argument("--coordinates", help="DIMACS .co file, needed by A*")
+    graph_parser.add_argument("--source", type=int, default=1, help="node number, from 1")
+    graph_parser.add_argument("--target", type=int, required=True)
+    graph_parser.add_argument("--heuristic", default="Euclidean", choices=HEURISTICS, help="A* heuristic on the coordinates")
+    args = parser.parse_args(args)
+
+    commands = {"sort": run_sort_command, "path": lambda args: run_path_command(args, parser), "graph": lambda args: run_graph_command(args, parser)}
+    results = commands[args.command](args)
+    json.dump(results[0] if len(results) == 1 else results, sys.stdout, indent=2)
+    print()
+
+if __name__ == "__main__":
+    main()
@@ -71,6 +71,79 @@ algorithms_info = {
         "space_complexity": "O(n)",
         "common_applications": ["Grid-based pathfinding", "Robotics", "Video games"]
     },
+    "Theta*": {
+        "title": "Theta* (Theta Star)",
+        "short_description": "Theta* is A* with any-angle paths, cutting straight across open space.",
+        "long_description": [
+            "Theta* searches like A*, but a cell's parent doesn't have to be its neighbor: when the parent of the cell being expanded can see a neighbor in a straight line, the neighbor is linked to that parent directly.",
+            "Paths are made of straight lines between the corners they go around instead of grid-aligned staircases, so they are shorter and look natural without smoothing them afterwards. Line-of-sight checks are cached for the rest of the search."
+        ],
+        "type": "Pathfinding Algorithm",
+        "time_complexity": "O(n log n) plus a line-of-sight check per generated node",
+        "space_complexity": "O(n), where n is the number of nodes in the grid",
+        "common_applications": ["Game unit movement", "Robot motion planning", "Any-angle navigation"]
+    },
+    "Lazy Theta*": {
+        "title": "Lazy Theta*",
+        "short_description": "Lazy Theta* defers Theta*'s line-of-sight checks until a cell is expanded.",
+        "long_description": [
+            "Lazy Theta* assumes every neighbor can see the parent of the cell being expanded, and only checks it once the neighbor itself is expanded. When the line turns out to be blocked, the cell takes the best of its expanded neighbors as its parent instead.",
+            "Most generated cells are never expanded, so it makes far fewer line-of-sight checks than Theta* for paths of nearly the same length, at a cost close to A*."
+        ],
+        "type": "Pathfinding Algorithm",
+        "time_complexity": "O(n log n) plus a line-of-sight check per expanded node",
+        "space_complexity": "O(n), where n is the number of nodes in the grid",
+        "common_applications": ["Game unit movement", "3D navigation", "Large open maps"]
+    },
+    "IDA*": {
+        "title": "Iterative Deepening A* (IDA*)",
+        "short_description": "IDA* repeats depth-first searches bounded by f, keeping the current path and a small table of costs in memory.",
+        "long_description": [
+            "IDA* runs a depth-first search that gives up on any path whose f (cost so far plus heuristic) goes over a threshold. When a round ends without reaching the goal, the threshold is raised to the lowest f that went over it and the search starts again.",
+            "It only stores the path it is exploring, so its memory stays tiny even on huge maps, but every round re-expands the cells of the previous ones. On its own it doesn't notice when two paths lead to the same cell, so here it also keeps a table of the cheapest cost each cell was reached with (up to a fixed number of cells) and skips cells reached again by a longer path.",
+            "When there is no path it still has to try every threshold, so it gives up after a fixed number of expansions and reports no path."
+        ],
+        "type": "Pathfinding Algorithm",
+        "time_complexity": "O(b^d) in the worst case, many re-expansions",
+        "space_complexity": "O(d) plus the fixed-size table, where d is the length of the path",
+        "common_applications": ["Puzzle solving (15-puzzle, Rubik's cube)", "Memory-constrained devices", "Game tree search"]
+    },
+    "Fringe": {
+        "title": "Fringe Search",
+        "short_description": "Fringe Search does IDA*'s rounds without restarting, keeping the frontier between rounds.",
+        "long_description": [
+            "Fringe Search works in rounds bounded by f like IDA*, but it keeps the cells that went over the threshold on a 'later' list and starts the next round from them instead of from the start. A cache of the best cost to each cell stops it from searching a cell twice.",
+            "The open list is never sorted, which makes each step cheaper than A*'s, and it expands about as many cells. It needs memory for every cell it reached, like A*."
+        ],
+        "type": "Pathfinding Algorithm",
+        "time_complexity": "O(n) per round, where n is the number of nodes reached",
+        "space_complexity": "O(n), where n is the number of nodes reached",
+        "common_applications": ["Game maps", "Real-time pathfinding", "Grid navigation"]
+    },
+    "SMA*": {
+        "title": "Simplified Memory-bounded A* (SMA*)",
+        "short_description": "SMA* is A* with a node limit, forgetting its worst nodes when memory is full.",
+        "long_description": [
+            "SMA* searches like A* but never keeps more than a fixed number of nodes. When memory runs out it forgets the leaf with the highest f and remembers that value in the leaf's parent, so the parent can regenerate it if everything else turns out worse.",
+            "It finds the shortest path as long as that path fits in memory, at the cost of re-expanding forgotten cells. In the visualizer it keeps at most 250 nodes."
+        ],
+        "type": "Pathfinding Algorithm",
+        "time_complexity": "O(b^d) in the worst case, depends on the node limit",
+        "space_complexity": "O(m), where m is the node limit",
+        "common_applications": ["Embedded systems", "Route planning with a memory budget", "Large state spaces"]
+    },
+    "ARA*": {
+        "title": "Anytime Repairing A* (ARA*)",
+        "short_description": "ARA* finds a path fast with an inflated heuristic, then keeps improving it while time allows.",
+        "long_description": [
+            "ARA* runs weighted A*, where the heuristic counts several times over, so the first path comes quickly but may be longer than the shortest. It then lowers the weight and repairs the search, reusing the costs it already found instead of starting over.",
+            "Every path comes with a bound: it's at most that many times longer than the shortest. The search stops when the bound reaches 1 or the time budget (1 second in the visualizer) runs out, keeping the best path so far."
+        ],
+        "type": "Pathfinding Algorithm",
+        "time_complexity": "O(b^d) per round, rounds reuse earlier work",
+        "space_complexity": "O(b^d)",
+        "common_applications": ["Robot motion planning", "Real-time games", "Planning with deadlines"]
+    },
     "Manhattan": {
         "title": "Manhattan Heuristic",
         "short_description": "Calculates distance by summing horizontal and vertical moves.",
@@ -104,6 +177,17 @@ algorithms_info = {
         "space_complexity": "O(1)",
         "common_applications": ["Diagonal movement in grid-based games", "3D navigation", "Robotics"]
     },
+    "Octile": {
+        "title": "Octile Heuristic",
+        "short_description": "Exact distance on an open grid with 8-way movement, diagonal steps costing sqrt(2).",
+        "long_description": [
+            "The Octile heuristic counts the diagonal steps needed to line up with the goal at a cost of sqrt(2) each, plus the straight steps left at a cost of 1. On a grid with 8-way movement it is the length of the shortest path when nothing is in the way, so it never overestimates and guides the search better than Euclidean."
+        ],
+        "type": "Heuristic Function",
+        "time_complexity": "O(1)",
+        "space_complexity": "O(1)",
+        "common_applications": ["8-way grid movement", "Jump Point Search", "Grid benchmarks"]
+    },
     "Dijkstra": {
         "title": "Dijkstra's Algorithm",
         "short_description": "Finds the shortest path by exploring all nodes evenly.",
@@ -160,6 +244,54 @@ algorithms_info = {
         "space_complexity": "O(n)",
         "common_applications": ["Maze generation", "Puzzle games"]
     },
+    "Eller": {
+        "title": "Eller's Algorithm",
+        "short_description": "Generates mazes one row at a time, keeping only the current row in memory.",
+        "long_description": [
+            "Eller's algorithm builds a perfect maze row by row. Each cell in the current row belongs to a set, neighboring cells from different sets are randomly joined, and every set carves down at least once so nothing gets cut off.",
+            "Because only the sets of the current row are remembered, it can stream mazes of any height, even endless ones. Press 'E' in the visualizer to scroll through an endless Eller maze."
+        ],
+        "type": "Maze Generation Algorithm",
+        "time_complexity": "O(n), where n is the number of cells",
+        "space_complexity": "O(w), where w is the width of the maze",
+        "common_applications": ["Endless mazes", "Very large mazes", "Procedural content generation"]
+    },
+    "Kruskal": {
+        "title": "Kruskal's Algorithm",
+        "short_description": "Joins cells through walls picked in random order, using union-find to avoid loops.",
+        "long_description": [
+            "Kruskal's algorithm starts with every cell in its own set and goes through the walls in a random order. A wall is carved only if the cells on each side are in different sets, and those sets are then merged.",
+            "The sets are kept in a union-find structure with path compression and union by size, so checking and merging is nearly constant time. The maze grows in many places at once, giving lots of short dead ends."
+        ],
+        "type": "Maze Generation Algorithm",
+        "time_complexity": "O(n log n), where n is the number of cells (shuffling the walls)",
+        "space_complexity": "O(n), where n is the number of cells",
+        "common_applications": ["Minimum spanning trees", "Network design", "Procedural content generation"]
+    },
+    "Prim": {
+        "title": "Prim's Algorithm",
+        "short_description": "Grows the maze from one cell by always carving the cheapest wall on its frontier.",
+        "long_description": [
+            "Randomized Prim's algorithm gives every wall a random weight and grows the maze outward from a single cell, always carving through the lightest wall that leads to a new cell.",
+            "The frontier walls are kept in a heap, so picking the next wall takes logarithmic time. The resulting mazes spread out from the start like a crystal and have many short branches."
+        ],
+        "type": "Maze Generation Algorithm",
+        "time_complexity": "O(n log n), where n is the number of cells",
+        "space_complexity": "O(n), where n is the number of cells",
+        "common_applications": ["Minimum spanning trees", "Network design", "Procedural content generation"]
+    },
+    "Wilson": {
+        "title": "Wilson's Algorithm",
+        "short_description": "Adds loop-erased random walks to the maze, giving every possible maze the same chance.",
+        "long_description": [
+            "Wilson's algorithm starts with a single cell in the maze. From a cell outside the maze it walks at random until it reaches the maze, erasing any loop the walk makes, and then carves the remaining path.",
+            "The mazes are uniform spanning trees: every perfect maze is equally likely, so they have no bias toward long corridors or short dead ends. The first walks can take a while, but they get faster as the maze grows."
+        ],
+        "type": "Maze Generation Algorithm",
+        "time_complexity": "O(n) expected walk steps per cell in the worst case, much less on average",
+        "space_complexity": "O(n), where n is the number of cells",
+        "common_applications": ["Uniform spanning trees", "Unbiased mazes", "Random graph sampling"]
+    },
     "Custom": {
         "title": "Custom Maze Setup",
         "short_description": "Manually place start, end, and barriers to customize the maze.",
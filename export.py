@@ -0,0 +1,192 @@
+import argparse
+import os
+import zlib
+from collections import deque
+from multiprocessing import Pool
+
+# Frames are drawn offscreen, no window is ever opened
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from pathfinding.grid import Grid
+from pathfinding.map_format import GridMap
+from pathfinding.trace import TraceReader
+from sorting.constants import SORTING_SECTION_WIDTH, WINDOW_HEIGHT, MIN_SPEED
+from sorting.helpers import initialize_sorting_algorithm
+from sorting.draw_utils import draw_list
+from sorting.sorting_algorithms import SORTING_ALGORITHMS
+from sorting.visualizer import initialize_sorting_visualizer
+from ui import COLORS
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional, it's only needed for GIF export
+    Image = None
+
+EXPORT_FRAME_SIZE = 660  # Longest side of pathfinding frames, in pixels
+EXPORT_FRAMES_PER_WORKER = 8  # Frames waiting to be encoded per worker, bounds the memory used
+EXPORT_MAX_FRAMES = 10000
+
+# Encodes frames on a process pool, as a numbered PNG sequence (path is a directory) or a GIF.
+# Frames are drawn in this process, only the encoding is spread over the workers.
+class FrameExporter:
+    def __init__(self, path, fps=60, processes=None):
+        self.path = path
+        self.fps = fps
+        self.gif = path.lower().endswith(".gif")
+        if self.gif and Image is None:
+            raise RuntimeError("GIF export needs Pillow (pip install pillow), or export a PNG sequence instead")
+        if not self.gif:
+            os.makedirs(path, exist_ok=True)
+
+        self.pool = Pool(processes)
+        self.pending = deque()
+        self.max_pending = (processes or os.cpu_count() or 1) * EXPORT_FRAMES_PER_WORKER
+        self.gif_frames = []  # Quantized frames in order, zlib compressed until the GIF is written
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, surface):
+        data = pygame.image.tobytes(surface, "RGB")
+        size = surface.get_size()
+        if self.gif:
+            self.pending.append(self.pool.apply_async(quantize_frame, (data, size)))
+        else:
+            frame_path = os.path.join(self.path, f"frame_{self.count:06d}.png")
+            self.pending.append(self.pool.apply_async(save_png_frame, (data, size, frame_path)))
+        self.count += 1
+
+        # Wait for the oldest frames when the workers fall behind
+        while len(self.pending) >= self.max_pending:
+            self.collect()
+
+    def collect(self):
+        result = self.pending.popleft().get()
+        if self.gif:
+            self.gif_frames.append(result)
+
+    def close(self):
+        if self.pool is None:
+            return
+        while self.pending:
+            self.collect()
+        self.pool.close()
+        self.pool.join()
+        self.pool = None
+
+        if self.gif and self.gif_frames:
+            frames = (gif_frame_image(*frame) for frame in self.gif_frames)
+            first = next(frames)
+            first.save(self.path, save_all=True, append_images=frames, duration=round(1000 / self.fps), loop=0)
+
+# Pool workers, they only get raw pixels so they don't need a display
+def save_png_frame(data, size, path):
+    pygame.image.save(pygame.image.frombytes(data, size, "RGB"), path)
+
+def quantize_frame(data, size):
+    image = Image.frombytes("RGB", size, data).quantize(method=Image.Quantize.FASTOCTREE)
+    return size, image.getpalette(), zlib.compress(image.tobytes())
+
+def gif_frame_image(size, palette, data):
+    image = Image.frombytes("P", size, zlib.decompress(data))
+    image.putpalette(palette)
+    return image
+
+# Draws a pathfinding trace on top of a grid, one frame every events_per_frame events.
+# Each cell is a block of pixels, only the cells changed by an event are redrawn.
+def render_search_frames(grid, trace, events_per_frame=8, frame_size=EXPORT_FRAME_SIZE):
+    cells = pygame.Surface((grid.cols, grid.rows))
+    for row in grid.grid:
+        for cell in row:
+            cells.set_at((cell.col, cell.row), cell.color)
+
+    scale = max(1, frame_size // max(grid.cols, grid.rows))
+    frame = pygame.Surface((grid.cols * scale, grid.rows * scale))
+
+    pygame.transform.scale(cells, frame.get_size(), frame)
+    yield frame
+
+    pending = 0
+    for kind, index in trace:
+        grid.apply_trace_event(kind, index)
+        row, col = divmod(index, grid.cols)
+        cells.set_at((col, row), grid.grid[row][col].color)
+
+        pending += 1
+        if pending == events_per_frame:
+            pygame.transform.scale(cells, frame.get_size(), frame)
+            yield frame
+            pending = 0
+
+    if pending:
+        pygame.transform.scale(cells, frame.get_size(), frame)
+        yield frame
+
+# Runs a sorting algorithm on an offscreen visualizer, one frame per step of the algorithm
+def render_sorting_frames(algorithm_name, size, seed=None, ascending=True):
+    visualizer = initialize_sorting_visualizer(size, MIN_SPEED, SORTING_ALGORITHMS[algorithm_name], algorithm_name, seed, verbose=False)
+    visualizer.state.ascending = ascending
+    section = visualizer.window.subsurface(pygame.Rect(0, 0, SORTING_SECTION_WIDTH, WINDOW_HEIGHT))
+
+    visualizer.window.fill(COLORS["DARK_GREEN"])  # Like SortingVisualizer.run
+    draw_list(visualizer)
+    yield section
+    for step in initialize_sorting_algorithm(visualizer):
+        yield section
+
+def export_frames(frames, path, fps=60, processes=None, max_frames=EXPORT_MAX_FRAMES):
+    with FrameExporter(path, fps, processes) as exporter:
+        for frame_number, frame in enumerate(frames):
+            if frame_number >= max_frames:
+                break
+            exporter.add(frame)
+    return exporter.count
+
+def main(args=None):
+    # Output options, shared by both commands
+    output_parser = argparse.ArgumentParser(add_help=False)
+    output_parser.add_argument("--fps", type=int, default=60, help="frame rate of the GIF")
+    output_parser.add_argument("--processes", type=int, help="number of encoding processes (all cores by default)")
+    output_parser.add_argument("--max-frames", type=int, default=EXPORT_MAX_FRAMES)
+
+    parser = argparse.ArgumentParser(description="Render a sorting run or a pathfinding trace to a PNG sequence or a GIF, without a window.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sort_parser = subparsers.add_parser("sort", parents=[output_parser], help="export a sorting algorithm run")
+    sort_parser.add_argument("algorithm", choices=SORTING_ALGORITHMS)
+    sort_parser.add_argument("output", help="directory for a PNG sequence, or a .gif file")
+    sort_parser.add_argument("--size", type=int, default=50, help="number of elements to sort")
+    sort_parser.add_argument("--seed", type=int, help="seed of the list, the same seed gives the same list")
+    sort_parser.add_argument("--descending", action="store_true")
+
+    path_parser = subparsers.add_parser("path", parents=[output_parser], help="export a saved pathfinding trace")
+    path_parser.add_argument("trace", help="trace file saved by the visualizer ('X') or a TraceWriter")
+    path_parser.add_argument("output", help="directory for a PNG sequence, or a .gif file")
+    path_parser.add_argument("--map", help="map file with the barriers the search ran on")
+    path_parser.add_argument("--events-per-frame", type=int, default=8)
+    args = parser.parse_args(args)
+
+    pygame.init()
+    if args.command == "sort":
+        frames = render_sorting_frames(args.algorithm, args.size, args.seed, not args.descending)
+    else:
+        trace = TraceReader(args.trace)
+        if args.map:
+            with GridMap.load(args.map) as grid_map:
+                grid = Grid.from_map(grid_map)
+        else:
+            grid = Grid(trace.cols, trace.rows)
+        if (grid.cols, grid.rows) != (trace.cols, trace.rows):
+            parser.error(f"the trace was recorded on a {trace.cols}x{trace.rows} grid, the map is {grid.cols}x{grid.rows}")
+        frames = render_search_frames(grid, trace, args.events_per_frame)
+
+    count = export_frames(frames, args.output, args.fps, args.processes, args.max_frames)
+    print(f"Exported {count} frames to {args.output}.")
+
+if __name__ == "__main__":
+    main()
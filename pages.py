@@ -147,24 +147,24 @@ def generic_menu(window, title, buttons_config):
 
         pygame.display.update()
 
-def pathfinder_menu(window):
+def pathfinder_menu(window, seed=None):
     return generic_menu(
         window,
         "Pathfinder Menu",
         [
-            ("Launch Visualizer", lambda: pathfinding_main.launch_visualizer(window) or PATHFINDER_MENU),
+            ("Launch Visualizer", lambda: pathfinding_main.launch_visualizer(window, seed) or PATHFINDER_MENU),
             ("Instructions", lambda: PATHFINDER_INSTRUCTIONS_MENU),
             ("Algorithm Details", lambda: PATHFINDER_DETAILS_MENU),
             ("Back to Main Menu", lambda: WELCOME_MENU)
         ]
     )
 
-def sorting_menu(window):
+def sorting_menu(window, seed=None):
     return generic_menu(
         window,
         "Sorting Menu",
         [
-            ("Launch Visualizer", lambda: sorting_main.launch_visualizer() or SORTING_MENU),
+            ("Launch Visualizer", lambda: sorting_main.launch_visualizer(seed) or SORTING_MENU),
             ("Instructions", lambda: SORTING_INSTRUCTIONS_MENU),
             ("Algorithm Details", lambda: SORTING_DETAILS_MENU),
             ("Back to Main Menu", lambda: WELCOME_MENU)
@@ -203,34 +203,31 @@ def pathfinder_details_menu(window):
     sub_title_font = pygame.font.SysFont('Verdana', 20, bold=True)
 
     # Pathfinder Algorithms Section
-    algos = ["A*", "Bi-A*", "BFS", "DFS", "GBFS", "JPS"]  # Define algos before using it
+    algos = ["A*", "Bi-A*", "BFS", "DFS", "GBFS", "JPS", "Theta*", "Lazy Theta*", "IDA*", "Fringe", "SMA*", "ARA*"]  # Define algos before using it
     pathfinder_section_y = description_y + total_text_height + section_gap
     pathfinder_section_title = sub_title_font.render("Pathfinding Algorithms", True, COLORS['LIGHT_TEXT'])
     pathfinder_section_x, pathfinder_section_y = center_element(screen_width, pathfinder_section_title.get_width(), pathfinder_section_y)
 
     algo_buttons_y_start = pathfinder_section_y + pathfinder_section_title.get_height() + button_gap
 
-    # Define positions for the two rows
-    row1_y = algo_buttons_y_start
-    row2_y = algo_buttons_y_start + button_height + button_gap
-
-    # Calculate starting X position to center the row of buttons horizontally
-    algo_buttons_x_start = (screen_width - 3 * (button_width + button_gap)) // 2
+    # Algorithms are laid out in rows of four like the mazes, each row centered horizontally
+    algos_per_row = 4
+    algo_buttons_x_start = (screen_width - algos_per_row * (button_width + button_gap)) // 2
 
-    # Create buttons for two rows of three buttons each
     algo_buttons = [
-        ButtonPrimary(algo_buttons_x_start + i * (button_width + button_gap), row1_y, button_width, button_height, algos[i], font=button_font)
-        for i in range(3)
-    ] + [
-        ButtonPrimary(algo_buttons_x_start + i * (button_width + button_gap), row2_y, button_width, button_height, algos[i + 3], font=button_font)
-        for i in range(3)
+        ButtonPrimary(
+            algo_buttons_x_start + (i % algos_per_row) * (button_width + button_gap),
+            algo_buttons_y_start + (i // algos_per_row) * (button_height + button_gap),
+            button_width, button_height, algo, font=button_font
+        )
+        for i, algo in enumerate(algos)
     ]
 
     # Update algo_buttons_y for the next section
-    algo_buttons_y = row2_y + button_height
+    algo_buttons_y = algo_buttons_y_start + (len(algos) - 1) // algos_per_row * (button_height + button_gap) + button_height
 
     # Heuristics Section
-    heuristics = ["Manhattan", "Euclidean", "Diagonal", "Dijkstra"]  # Define heuristics before using it
+    heuristics = ["Manhattan", "Euclidean", "Diagonal", "Octile", "Dijkstra"]  # Define heuristics before using it
     heuristics_section_y = algo_buttons_y + section_gap  # Adjust section gap here
     heuristics_section_title = sub_title_font.render("Heuristics", True, COLORS['LIGHT_TEXT'])
     heuristics_section_x, heuristics_section_y = center_element(screen_width, heuristics_section_title.get_width(), heuristics_section_y)
@@ -243,21 +240,29 @@ def pathfinder_details_menu(window):
     ]
 
     # Maze Generation Algorithms Section
-    mazes = ["Recursive DFS", "Growing Tree", "Binary Tree", "Sidewinder"]  # Define the list of mazes
+    mazes = ["Recursive DFS", "Growing Tree", "Binary Tree", "Sidewinder", "Eller", "Kruskal", "Prim", "Wilson"]  # Define the list of mazes
     maze_section_y = heuristic_buttons_y + button_height + section_gap
     maze_section_title = sub_title_font.render("Maze Generation Algorithms", True, COLORS['LIGHT_TEXT'])
     maze_section_x, maze_section_y = center_element(screen_width, maze_section_title.get_width(), maze_section_y)
 
     maze_buttons_y = maze_section_y + maze_section_title.get_height() + button_gap
 
-    # Calculate starting X position to center the row of maze buttons horizontally
-    maze_buttons_x_start = (screen_width - len(mazes) * (button_width + button_gap)) // 2
+    # Mazes are laid out in rows of four, each row centered horizontally
+    mazes_per_row = 4
+    maze_buttons_x_start = (screen_width - mazes_per_row * (button_width + button_gap)) // 2
 
     maze_buttons = [
-        ButtonPrimary(maze_buttons_x_start + i * (button_width + button_gap), maze_buttons_y, button_width, button_height, maze, font=button_font)
+        ButtonPrimary(
+            maze_buttons_x_start + (i % mazes_per_row) * (button_width + button_gap),
+            maze_buttons_y + (i // mazes_per_row) * (button_height + button_gap),
+            button_width, button_height, maze, font=button_font
+        )
         for i, maze in enumerate(mazes)
     ]
 
+    # Update maze_buttons_y for the last row of mazes
+    maze_buttons_y += (len(mazes) - 1) // mazes_per_row * (button_height + button_gap)
+
     # 'Pathfinder' Button
     back_button_height = 60
     back_button_width = 300 + button_gap
@@ -581,12 +586,21 @@ def pathfinding_instructions_menu(window):
         ]},
         {"section": "Algorithm Selection", "content": [
             "• Choose a pathfinder algorithm, a heuristic, and a maze generation algorithm.",
-            "• Each selected algorithm will display a short description."
+            "• Each selected algorithm will display a short description.",
+            "• 'A* Ties' cycles how A* picks between cells with the same cost.",
+            "• 'Moves' cycles between 4-way, 8-way and 8-way without corner cutting."
         ]},
         {"section": "Execution", "content": [
             "• Press 'Start' to begin. If a path is found, the number of nodes and the path length will be displayed.",
             "• Use 'Clear Path' to remove the path and test different algorithms on the same layout.",
-            "• Use 'Reset Maze' to reset the entire grid."
+            "• Use 'Reset Maze' to reset the entire grid.",
+            "• Press 'S' to save the grid to disk and 'L' to load it back, 'E' scrolls through an endless maze.",
+            "• Use 'Race' to run several algorithms at once on the same grid, with a leaderboard of their times. Shift-click an algorithm to add it to or remove it from the race."
+        ]},
+        {"section": "Replay", "content": [
+            "• Press 'P' to replay the last search. Left/right arrows scrub, up/down arrows change the speed of replays and searches.",
+            "• Press 'X' to export the search trace to disk and 'T' to load it back. 'J' saves the search metrics as JSON.",
+            "• Press 'M' to also measure the peak memory of searches, which makes them much slower."
         ]}
     ]
 
@@ -595,7 +609,7 @@ def pathfinding_instructions_menu(window):
     max_text_width = screen_width - 150
 
     # Back Button
-    back_button_y = screen_height - 200  # Position near the bottom
+    back_button_y = screen_height - 150  # Position near the bottom
     back_button_width = 300
     back_button_height = 60
     back_button_x, back_button_y = center_element(screen_width, back_button_width, back_button_y)
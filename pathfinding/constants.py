@@ -21,3 +21,75 @@ COLS, ROWS = 33, 33
 # Define the dimensions of each cell in the grid based on the visualizer area
 CELL_WIDTH, CELL_HEIGHT = GRID_WIDTH // COLS, GRID_HEIGHT // ROWS
 
+# Movement models, the moves a search can make from a cell, with the description shown in the menu
+MOVE_4 = "4-way"
+MOVE_8 = "8-way"
+MOVE_8_NO_CORNERS = "8-way strict"
+MOVEMENTS = {
+    MOVE_4: "Moves up, down, left and right only.",
+    MOVE_8: "Also moves diagonally, cutting past a barrier's corner as long as one side of the move is open.",
+    MOVE_8_NO_CORNERS: "Also moves diagonally, but only when both sides of the move are open (no corner cutting).",
+}
+DIAGONAL_COST = 2 ** 0.5  # Straight moves cost 1
+
+# Search tree nodes SMA* may keep in memory at once
+SMA_NODE_LIMIT = 250
+
+# IDA* remembers the lowest g of up to this many cells per round, so a cell reached again by a longer
+# path isn't searched twice, and gives up (no path) after this many expansions. Open 33x33 grids with
+# 8-way moves take up to about 100,000, an unreachable goal would otherwise keep a worker busy for minutes.
+IDA_TABLE_SIZE = 1 << 16
+IDA_EXPANSION_LIMIT = 300_000
+
+# ARA* starts with the heuristic inflated by the initial weight, and lowers it by the step after each
+# solution, down to 1 (the shortest path) or until the time budget (seconds) runs out
+ARA_INITIAL_WEIGHT = 3.0
+ARA_WEIGHT_STEP = 0.5
+ARA_TIME_BUDGET = 1.0
+
+# Integer-cost searches use a bucket queue up to this step cost, a radix heap above it
+BUCKET_QUEUE_MAX_COST = 64
+
+# Query workers on a shared grid take queries in batches, and keep this many answers per grid version
+QUERY_BATCH_SIZE = 64
+QUERY_CACHE_SIZE = 10000
+QUERY_WORKER_GRIDS = 8  # Shared grids a worker stays attached to
+
+# Local path-query server, latency percentiles are over the last requests
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_STATS_WINDOW = 1000
+
+# File used by the visualizer to save and load the grid
+MAP_FILE = "grid.aamap"
+
+# Search trace replay, speeds are in events per frame
+TRACE_FILE = "search.aatrace"
+METRICS_FILE = "search_metrics.json"
+REPLAY_DEFAULT_SPEED = 8
+REPLAY_MIN_SPEED = 0.125
+REPLAY_MAX_SPEED = 4096
+REPLAY_SCRUB_FRAMES = 30  # Left/right skip this many frames of playback
+
+# Race mode, the selected algorithms search the same grid and each gets a mini view (sizes in cells, height in pixels)
+RACE_DEFAULT_ALGORITHMS = ["A*", "Bi-A*", "BFS", "DFS", "GBFS", "JPS"]
+RACE_COLUMNS = 4
+RACE_TILE_GAP = 4
+RACE_LABEL_ROWS = 4
+RACE_VIEW_HEIGHT = 450  # The leaderboard goes below the mini views
+
+# Cache of generated mazes for benchmarks, least recently used mazes are evicted past the size limit
+MAZE_CACHE_DIR = "maze_cache"
+MAZE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+MIN_MAZE_SIZE = 3  # Smallest maze every generator can carve, one cell inside a wall all around
+
+# Maze generation animation, the grid is redrawn once per batch of carved cells
+MAZE_CARVES_PER_FRAME = 4
+MAZE_FRAME_DELAY = 1  # ms
+
+# Side menu layout
+MENU_FIRST_SECTION_Y = 120
+MENU_SECTION_TITLE_HEIGHT = 30
+MENU_BUTTON_HEIGHT = 30
+MENU_BUTTON_X_GAP = 10
+MENU_BUTTON_Y_GAP = 6
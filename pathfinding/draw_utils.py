@@ -9,8 +9,8 @@ def draw_grid(grid, window):
 
     # Draw grid lines
     for col in range(len(grid[0])):
-        pygame.draw.line(window, COLORS["GREY"], (col * cell.width, 0), (col * cell.width, len(grid) * cell.height))
+        pygame.draw.line(window, COLORS["GREY"], (col * CELL_WIDTH, 0), (col * CELL_WIDTH, len(grid) * CELL_HEIGHT))
     for row in range(len(grid)):
-        pygame.draw.line(window, COLORS["GREY"], (0, row * cell.height), (len(grid[0]) * cell.width, row * cell.height))
+        pygame.draw.line(window, COLORS["GREY"], (0, row * CELL_HEIGHT), (len(grid[0]) * CELL_WIDTH, row * CELL_HEIGHT))
 
     pygame.display.update()
@@ -0,0 +1,271 @@
+from array import array
+from collections import deque
+from .constants import *
+from .heuristics import INTEGER_HEURISTICS
+from .metrics import SearchMetrics
+from .open_lists import HeapOpenList, make_open_list
+from .pathfinding_algorithms import move_cost
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, it only speeds up building large graphs
+    np = None
+
+# Adjacency providers: the graph searches below only need node_count, neighbors(node) giving
+# (neighbor, cost) pairs, and position(node) for a heuristic. Nodes are numbered from 0. Providers
+# also say whether every cost is a whole number (integral) and the largest cost, to pick an open list.
+
+# A grid's cells as graph nodes (row * cols + col), following the neighbors and movement model
+# the cells were last updated with
+class GridGraph:
+    def __init__(self, grid):
+        self.grid = grid
+        self.cols = grid.cols
+        self.node_count = grid.cols * grid.rows
+        self.integral = grid.movement == MOVE_4
+        self.max_weight = 1 if self.integral else DIAGONAL_COST
+
+    def node(self, col, row):
+        return row * self.cols + col
+
+    def neighbors(self, node):
+        cell = self.grid.grid[node // self.cols][node % self.cols]
+        return [(neighbor.row * self.cols + neighbor.col, move_cost(cell, neighbor)) for neighbor in cell.valid_neighbors]
+
+    def position(self, node):
+        return node % self.cols, node // self.cols
+
+# Compressed sparse row graph: the edges leaving node u are targets[offsets[u]:offsets[u + 1]], with the
+# same slice of weights. Everything is in typed arrays, a few bytes per edge instead of Python objects,
+# so graphs with millions of edges fit. Weights are 64-bit integers when they're all whole numbers.
+class CSRGraph:
+    def __init__(self, offsets, targets, weights, positions=None):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.positions = positions  # (x, y) of every node, or None when the graph has no coordinates
+        self.node_count = len(offsets) - 1
+        self.edge_count = len(targets)
+        self.integral = weights.typecode == "q"
+        self.max_weight = max(weights, default=0)
+
+    def neighbors(self, node):
+        start, end = self.offsets[node], self.offsets[node + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def position(self, node):
+        return self.positions[node]
+
+    # Builds the graph from parallel arrays of edge sources, targets and weights (any sequences).
+    # Costs can't be negative, the searches rely on it.
+    @classmethod
+    def from_arrays(cls, node_count, sources, targets, weights, positions=None):
+        integral = getattr(weights, "typecode", None) == "q" or all(weight == int(weight) for weight in weights)
+        typecode = "q" if integral else "d"
+        if len(weights) and min(weights) < 0:
+            raise ValueError("edge weights can't be negative")
+        if np is not None:
+            return cls(*csr_arrays_numpy(node_count, sources, targets, weights, typecode), positions)
+
+        # Counting sort by source: count the edges of each node, then drop every edge into its node's slot
+        offsets = array("q", bytes(8 * (node_count + 1)))
+        for source in sources:
+            offsets[source + 1] += 1
+        for node in range(node_count):
+            offsets[node + 1] += offsets[node]
+        slots = array("q", offsets[:-1])
+        sorted_targets = array("q", bytes(8 * len(targets)))
+        sorted_weights = array(typecode, bytes(8 * len(weights)))
+        for source, target, weight in zip(sources, targets, weights):
+            slot = slots[source]
+            sorted_targets[slot] = target
+            sorted_weights[slot] = int(weight) if integral else weight  # Whole floats like 2.0 don't fit a "q" array
+            slots[source] = slot + 1
+        return cls(offsets, sorted_targets, sorted_weights, positions)
+
+    # Edges are (source, target, weight) tuples, undirected ones are added both ways
+    @classmethod
+    def from_edges(cls, node_count, edges, directed=True, positions=None):
+        sources, targets, weights = array("q"), array("q"), []
+        for source, target, weight in edges:
+            sources.append(source)
+            targets.append(target)
+            weights.append(weight)
+            if not directed:
+                sources.append(target)
+                targets.append(source)
+                weights.append(weight)
+        return cls.from_arrays(node_count, sources, targets, weights, positions)
+
+    # Copies any adjacency provider, e.g. a GridGraph, so repeated searches don't go through its objects
+    @classmethod
+    def from_provider(cls, provider):
+        positions = [provider.position(node) for node in range(provider.node_count)]
+        edges = ((node, neighbor, cost) for node in range(provider.node_count) for neighbor, cost in provider.neighbors(node))
+        return cls.from_edges(provider.node_count, edges, positions=positions)
+
+    # Loads a 9th DIMACS Implementation Challenge graph: a .gr file of "a u v w" arcs (nodes numbered
+    # from 1) and optionally the .co file of "v id x y" node coordinates
+    @classmethod
+    def load_dimacs(cls, path, coordinates_path=None):
+        node_count, sources, targets, weights = 0, array("q"), array("q"), array("q")
+        with open(path) as file:
+            for line in file:
+                if line.startswith("a "):
+                    _, source, target, weight = line.split()
+                    sources.append(int(source) - 1)
+                    targets.append(int(target) - 1)
+                    weights.append(int(weight))
+                elif line.startswith("p "):
+                    node_count = int(line.split()[2])
+
+        positions = None
+        if coordinates_path is not None:
+            positions = [None] * node_count
+            with open(coordinates_path) as file:
+                for line in file:
+                    if line.startswith("v "):
+                        _, node, x, y = line.split()
+                        positions[int(node) - 1] = (int(x), int(y))
+        return cls.from_arrays(node_count, sources, targets, weights, positions)
+
+# Same CSR layout with NumPy: a stable sort of the edges by source, and the offsets from the counts
+def csr_arrays_numpy(node_count, sources, targets, weights, typecode):
+    sources = np.asarray(sources, dtype=np.int64)
+    order = np.argsort(sources, kind="stable")
+    offsets = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=node_count), out=offsets[1:])
+    sorted_targets = np.asarray(targets, dtype=np.int64)[order]
+    sorted_weights = np.asarray(weights, dtype=np.int64 if typecode == "q" else np.float64)[order]
+    # Back into typed arrays, indexing them from Python is much faster than indexing NumPy arrays
+    return (array("q", offsets.tobytes()), array("q", sorted_targets.tobytes()), array(typecode, sorted_weights.tobytes()))
+
+# Base class of the searches over adjacency providers. find_path returns the SearchMetrics like the
+# grid searches, the path (list of nodes) is left in self.path.
+class GraphSearch:
+    name = ""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.path = None
+        self.metrics = None
+
+    def reconstruct_path(self, parents, target):
+        path = [target]
+        while parents[path[-1]] != -1:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+
+    def end_search(self, path=None, path_length=0):
+        self.path = path
+        self.metrics.enter_phase(None)
+        self.metrics.found = path is not None
+        self.metrics.path_length = path_length
+        return self.metrics
+
+# A* over any adjacency provider, Dijkstra without a heuristic. The heuristic takes two positions,
+# like the grid heuristics. A closed node is reopened when a cheaper path to it turns up, so an
+# inconsistent heuristic still finds the shortest path.
+class GraphAStar(GraphSearch):
+    name = "Graph A*"
+
+    def __init__(self, graph, heuristic=None):
+        super().__init__(graph)
+        self.heuristic = heuristic
+
+    def make_open_list(self):
+        graph = self.graph
+        if self.heuristic is None:
+            return make_open_list(graph.integral, graph.max_weight)  # Priorities never go down, any integer open list works
+        if graph.integral and self.heuristic in INTEGER_HEURISTICS and graph.max_weight <= BUCKET_QUEUE_MAX_COST:
+            return make_open_list(True, graph.max_weight)  # The bucket queue copes with priorities going down
+        return HeapOpenList()
+
+    def find_path(self, source, target):
+        graph, heuristic = self.graph, self.heuristic
+        metrics = self.metrics = SearchMetrics(self.name)
+        metrics.enter_phase("setup")
+        g_score = [float("inf")] * graph.node_count
+        parents = array("q", [-1]) * graph.node_count
+        closed = bytearray(graph.node_count)
+        target_position = graph.position(target) if heuristic else None
+        open_list = self.make_open_list()
+        metrics.open_list = open_list.name
+
+        g_score[source] = 0
+        open_list.push(heuristic(graph.position(source), target_position) if heuristic else 0, source)
+        metrics.pushes = metrics.peak_open = 1
+
+        metrics.enter_phase("search")
+        while open_list:
+            _, node = open_list.pop()
+            metrics.pops += 1
+            if closed[node]:
+                continue  # Left behind when a cheaper path to the node was found
+            closed[node] = 1
+            metrics.expansions += 1
+            if node == target:
+                metrics.enter_phase("path")
+                return self.end_search(self.reconstruct_path(parents, target), g_score[target])
+
+            node_g = g_score[node]
+            for neighbor, cost in graph.neighbors(node):
+                metrics.generated += 1
+                new_g = node_g + cost
+                if new_g < g_score[neighbor]:
+                    g_score[neighbor] = new_g
+                    parents[neighbor] = node
+                    if closed[neighbor]:
+                        closed[neighbor] = 0
+                        metrics.reopenings += 1
+                    open_list.push(new_g + heuristic(graph.position(neighbor), target_position) if heuristic else new_g, neighbor)
+                    metrics.pushes += 1
+            metrics.peak_open = max(metrics.peak_open, len(open_list))
+        return self.end_search()
+
+class GraphDijkstra(GraphAStar):
+    name = "Graph Dijkstra"
+
+# Breadth-first search, the path with the fewest edges. Its length is the sum of their costs.
+class GraphBFS(GraphSearch):
+    name = "Graph BFS"
+
+    def find_path(self, source, target):
+        graph = self.graph
+        metrics = self.metrics = SearchMetrics(self.name)
+        metrics.enter_phase("setup")
+        parents = array("q", [-1]) * graph.node_count
+        costs = {}  # Cost of the edge each node was reached through
+        seen = bytearray(graph.node_count)
+        seen[source] = 1
+        queue = deque([source])
+        metrics.pushes = metrics.peak_open = 1
+
+        metrics.enter_phase("search")
+        while queue:
+            node = queue.popleft()
+            metrics.pops += 1
+            metrics.expansions += 1
+            if node == target:
+                metrics.enter_phase("path")
+                path = self.reconstruct_path(parents, target)
+                return self.end_search(path, sum(costs[node] for node in path[1:]))
+
+            for neighbor, cost in graph.neighbors(node):
+                metrics.generated += 1
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    parents[neighbor] = node
+                    costs[neighbor] = cost
+                    queue.append(neighbor)
+                    metrics.pushes += 1
+            metrics.peak_open = max(metrics.peak_open, len(queue))
+        return self.end_search()
+
+# Graph search classes by name
+GRAPH_ALGORITHMS = {
+    "Dijkstra": GraphDijkstra,
+    "A*": GraphAStar,
+    "BFS": GraphBFS,
+}
@@ -1,117 +1,209 @@
-import random
 from .constants import *
-from .maze_algorithms import RecursiveDFS, GrowingTree, BinaryTree, Sidewinder
+from .maze_algorithms import MAZE_ALGORITHMS
+from .map_format import GridMap
+from .trace import *
 from ui import *
 
+# Cell states, the searches compare these small ints instead of color tuples
+CELL_EMPTY = 0
+CELL_CLOSED = 1
+CELL_OPEN = 2
+CELL_BARRIER = 3
+CELL_START = 4
+CELL_END = 5
+CELL_PATH = 6
+CELL_JUMP = 7  # Jump points on a JPS path
+
+# Color of each state, only looked up when a cell is drawn
+PALETTE = (
+    COLORS["LIGHT_CREAM"],
+    COLORS["RED"],
+    COLORS["GREEN"],
+    COLORS["BLACK"],
+    COLORS["ORANGE"],
+    COLORS["TURQUOISE"],
+    COLORS["PURPLE"],
+    COLORS["PINK"],
+)
+
 class Cell:
+    __slots__ = ("col", "row", "state", "valid_neighbors")  # No per-cell __dict__, large grids have millions of cells
+
     def __init__(self, col, row) -> None:
         self.col = col
         self.row = row
-        self.width = CELL_WIDTH
-        self.height = CELL_HEIGHT
-        self.x = col * CELL_WIDTH + VISUALIZER_GRID_MARGIN  # Adjusted x position during initialization
-        self.y = row * CELL_HEIGHT + VISUALIZER_GRID_MARGIN  # Adjusted y position during initialization
-        self.color = COLORS["LIGHT_CREAM"]
+        self.state = CELL_EMPTY
         self.valid_neighbors = []
 
     def get_pos(self):
         return self.col, self.row
 
+    @property
+    def color(self):
+        return PALETTE[self.state]
+
     def draw_cell(self, window):
-        pygame.draw.rect(window, self.color, (self.x, self.y, self.width, self.height))
+        x = self.col * CELL_WIDTH + VISUALIZER_GRID_MARGIN
+        y = self.row * CELL_HEIGHT + VISUALIZER_GRID_MARGIN
+        pygame.draw.rect(window, PALETTE[self.state], (x, y, CELL_WIDTH, CELL_HEIGHT))
 
     # Checks if the cell is closed (processed)
     def is_closed(self):
-        return self.color == COLORS["RED"]
+        return self.state == CELL_CLOSED
     
     # Checks if the cell is open (in the queue)
     def is_open(self):
-        return self.color == COLORS["GREEN"]
+        return self.state == CELL_OPEN
     
     def is_barrier(self):
-        return self.color == COLORS["BLACK"]
+        return self.state == CELL_BARRIER
     
     def is_start(self):
-        return self.color == COLORS["ORANGE"]
+        return self.state == CELL_START
     
     def is_end(self):
-        return self.color == COLORS["TURQUOISE"]
+        return self.state == CELL_END
+
+    def is_jump(self):
+        return self.state == CELL_JUMP
     
     # Resets the cell to its initial state
     def reset(self):
-        self.color = COLORS["LIGHT_CREAM"]
+        self.state = CELL_EMPTY
 
-    # Changes the cell color to represent different states
+    # Changes the cell state, which sets the color it's drawn with
     def make_closed(self):
-        self.color = COLORS["RED"]
+        self.state = CELL_CLOSED
     
     def make_open(self):
-        self.color = COLORS["GREEN"]
+        self.state = CELL_OPEN
     
     def make_barrier(self):
-        self.color = COLORS["BLACK"]
+        self.state = CELL_BARRIER
     
     def make_start(self):
-        self.color = COLORS["ORANGE"]
+        self.state = CELL_START
     
     def make_end(self):
-        self.color = COLORS["TURQUOISE"]
+        self.state = CELL_END
 
     def make_path(self):
-        self.color = COLORS["PURPLE"]
+        self.state = CELL_PATH
+
+    # Jump points on a JPS path
+    def make_jump(self):
+        self.state = CELL_JUMP
         
-    def update_valid_neighbors(self, grid):
+    def update_valid_neighbors(self, grid, movement=MOVE_4):
         self.valid_neighbors = []  # Clear previous neighbors
 
+        rows, cols = len(grid), len(grid[0])
+
         # Check each direction for valid neighbors (not barriers)
-        if self.row < ROWS - 1 and not grid[self.row + 1][self.col].is_barrier(): # DOWN
+        if self.row < rows - 1 and not grid[self.row + 1][self.col].is_barrier(): # DOWN
             self.valid_neighbors.append(grid[self.row + 1][self.col])
 
         if self.row > 0 and not grid[self.row - 1][self.col].is_barrier(): # UP
             self.valid_neighbors.append(grid[self.row - 1][self.col])
 
-        if self.col < COLS - 1 and not grid[self.row][self.col + 1].is_barrier(): # RIGHT
+        if self.col < cols - 1 and not grid[self.row][self.col + 1].is_barrier(): # RIGHT
             self.valid_neighbors.append(grid[self.row][self.col + 1])
 
         if self.col > 0 and not grid[self.row][self.col - 1].is_barrier(): # LEFT
             self.valid_neighbors.append(grid[self.row][self.col - 1])
 
+        if movement == MOVE_4:
+            return
+
+        # Diagonals, the two cells beside the move must both be open, or one of them when corners can be cut
+        for col, row in ((self.col + 1, self.row + 1), (self.col - 1, self.row + 1), (self.col + 1, self.row - 1), (self.col - 1, self.row - 1)):
+            if 0 <= col < cols and 0 <= row < rows and not grid[row][col].is_barrier():
+                sides_open = (not grid[self.row][col].is_barrier(), not grid[row][self.col].is_barrier())
+                if all(sides_open) if movement == MOVE_8_NO_CORNERS else any(sides_open):
+                    self.valid_neighbors.append(grid[row][col])
+
+# Cell method applied by each kind of trace event
+TRACE_MARKERS = {
+    TRACE_OPEN: Cell.make_open,
+    TRACE_CLOSED: Cell.make_closed,
+    TRACE_PATH: Cell.make_path,
+    TRACE_START: Cell.make_start,
+    TRACE_END: Cell.make_end,
+    TRACE_JUMP: Cell.make_jump,
+}
+
+# Cell state set by each kind of trace event, for views that keep the states outside the cells
+TRACE_STATES = {
+    TRACE_OPEN: CELL_OPEN,
+    TRACE_CLOSED: CELL_CLOSED,
+    TRACE_PATH: CELL_PATH,
+    TRACE_START: CELL_START,
+    TRACE_END: CELL_END,
+    TRACE_JUMP: CELL_JUMP,
+}
+
 # Manages the grid of cells
 class Grid:
-    def __init__(self):
+    def __init__(self, cols=COLS, rows=ROWS):
+        self.cols = cols
+        self.rows = rows
         self.grid = self.initialize_grid()
         self.drawn_grid = False
+        self.movement = MOVE_4  # Movement model of the cells' neighbors
+
+    # Builds a grid the size of the map, used for headless runs on large maps
+    @classmethod
+    def from_map(cls, grid_map):
+        grid = cls(grid_map.width, grid_map.height)
+        grid.load_map(grid_map)
+        return grid
 
     def initialize_grid(self):
-        grid = [[Cell(col, row) for col in range(COLS)] for row in range(ROWS)]
+        grid = [[Cell(col, row) for col in range(self.cols)] for row in range(self.rows)]
         return grid
 
-    def generate_maze(self, window, algorithm):
+    def generate_maze(self, window, algorithm, seed=None):
         # Clear the grid by making all cells barriers before generating the maze
         for row in self.grid:
             for cell in row:
                 cell.make_barrier()
 
         # Dispatch the appropriate algorithm
-        maze_generator = self.get_maze_algorithm(algorithm, window)
+        maze_generator = self.get_maze_algorithm(algorithm, seed)
 
-        # Start maze generation if the algorithm exists
+        # Carve the cells as the generator yields them, redrawing once per batch of carves
         if maze_generator:
-            maze_generator.start()
-
-    def get_maze_algorithm(self, algorithm, window):
-        if algorithm == 'RecursiveDFS':
-            return RecursiveDFS(self, window)
-        elif algorithm == 'GrowingTree':
-            return GrowingTree(self, window)
-        elif algorithm == 'BinaryTree':
-            return BinaryTree(self, window)
-        elif algorithm == 'Sidewinder':
-            return Sidewinder(self, window)
+            for carves, (col, row) in enumerate(maze_generator.generate(), start=1):
+                self.grid[row][col].reset()
+                if carves % MAZE_CARVES_PER_FRAME == 0:
+                    self.draw_maze_frame(window)
+            self.draw_maze_frame(window)
+
+    def draw_maze_frame(self, window):
+        self.draw_grid(window)
+        pygame.event.pump()  # Keep the window responsive while the maze is generated
+        pygame.time.delay(MAZE_FRAME_DELAY)
+
+    def get_maze_algorithm(self, algorithm, seed=None):
+        if algorithm in MAZE_ALGORITHMS:
+            return MAZE_ALGORITHMS[algorithm](self.cols, self.rows, seed)
         elif algorithm == 'Custom':
             self.clear_grid()  # Custom case, just reset the grid without barriers
             return None
 
+    # Scrolls the grid up by one row and fills the bottom row from barrier flags.
+    # Gives a moving window over mazes streamed row by row, like an endless Eller maze.
+    def scroll_row(self, cells):
+        for upper_row, lower_row in zip(self.grid, self.grid[1:]):
+            for upper_cell, lower_cell in zip(upper_row, lower_row):
+                upper_cell.state = lower_cell.state
+
+        for cell in self.grid[-1]:
+            if cells[cell.col]:
+                cell.make_barrier()
+            else:
+                cell.reset()
+
     def clear_grid(self):
         # Resets all cells to be empty
         for row in self.grid:
@@ -164,8 +256,45 @@ class Grid:
 
         return self.grid[row][col]
 
+    # Copies the barriers into a bit-packed map that can be saved to disk
+    def to_map(self):
+        grid_map = GridMap(self.cols, self.rows)
+        for row in self.grid:
+            for cell in row:
+                if cell.is_barrier():
+                    grid_map.set_blocked(cell.col, cell.row)
+        return grid_map
+
+    # Replaces the barriers with the ones from a map, anything outside the grid is ignored
+    def load_map(self, grid_map):
+        for row in self.grid:
+            for cell in row:
+                if cell.col < grid_map.width and cell.row < grid_map.height and grid_map.is_blocked(cell.col, cell.row):
+                    cell.make_barrier()
+                else:
+                    cell.reset()
+
     def clear_path(self):
         for row in self.grid:
             for cell in row:
                 if not (cell.is_start() or cell.is_end() or cell.is_barrier()):
                     cell.reset()
+
+    # Resets everything except barriers, including the start and end cells
+    def clear_search(self):
+        for row in self.grid:
+            for cell in row:
+                if not cell.is_barrier():
+                    cell.reset()
+
+    # Replays one event of a SearchTrace, recoloring the cell the same way the search did
+    def apply_trace_event(self, kind, index):
+        cell = self.grid[index // self.cols][index % self.cols]
+        TRACE_MARKERS[kind](cell)
+
+    def update_valid_neighbors(self, movement=None):
+        if movement is not None:
+            self.movement = movement
+        for row in self.grid:
+            for cell in row:
+                cell.update_valid_neighbors(self.grid, self.movement)
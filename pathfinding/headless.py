@@ -0,0 +1,23 @@
+from .heuristics import Heuristic
+from .pathfinding_algorithms import create_algorithm
+
+# Runs a search on a grid without drawing anything.
+# The grid's neighbors must be up to date (Grid.update_valid_neighbors) before the first search,
+# the search follows the movement model they were built with.
+# A trace (SearchTrace, or TraceWriter to stream it to disk) records every event of the search.
+# Returns the SearchMetrics of the search, track_memory adds its peak memory (much slower).
+# Options go to the algorithm's constructor, e.g. time_budget=0.1 for ARA*.
+def run_search(grid, algorithm_name, start, goal, heuristic=Heuristic.manhattan, trace=None, track_memory=False, **options):
+    grid.clear_search()  # Remove the colors left behind by the previous search
+
+    start_cell = grid.grid[start[1]][start[0]]
+    end_cell = grid.grid[goal[1]][goal[0]]
+    start_cell.make_start()
+    end_cell.make_end()
+
+    algorithm = create_algorithm(algorithm_name, grid.grid, heuristic, **options)
+    algorithm.verbose = False
+    algorithm.trace = trace
+    algorithm.track_memory = track_memory
+    algorithm.movement = grid.movement
+    return algorithm.find_path(start_cell, end_cell, lambda: None)
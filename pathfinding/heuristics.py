@@ -1,4 +1,5 @@
 import math
+from .constants import DIAGONAL_COST
 
 class Heuristic:
     @staticmethod
@@ -19,9 +20,29 @@ class Heuristic:
         x2, y2 = p2
         return max(abs(x1 - x2), abs(y1 - y2))
 
+    # Exact distance on an open grid with 8-way moves, diagonal steps cost sqrt(2)
+    @staticmethod
+    def octile(p1, p2):
+        x1, y1 = p1
+        x2, y2 = p2
+        dx, dy = abs(x1 - x2), abs(y1 - y2)
+        return max(dx, dy) + (DIAGONAL_COST - 1) * min(dx, dy)
+
     @staticmethod
     def dijkstra(p1, p2):
         # Normally, Dijkstra's algorithm would calculate based on edge weights.
         # However, for this app, no weights are assigned, so the heuristic remains 0.
         # This effectively turns Dijkstra's algorithm into BFS in this context.
         return 0
+
+# Heuristics that give whole numbers on the grid, with 4-way moves A* can then use an integer open list
+INTEGER_HEURISTICS = {Heuristic.manhattan, Heuristic.diagonal, Heuristic.dijkstra}
+
+# Heuristic functions by the name used in the menu
+HEURISTICS = {
+    "Manhattan": Heuristic.manhattan,
+    "Euclidean": Heuristic.euclidean,
+    "Diagonal": Heuristic.diagonal,
+    "Octile": Heuristic.octile,
+    "Dijkstra": Heuristic.dijkstra,
+}
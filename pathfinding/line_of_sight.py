@@ -0,0 +1,77 @@
+from .grid import CELL_BARRIER
+
+# Line of sight between cell centers, for the any-angle searches (Theta*, Lazy Theta*).
+# The blocked cells are copied into a flat bytearray once, and every answer is cached for the
+# rest of the search, since Theta* asks again about the same pairs of cells many times.
+class LineOfSight:
+    def __init__(self, grid, corner_cutting=False):
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.blocked = bytearray(cell.state == CELL_BARRIER for row in grid for cell in row)
+        self.corner_cutting = corner_cutting  # A line may pass between two diagonal barriers' corners
+        self.cache = {}
+        self.checks = 0  # Lines actually walked
+        self.cache_hits = 0
+
+    def visible(self, cell1, cell2):
+        # The walk is exact, a line is visible both ways, so a pair of cells is cached once
+        index1, index2 = cell1.row * self.cols + cell1.col, cell2.row * self.cols + cell2.col
+        key = (index1, index2) if index1 < index2 else (index2, index1)
+        result = self.cache.get(key)
+        if result is None:
+            self.checks += 1
+            result = self.cache[key] = self.walk(cell1.col, cell1.row, cell2.col, cell2.row)
+        else:
+            self.cache_hits += 1
+        return result
+
+    # Bresenham-style walk through every cell the line crosses (a supercover), in integer arithmetic.
+    # Where the line goes exactly through a corner, the two cells beside it must be open, or one of
+    # them when corners can be cut.
+    def walk(self, col, row, end_col, end_row):
+        blocked, cols = self.blocked, self.cols
+        dx, dy = abs(end_col - col), abs(end_row - row)
+        step_col = 1 if end_col > col else -1
+        step_row = 1 if end_row > row else -1
+        error = dx - dy
+        dx, dy = 2 * dx, 2 * dy
+        steps = (dx + dy) // 2
+
+        while steps > 0:
+            if error > 0:
+                col += step_col
+                error -= dy
+            elif error < 0:
+                row += step_row
+                error += dx
+            else:
+                side1, side2 = blocked[row * cols + col + step_col], blocked[(row + step_row) * cols + col]
+                if (side1 and side2) if self.corner_cutting else (side1 or side2):
+                    return False
+                col += step_col
+                row += step_row
+                error += dx - dy
+                steps -= 1  # The diagonal step counts for a move along both axes
+            if blocked[row * cols + col]:
+                return False
+            steps -= 1
+        return True
+
+# Cells on the line between two cells, used to draw the straight segments of an any-angle path
+def line_cells(cell1, cell2):
+    col, row = cell1.col, cell1.row
+    dx, dy = abs(cell2.col - col), -abs(cell2.row - row)
+    step_col = 1 if cell2.col > col else -1
+    step_row = 1 if cell2.row > row else -1
+    error = dx + dy
+    cells = []
+    while (col, row) != (cell2.col, cell2.row):
+        double_error = 2 * error
+        if double_error >= dy:
+            error += dy
+            col += step_col
+        if double_error <= dx:
+            error += dx
+            row += step_row
+        cells.append((col, row))
+    return cells
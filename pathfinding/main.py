@@ -2,8 +2,8 @@ import pygame
 from .visualizer import PathfindingVisualizer
 from .constants import WINDOW_WIDTH, WINDOW_HEIGHT
 
-def launch_visualizer(window):
-    visualizer = PathfindingVisualizer(window)
+def launch_visualizer(window, seed=None):
+    visualizer = PathfindingVisualizer(window, seed)
     return visualizer.run()
 
 if __name__ == "__main__":
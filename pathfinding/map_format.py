@@ -0,0 +1,149 @@
+import mmap
+import struct
+
+# On-disk map layout (little endian):
+#   header  -> magic, format version, flags, width, height (16 bytes)
+#   bits    -> occupancy, one bit per cell (1 = barrier), each row padded to a whole byte
+#   costs   -> optional cost layer, one unsigned byte per cell (present when FLAG_COST_LAYER is set)
+MAP_MAGIC = b"AAMP"
+MAP_VERSION = 1
+MAP_HEADER = struct.Struct("<4sHHII")
+FLAG_COST_LAYER = 1
+
+class GridMap:
+    """Array-backed occupancy grid with an optional cost layer, used for saving, loading and headless runs."""
+
+    def __init__(self, width, height, bits=None, costs=None):
+        self.width = width
+        self.height = height
+        self.stride = (width + 7) // 8  # Bytes per packed row
+        self.bits = bits if bits is not None else bytearray(self.stride * height)
+        self.costs = costs
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def is_blocked(self, col, row):
+        return self.bits[row * self.stride + (col >> 3)] >> (col & 7) & 1
+
+    def is_walkable(self, col, row):
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return not self.is_blocked(col, row)
+        return False
+
+    def set_blocked(self, col, row, blocked=True):
+        index = row * self.stride + (col >> 3)
+        if blocked:
+            self.bits[index] |= 1 << (col & 7)
+        else:
+            self.bits[index] &= ~(1 << (col & 7)) & 0xFF
+
+    # Sets a whole row from a sequence of barrier flags, one per cell
+    def set_row(self, row, cells):
+        start = row * self.stride
+        self.bits[start:start + self.stride] = pack_row(cells)
+
+    def fill(self, blocked):
+        # Padding bits get set as well, they are never read back
+        self.bits[:] = (b"\xff" if blocked else b"\x00") * len(self.bits)
+
+    def add_cost_layer(self, default_cost=1):
+        if self.costs is None:
+            self.costs = bytearray([default_cost]) * (self.width * self.height)
+
+    def get_cost(self, col, row):
+        if self.costs is None:
+            return 1
+        return self.costs[row * self.width + col]
+
+    def set_cost(self, col, row, cost):
+        self.add_cost_layer()
+        self.costs[row * self.width + col] = cost
+
+    def save(self, path):
+        flags = FLAG_COST_LAYER if self.costs is not None else 0
+        with open(path, "wb") as file:
+            file.write(MAP_HEADER.pack(MAP_MAGIC, MAP_VERSION, flags, self.width, self.height))
+            file.write(self.bits)
+            if self.costs is not None:
+                file.write(self.costs)
+
+    @classmethod
+    def load(cls, path, writable=False):
+        # Maps the file and points the layers straight at it, nothing is copied.
+        # A writable map uses a private copy-on-write mapping, so edits never reach the file.
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY if writable else mmap.ACCESS_READ)
+
+        try:
+            if len(mapped) < MAP_HEADER.size:
+                raise ValueError(f"{path} is not a map file")
+            magic, version, flags, width, height = MAP_HEADER.unpack_from(mapped, 0)
+            if magic != MAP_MAGIC or version != MAP_VERSION:
+                raise ValueError(f"{path} is not a version {MAP_VERSION} map file")
+
+            stride = (width + 7) // 8
+            bits_end = MAP_HEADER.size + stride * height
+            costs_end = bits_end + width * height if flags & FLAG_COST_LAYER else bits_end
+            if len(mapped) < costs_end:
+                raise ValueError(f"{path} is truncated")
+        except ValueError:
+            mapped.close()
+            raise
+
+        view = memoryview(mapped)
+        bits = view[MAP_HEADER.size:bits_end]
+        costs = view[bits_end:costs_end] if flags & FLAG_COST_LAYER else None
+        view.release()
+
+        grid_map = cls(width, height, bits, costs)
+        grid_map._mmap = mapped
+        return grid_map
+
+    def close(self):
+        # Memoryviews must be released before the mapping can be closed
+        if self._mmap is None:
+            return
+        self.bits.release()
+        if self.costs is not None:
+            self.costs.release()
+        self._mmap.close()
+        self._mmap = None
+
+# Writes a map one row at a time, for maps that are too big to build in memory.
+# The height is filled in when the writer is closed, streamed maps have no cost layer.
+class MapWriter:
+    def __init__(self, path, width):
+        self.width = width
+        self.height = 0
+        self.file = open(path, "wb")
+        self.file.write(MAP_HEADER.pack(MAP_MAGIC, MAP_VERSION, 0, width, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_row(self, cells):
+        self.file.write(pack_row(cells))
+        self.height += 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self.file.write(MAP_HEADER.pack(MAP_MAGIC, MAP_VERSION, 0, self.width, self.height))
+        self.file.close()
+
+# Packs a sequence of barrier flags into the map's bit layout
+def pack_row(cells):
+    packed = bytearray((len(cells) + 7) // 8)
+    for col, blocked in enumerate(cells):
+        if blocked:
+            packed[col >> 3] |= 1 << (col & 7)
+    return packed
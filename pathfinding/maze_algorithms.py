@@ -1,146 +1,458 @@
-import pygame
+import heapq
 import random
+from abc import ABC, abstractmethod
 from .constants import *
-from .grid import *
+from .map_format import GridMap, MapWriter
 
-class MazeAlgorithm:
-    def __init__(self, grid, window, delay=1):
-        self.grid = grid
-        self.window = window
-        self.delay = delay
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, it's only used for bulk maze generation
+    np = None
 
-    def draw_grid(self):
-        self.grid.draw_grid(self.window)
-        pygame.display.update()
-        pygame.time.delay(self.delay)
+# Number of cell rows handled per batch by the vectorized generators, keeps the temporary arrays small
+BULK_ROWS_PER_CHUNK = 512
 
-class RecursiveDFS(MazeAlgorithm):
-    def start(self):
-        # Pick a random starting point for the maze generation
-        start_col = random.choice(range(1, COLS - 1, 2))
-        start_row = random.choice(range(1, ROWS - 1, 2))
-        self.generate_maze(start_col, start_row)
+# Maze generators start from a grid full of barriers and yield the (col, row) of every cell they carve.
+# They keep their own record of carved cells, so they run headless at full speed and the caller
+# decides whether to apply the events to a Grid (animated) or a GridMap (benchmarks).
+# All randomness comes from self.random, so the same seed always gives the same maze. Binary Tree and
+# Sidewinder also have a vectorized generate_array for NumPy installs, it takes the same draws in the
+# same order as generate, so a seed gives the same maze with or without NumPy.
+class MazeAlgorithm(ABC):
+    def __init__(self, cols=COLS, rows=ROWS, seed=None):
+        self.cols = cols
+        self.rows = rows
+        self.random = make_random(seed)
+        self.carved = bytearray(cols * rows)
+
+    def carve(self, col, row):
+        self.carved[row * self.cols + col] = 1
+        return col, row
 
-    def generate_maze(self, col, row):
-        # Carve the starting point and draw the grid
-        self.grid.grid[row][col].reset()
-        self.draw_grid()
+    def is_carved(self, col, row):
+        return self.carved[row * self.cols + col]
 
-        # Define the directions for movement (up, down, left, right)
+    def in_bounds(self, col, row):
+        return 0 <= col < self.cols and 0 <= row < self.rows
+
+    def shuffled_directions(self):
+        # Directions for movement (up, down, left, right), two cells at a time to leave walls in between
         directions = [(0, -2), (0, 2), (-2, 0), (2, 0)]
-        random.shuffle(directions)
+        self.random.shuffle(directions)
+        return directions
 
-        # Try each direction
-        for direction in directions:
-            next_col = col + direction[0]
-            next_row = row + direction[1]
+    # Every generator yields its carves, a subclass without one can't be instantiated
+    @abstractmethod
+    def generate(self):
+        pass
+
+class RecursiveDFS(MazeAlgorithm):
+    # Same carving order as the recursive version, but the call stack is an explicit list
+    # so the maze size isn't limited by the recursion limit
+    def generate(self):
+        # Pick a random starting point for the maze generation
+        start_col = self.random.choice(range(1, self.cols - 1, 2))
+        start_row = self.random.choice(range(1, self.rows - 1, 2))
+        yield self.carve(start_col, start_row)
 
-            # Ensure we stay within bounds and carve a path
-            if 0 <= next_col < COLS and 0 <= next_row < ROWS:
-                if self.grid.grid[next_row][next_col].is_barrier():
-                    # Carve a path between the current and next cell
-                    wall_col = col + direction[0] // 2
-                    wall_row = row + direction[1] // 2
-                    self.grid.grid[wall_row][wall_col].reset()
-                    # Recursively carve the next cell
-                    self.generate_maze(next_col, next_row)
-                    # Draw grid after every carve
-                    self.draw_grid()
+        stack = [(start_col, start_row, iter(self.shuffled_directions()))]
+        while stack:
+            col, row, directions = stack[-1]
+
+            # Try the remaining directions of the cell on top of the stack
+            for direction in directions:
+                next_col = col + direction[0]
+                next_row = row + direction[1]
+
+                if self.in_bounds(next_col, next_row) and not self.is_carved(next_col, next_row):
+                    # Carve a path between the current and next cell, then continue from the next cell
+                    yield self.carve(col + direction[0] // 2, row + direction[1] // 2)
+                    yield self.carve(next_col, next_row)
+                    stack.append((next_col, next_row, iter(self.shuffled_directions())))
+                    break
+            else:
+                stack.pop()  # Dead end, backtrack
 
 class GrowingTree(MazeAlgorithm):
-    def start(self):
+    def generate(self):
         # Pick a random starting point for the maze generation
-        start_col = random.choice(range(1, COLS, 2))
-        start_row = random.choice(range(1, ROWS, 2))
-        self.generate_maze(start_col, start_row)
+        start_col = self.random.choice(range(1, self.cols, 2))
+        start_row = self.random.choice(range(1, self.rows, 2))
+        yield self.carve(start_col, start_row)
 
-    def generate_maze(self, col, row):
-        # Initialize the starting cell and draw the grid
-        start_cell = self.grid.grid[row][col]
-        start_cell.reset()
-        self.draw_grid()
-
-        cells = [start_cell]
+        cells = [(start_col, start_row)]
 
         while cells:
-            current_cell = random.choice(cells)
-            directions = [(0, -2), (0, 2), (-2, 0), (2, 0)]
-            random.shuffle(directions)
+            index = self.random.randrange(len(cells))
+            col, row = cells[index]
 
             carved_any = False
-            for direction in directions:
-                next_col = current_cell.col + direction[0]
-                next_row = current_cell.row + direction[1]
-
-                if 0 <= next_col < COLS and 0 <= next_row < ROWS:
-                    if self.grid.grid[next_row][next_col].is_barrier():
-                        # Carve path between current cell and next cell
-                        wall_col = current_cell.col + direction[0] // 2
-                        wall_row = current_cell.row + direction[1] // 2
-                        self.grid.grid[wall_row][wall_col].reset()
-                        self.grid.grid[next_row][next_col].reset()
-                        cells.append(self.grid.grid[next_row][next_col])
-                        carved_any = True
-                        # Draw grid after carving
-                        self.draw_grid()
-                        break
+            for direction in self.shuffled_directions():
+                next_col = col + direction[0]
+                next_row = row + direction[1]
+
+                if self.in_bounds(next_col, next_row) and not self.is_carved(next_col, next_row):
+                    # Carve path between current cell and next cell
+                    yield self.carve(col + direction[0] // 2, row + direction[1] // 2)
+                    yield self.carve(next_col, next_row)
+                    cells.append((next_col, next_row))
+                    carved_any = True
+                    break
 
             if not carved_any:
-                cells.remove(current_cell)
+                # Swap with the last cell before removing, so removal doesn't shift the whole list
+                cells[index] = cells[-1]
+                cells.pop()
 
 class BinaryTree(MazeAlgorithm):
-    def start(self):
-        self.generate_maze()
+    def generate(self):
+        for row in range(1, self.rows, 2):
+            pick_east = self.random.getrandbits(self.cols // 2)  # One bit per cell of the row
 
-    def generate_maze(self):
-        for row in range(1, ROWS, 2):
-            for col in range(1, COLS, 2):
-                self.grid.grid[row][col].reset()
+            for col in range(1, self.cols, 2):
+                yield self.carve(col, row)
 
-                directions = []
-                if col + 2 < COLS:
-                    directions.append((2, 0))  # East
-                if row + 2 < ROWS:
-                    directions.append((0, 2))  # South
+                # Cells that can only go one way take it, the others pick east or south at random
+                can_east, can_south = col + 2 < self.cols, row + 2 < self.rows
+                if can_east and (pick_east >> col // 2 & 1 or not can_south):
+                    yield self.carve(col + 1, row)
+                elif can_south:
+                    yield self.carve(col, row + 1)
 
-                if directions:
-                    direction = random.choice(directions)
-                    wall_col = col + direction[0] // 2
-                    wall_row = row + direction[1] // 2
-                    self.grid.grid[wall_row][wall_col].reset()
+    # Carves the whole maze with array operations, returns a boolean array where True is a barrier
+    def generate_array(self):
+        blocked = np.ones((self.rows, self.cols), dtype=bool)
+        blocked[1::2, 1::2] = False
 
-                # Draw grid after every step
-                self.draw_grid()
+        cell_rows, cell_cols = blocked[1::2, 1::2].shape
+        can_east = np.arange(1, self.cols, 2) + 2 < self.cols
+        can_south = np.arange(1, self.rows, 2) + 2 < self.rows
+        east_walls = blocked[1::2, 2::2]
+        south_walls = blocked[2::2, 1::2]
 
-class Sidewinder(MazeAlgorithm):
-    def start(self):
-        self.generate_maze()
+        for first in range(0, cell_rows, BULK_ROWS_PER_CHUNK):
+            last = min(first + BULK_ROWS_PER_CHUNK, cell_rows)
+            pick_east = random_rows(self.random, last - first, cell_cols)
+
+            # Cells that can only go one way take it, the others pick east or south at random
+            east = can_east & (pick_east | ~can_south[first:last, None])
+            south = can_south[first:last, None] & ~east
+
+            east_walls[first:last] &= ~east[:, :east_walls.shape[1]]
+            south_rows = min(last, south_walls.shape[0]) - first
+            if south_rows > 0:
+                south_walls[first:first + south_rows] &= ~south[:south_rows]
 
-    def generate_maze(self):
-        for row in range(1, ROWS, 2):
+        return blocked
+
+class Sidewinder(MazeAlgorithm):
+    def generate(self):
+        for row in range(1, self.rows, 2):
+            # The first row is a single run carved all the way east. The other rows draw one bit per cell
+            # to decide whether to carve east, then a 32-bit word per run to pick where it carves north.
+            carve_east = [col + 2 < self.cols for col in range(1, self.cols, 2)]
+            if row > 1:
+                bits = self.random.getrandbits(self.cols // 2)
+                carve_east = [east and bool(bits >> index & 1) for index, east in enumerate(carve_east)]
+                words = self.random.getrandbits(32 * carve_east.count(False))
             run_set = []
 
-            for col in range(1, COLS, 2):
-                self.grid.grid[row][col].reset()  # Reset the current cell (carve the path)
-                run_set.append(self.grid.grid[row][col])  # Add current cell to the run set
-
-                # Decide if we should carve east or carve north
-                carve_east = (col + 2 < COLS) and (row == 1 or random.choice([True, False]))
-
-                if carve_east:
-                    # Carve east
-                    next_col = col + 2
-                    self.grid.grid[row][next_col].reset()  # Reset the east cell
-                    wall_col = col + 1  # Carve the wall between current and east cell
-                    self.grid.grid[row][wall_col].reset()
-                else:
-                    # Carve north
-                    if run_set and row > 1:
-                        cell_to_carve_north = random.choice(run_set)  # Pick a random cell from the run set
-                        self.grid.grid[cell_to_carve_north.row - 2][cell_to_carve_north.col].reset()  # Reset the north cell
-                        wall_row = cell_to_carve_north.row - 1  # Carve the wall between current and north cell
-                        self.grid.grid[wall_row][cell_to_carve_north.col].reset()
-                        run_set = []  # Clear the run set after carving north
-
-                # Draw grid after every step to visualize the progress
-                self.draw_grid()
+            for col, east in zip(range(1, self.cols, 2), carve_east):
+                yield self.carve(col, row)  # Carve the current cell
+                run_set.append(col)  # Add current cell to the run set
+
+                if east:
+                    # Carve the wall between current and east cell, then the east cell
+                    yield self.carve(col + 1, row)
+                    yield self.carve(col + 2, row)
+                elif row > 1:
+                    # Carve north from a random cell of the run, then start a new run
+                    run_col = run_set[(words & 0xFFFFFFFF) * len(run_set) >> 32]
+                    words >>= 32
+                    yield self.carve(run_col, row - 1)  # Carve the wall between the run cell and the north cell
+                    run_set = []
+
+    # Carves the whole maze with array operations, returns a boolean array where True is a barrier
+    def generate_array(self):
+        blocked = np.ones((self.rows, self.cols), dtype=bool)
+        blocked[1::2, 1::2] = False
+
+        cell_rows, cell_cols = blocked[1::2, 1::2].shape
+        can_east = np.arange(1, self.cols, 2) + 2 < self.cols
+        east_walls = blocked[1::2, 2::2]
+        north_walls = blocked[2::2, 1::2]
+
+        # The first row is a single run carved all the way east
+        east_walls[0] &= ~can_east[:east_walls.shape[1]]
+
+        # A row at a time, each row's run picks are drawn right after its east bits, like in generate
+        for cell_row in range(1, cell_rows):
+            carve_east = can_east & random_rows(self.random, 1, cell_cols)[0]
+            east_walls[cell_row] &= ~carve_east[:east_walls.shape[1]]
+
+            # A run closes wherever a cell doesn't carve east, the last cell of a row always closes
+            run_ends = np.flatnonzero(~carve_east)
+            run_starts = np.empty_like(run_ends)
+            run_starts[0] = 0
+            run_starts[1:] = run_ends[:-1] + 1
+
+            # Every closed run carves north from one of its cells, picked by its 32-bit word
+            run_lengths = (run_ends - run_starts + 1).astype(np.uint64)
+            words = np.frombuffer(self.random.getrandbits(32 * len(run_ends)).to_bytes(4 * len(run_ends), "little"), dtype="<u4")
+            picks = (words.astype(np.uint64) * run_lengths >> np.uint64(32)).astype(np.intp)
+            north_walls[cell_row - 1, run_starts + picks] = False
+
+        return blocked
+
+# Kruskal's algorithm joins cells through walls taken in random order, skipping walls whose two
+# cells are already connected. The connectivity checks go through a union-find (DisjointSet).
+class Kruskal(MazeAlgorithm):
+    def generate(self):
+        cell_cols = len(range(1, self.cols, 2))
+        cell_rows = len(range(1, self.rows, 2))
+        sets = DisjointSet(cell_cols * cell_rows)
+
+        # Every wall between two cells, as the cells on each side
+        walls = []
+        for row in range(1, self.rows, 2):
+            for col in range(1, self.cols, 2):
+                if col + 2 < self.cols:
+                    walls.append((col, row, col + 2, row))  # East
+                if row + 2 < self.rows:
+                    walls.append((col, row, col, row + 2))  # South
+        self.random.shuffle(walls)
+
+        for col, row, next_col, next_row in walls:
+            cell = (row // 2) * cell_cols + col // 2
+            next_cell = (next_row // 2) * cell_cols + next_col // 2
+            if sets.union(cell, next_cell):
+                for carve_col, carve_row in ((col, row), ((col + next_col) // 2, (row + next_row) // 2), (next_col, next_row)):
+                    if not self.is_carved(carve_col, carve_row):
+                        yield self.carve(carve_col, carve_row)
+
+        # A maze with a single cell has no walls to join
+        if cell_cols * cell_rows == 1:
+            yield self.carve(1, 1)
+
+# Prim's algorithm grows the maze from one cell, always carving through the cheapest wall on the
+# frontier. Walls get random weights and the frontier is a heap, so picking a wall is O(log n).
+class Prim(MazeAlgorithm):
+    def generate(self):
+        start_col = self.random.choice(range(1, self.cols, 2))
+        start_row = self.random.choice(range(1, self.rows, 2))
+        yield self.carve(start_col, start_row)
+
+        frontier = []
+        self.add_frontier(frontier, start_col, start_row)
+
+        while frontier:
+            weight, col, row, next_col, next_row = heapq.heappop(frontier)
+            if self.is_carved(next_col, next_row):
+                continue  # Both sides are already in the maze
+
+            yield self.carve((col + next_col) // 2, (row + next_row) // 2)
+            yield self.carve(next_col, next_row)
+            self.add_frontier(frontier, next_col, next_row)
+
+    def add_frontier(self, frontier, col, row):
+        for direction in ((0, -2), (0, 2), (-2, 0), (2, 0)):
+            next_col = col + direction[0]
+            next_row = row + direction[1]
+            if self.in_bounds(next_col, next_row) and not self.is_carved(next_col, next_row):
+                heapq.heappush(frontier, (self.random.random(), col, row, next_col, next_row))
+
+# Wilson's algorithm adds one loop-erased random walk at a time to the maze. Every spanning tree is
+# equally likely, so the mazes have no bias in corridor direction or length.
+class Wilson(MazeAlgorithm):
+    def generate(self):
+        cells = [(col, row) for row in range(1, self.rows, 2) for col in range(1, self.cols, 2)]
+        self.random.shuffle(cells)
+
+        first_col, first_row = cells.pop()
+        yield self.carve(first_col, first_row)
+
+        # Last direction the walk took out of each cell, following them afterwards erases the loops
+        exits = {}
+        for col, row in cells:
+            if self.is_carved(col, row):
+                continue
+
+            # Walk at random until the walk reaches the maze
+            walk_col, walk_row = col, row
+            while not self.is_carved(walk_col, walk_row):
+                direction = self.random.choice([d for d in ((0, -2), (0, 2), (-2, 0), (2, 0)) if self.in_bounds(walk_col + d[0], walk_row + d[1])])
+                exits[(walk_col, walk_row)] = direction
+                walk_col += direction[0]
+                walk_row += direction[1]
+
+            # Carve the loop-erased walk
+            walk_col, walk_row = col, row
+            while not self.is_carved(walk_col, walk_row):
+                direction = exits.pop((walk_col, walk_row))
+                yield self.carve(walk_col, walk_row)
+                yield self.carve(walk_col + direction[0] // 2, walk_row + direction[1] // 2)
+                walk_col += direction[0]
+                walk_row += direction[1]
+            exits.clear()
+
+# Union-find over integer ids, with path compression and union by size
+class DisjointSet:
+    def __init__(self, count):
+        self.parents = list(range(count))
+        self.sizes = [1] * count
+
+    def find(self, item):
+        root = item
+        while self.parents[root] != root:
+            root = self.parents[root]
+        while self.parents[item] != root:
+            self.parents[item], item = root, self.parents[item]
+        return root
+
+    # Joins the sets of both items, returns False if they were already in the same set
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return False
+        if self.sizes[first] < self.sizes[second]:
+            first, second = second, first
+        self.parents[second] = first
+        self.sizes[first] += self.sizes[second]
+        return True
+
+# Eller's algorithm only keeps the sets of the current row, so it streams mazes one map row at a time
+# with O(width) memory. With rows=None the maze never ends, which is useful for stress tests.
+class Eller(MazeAlgorithm):
+    def __init__(self, cols=COLS, rows=ROWS, seed=None):
+        # No record of carved cells, the rows are handed out as soon as they're finished
+        self.cols = cols
+        self.rows = rows
+        self.random = make_random(seed)
+
+    def generate(self):
+        for row, cells in enumerate(self.generate_rows()):
+            for col, blocked in enumerate(cells):
+                if not blocked:
+                    yield col, row
+
+    # Yields every row of the map as a bytearray with 1 for barriers and 0 for carved cells
+    def generate_rows(self):
+        cell_cols = range(1, self.cols, 2)
+        sets = [0] * len(cell_cols)  # Set of each cell in the current row, 0 until one is assigned
+        next_set = 1
+
+        yield bytearray([1]) * self.cols  # Top border
+        emitted = 1
+
+        row = 1
+        while self.rows is None or row < self.rows:
+            last_row = self.rows is not None and row + 2 >= self.rows
+
+            # Cells that weren't carved into from above start in a set of their own
+            for index in range(len(sets)):
+                if not sets[index]:
+                    sets[index] = next_set
+                    next_set += 1
+
+            # Randomly join neighbors from different sets, the last row joins all of them
+            cells = bytearray([1]) * self.cols
+            parents = {}
+            for index, col in enumerate(cell_cols):
+                cells[col] = 0
+                if index + 1 < len(sets) and col + 2 < self.cols:
+                    left, right = find_set(parents, sets[index]), find_set(parents, sets[index + 1])
+                    if left != right and (last_row or self.random.choice([True, False])):
+                        parents[right] = left
+                        cells[col + 1] = 0
+            sets = [find_set(parents, cell_set) for cell_set in sets]
+
+            yield cells
+            emitted += 1
+            if last_row:
+                break
+
+            # Every set carves south at least once, the cells below the other carves start new sets
+            members = {}
+            for index, cell_set in enumerate(sets):
+                members.setdefault(cell_set, []).append(index)
+
+            walls = bytearray([1]) * self.cols
+            next_sets = [0] * len(sets)
+            for cell_set, indices in members.items():
+                chosen = [index for index in indices if self.random.choice([True, False])] or [self.random.choice(indices)]
+                for index in chosen:
+                    walls[cell_cols[index]] = 0
+                    next_sets[index] = cell_set
+
+            yield walls
+            emitted += 1
+            sets = next_sets
+            row += 2
+
+        # Bottom border, one or two rows depending on the height
+        while self.rows is not None and emitted < self.rows:
+            yield bytearray([1]) * self.cols
+            emitted += 1
+
+# Union-find lookup with path compression, sets that were never merged are their own root
+def find_set(parents, cell_set):
+    root = cell_set
+    while root in parents:
+        root = parents[root]
+    while cell_set != root:
+        parents[cell_set], cell_set = root, parents[cell_set]
+    return root
+
+# Accepts a seed or a random.Random instance, seed=None picks a fresh random seed
+def make_random(seed=None):
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+# Random boolean array of rows x count, one getrandbits(count) per row with bit i for cell i. These are
+# the draws the pure Python generators take a row at a time.
+def random_rows(rng, rows, count):
+    row_bytes = (count + 7) // 8
+    packed = b"".join(rng.getrandbits(count).to_bytes(row_bytes, "little") for _ in range(rows))
+    bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8).reshape(rows, row_bytes), axis=1, bitorder="little")
+    return bits[:, :count].view(bool)
+
+# Maze generators by the name used in Grid.get_maze_algorithm
+MAZE_ALGORITHMS = {
+    "RecursiveDFS": RecursiveDFS,
+    "GrowingTree": GrowingTree,
+    "BinaryTree": BinaryTree,
+    "Sidewinder": Sidewinder,
+    "Eller": Eller,
+    "Kruskal": Kruskal,
+    "Prim": Prim,
+    "Wilson": Wilson,
+}
+
+# Generates a maze without a display, straight into a bit-packed map
+def generate_maze_map(name, cols, rows, seed=None):
+    algorithm = MAZE_ALGORITHMS[name](cols, rows, seed)
+
+    # Vectorized generators fill the whole map at once, the bits are packed in the map's own layout
+    if np is not None and hasattr(algorithm, "generate_array"):
+        bits = np.packbits(algorithm.generate_array(), axis=1, bitorder="little")
+        return GridMap(cols, rows, bytearray(bits.tobytes()))
+
+    grid_map = GridMap(cols, rows)
+
+    # Streaming generators hand out whole rows
+    if hasattr(algorithm, "generate_rows"):
+        for row, cells in enumerate(algorithm.generate_rows()):
+            grid_map.set_row(row, cells)
+        return grid_map
+
+    grid_map.fill(True)
+    for col, row in algorithm.generate():
+        grid_map.set_blocked(col, row, False)
+    return grid_map
+
+# Streams a maze from a row generator (Eller) straight to disk, only one row is ever held in memory
+def write_maze_file(path, name, cols, rows, seed=None):
+    with MapWriter(path, cols) as writer:
+        for cells in MAZE_ALGORITHMS[name](cols, rows, seed).generate_rows():
+            writer.write_row(cells)
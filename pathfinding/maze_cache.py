@@ -0,0 +1,78 @@
+import hashlib
+import os
+from .constants import MAZE_CACHE_DIR, MAZE_CACHE_MAX_BYTES
+from .map_format import GridMap
+from .maze_algorithms import MAZE_ALGORITHMS, generate_maze_map, write_maze_file
+
+# Bump when a generator changes, so mazes cached by older code are never handed out for a seed
+MAZE_CACHE_VERSION = 2
+
+# Directory of generated mazes, one map file per (generator, size, seed), named by the hash of the key.
+# A hit is just a memory-mapped open, and the least recently used files are deleted once the
+# directory grows past max_bytes. Hits touch the file, so the modification time is the last use.
+class MazeCache:
+    def __init__(self, directory=MAZE_CACHE_DIR, max_bytes=MAZE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, name, cols, rows, seed):
+        key = f"{MAZE_CACHE_VERSION}:{name}:{cols}x{rows}:{seed}"
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".aamap")
+
+    def get(self, name, cols, rows, seed):
+        path = self.path_for(name, cols, rows, seed)
+        try:
+            grid_map = GridMap.load(path)
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # Mark as recently used
+        return grid_map
+
+    def get_or_generate(self, name, cols, rows, seed):
+        # Unseeded mazes are different every time, there's nothing to reuse
+        if seed is None:
+            raise ValueError("only seeded mazes can be cached")
+
+        grid_map = self.get(name, cols, rows, seed)
+        if grid_map is None:
+            self.put(name, cols, rows, seed)
+            grid_map = GridMap.load(self.path_for(name, cols, rows, seed))
+        return grid_map
+
+    def put(self, name, cols, rows, seed):
+        path = self.path_for(name, cols, rows, seed)
+
+        # Written under a temporary name and renamed, so a crash never leaves a half written maze in the cache
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        if hasattr(MAZE_ALGORITHMS[name], "generate_rows"):
+            write_maze_file(temp_path, name, cols, rows, seed)
+        else:
+            generate_maze_map(name, cols, rows, seed).save(temp_path)
+        os.replace(temp_path, path)
+
+        self.evict(keep=path)
+
+    def evict(self, keep=None):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".aamap"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:  # Still mapped by someone on Windows, try again next time
+                continue
+            total -= size
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".aamap"):
+                os.remove(entry.path)
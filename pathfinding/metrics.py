@@ -0,0 +1,114 @@
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+
+# Counters and timings of a single search, returned by every find_path
+@dataclass
+class SearchMetrics:
+    algorithm: str = ""
+    found: bool = False
+    path_length: float = 0
+    expansions: int = 0  # Nodes taken off the open list and expanded
+    generated: int = 0  # Neighbors looked at while expanding
+    reopenings: int = 0  # Nodes put back on the open list after a cheaper path to them was found
+    peak_open: int = 0  # Largest size of the open list
+    pushes: int = 0  # Open list operations, heap pushes and pops for the best-first searches
+    pops: int = 0
+    phase_times: dict = field(default_factory=dict)  # Seconds spent in each phase (setup, search, path, draw)
+    memory_peak: int = None  # Peak traced memory in bytes, only when the search tracks memory
+    tie_breaking: str = None  # A* tie-breaking policy, None for the other algorithms
+    open_list: str = None  # Open list of the best-first searches, a binary heap or one of A*'s integer open lists
+    line_of_sight_checks: int = None  # Lines walked by the any-angle searches, and the checks answered from their cache
+    line_of_sight_cache_hits: int = None
+    peak_stored: int = None  # Memory ceiling of the memory-bounded searches, the most nodes they held at once
+    reexpansions: int = None  # Expansions of cells the memory-bounded searches had already expanded and forgotten
+    iterations: int = None  # Threshold rounds of IDA* and Fringe Search
+    gave_up: bool = None  # Stopped at a limit (IDA*'s expansions, ARA*'s time budget) before a path, so there may be one after all
+    suboptimality_bound: float = None  # ARA*: the path is at most this many times longer than the shortest one
+    improvements: list = None  # ARA*: every solution found, with its weight, bound, length and time
+
+    def __post_init__(self):
+        self.current_phase = None
+        self.phase_started = 0
+
+    # Phases are exclusive, entering one stops the clock of the previous one
+    def enter_phase(self, name):
+        now = time.perf_counter()
+        if self.current_phase is not None:
+            self.phase_times[self.current_phase] = self.phase_times.get(self.current_phase, 0) + now - self.phase_started
+        self.current_phase = name
+        self.phase_started = now
+
+    # Wraps the draw callback, so drawing is timed on its own instead of inside the search
+    def timed(self, callback):
+        def timed_callback():
+            phase = self.current_phase
+            self.enter_phase("draw")
+            callback()
+            self.enter_phase(phase)
+        return timed_callback
+
+    @property
+    def nodes_visited(self):
+        return self.expansions
+
+    @property
+    def total_time(self):
+        return sum(self.phase_times.values())
+
+    @property
+    def expansions_per_second(self):
+        search_time = self.phase_times.get("search", 0)
+        return self.expansions / search_time if search_time > 0 else 0
+
+    # Short text for the visualizer's prompt
+    def summary(self):
+        result = f"Nodes Visited: {self.expansions} Path Length: {round(self.path_length, 2)}" if self.found else f"No path found! Nodes Visited: {self.expansions}"
+        if self.gave_up:
+            result = f"Gave up after {self.expansions} nodes visited"
+        details = (f"Generated: {self.generated}, peak open: {self.peak_open}, reopened: {self.reopenings}. "
+                   f"{self.expansions_per_second:,.0f} expansions/s, {self.phase_times.get('search', 0) * 1000:.1f} ms searching")
+        if self.peak_stored is not None:
+            details += f", at most {self.peak_stored} nodes stored, {self.reexpansions} re-expansions"
+        if self.improvements:
+            details += f", {len(self.improvements)} solutions, suboptimality bound {self.suboptimality_bound:.2f}"
+        if self.memory_peak is not None:
+            details += f", {self.memory_peak / 1024:,.0f} KB peak memory"
+        return f"{result}. {details}."
+
+    def to_dict(self):
+        data = asdict(self)
+        data["total_time"] = self.total_time
+        data["expansions_per_second"] = self.expansions_per_second
+        return data
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def save(self, path):
+        with open(path, "w") as file:
+            file.write(self.to_json())
+
+# Tracks the peak memory of a search with tracemalloc. Tracing slows Python down a lot, so searches
+# only do it when asked to (PathfindingAlgorithm.track_memory).
+class MemoryTracker:
+    def __init__(self):
+        self.started = False
+        self.baseline = 0
+
+    def start(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()  # Someone else is tracing, measure from here on
+        else:
+            tracemalloc.start()
+            self.started = True
+        self.baseline = tracemalloc.get_traced_memory()[0]
+
+    # Returns the peak memory allocated since start, in bytes
+    def stop(self):
+        peak = tracemalloc.get_traced_memory()[1] - self.baseline
+        if self.started:
+            tracemalloc.stop()
+            self.started = False
+        return peak
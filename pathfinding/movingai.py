@@ -0,0 +1,172 @@
+import argparse
+import os
+from dataclasses import dataclass
+from .constants import MOVEMENTS, MOVE_8_NO_CORNERS
+from .grid import Grid
+from .heuristics import HEURISTICS
+from .headless import run_search
+from .map_format import GridMap
+from .metrics import SearchMetrics
+from .pathfinding_algorithms import ALGORITHMS
+
+# Loader and runner for the MovingAI grid benchmarks (https://movingai.com/benchmarks/grids.html).
+# Only '.', 'G' and 'S' are passable, trees, water and out of bounds tiles are treated as barriers.
+PASSABLE_TERRAIN = ".GS"
+
+@dataclass
+class Scenario:
+    bucket: int
+    map_name: str
+    map_width: int
+    map_height: int
+    start: tuple
+    goal: tuple
+    optimal_length: float
+
+@dataclass
+class ScenarioResult:
+    scenario: Scenario
+    metrics: SearchMetrics
+
+    # Time spent in the search phase only. Clearing the grid and the per-search setup are left out,
+    # on a big map they can dwarf a short search and the times couldn't be compared with published ones.
+    @property
+    def elapsed(self):
+        return self.metrics.phase_times.get("search", 0)
+
+    @property
+    def nodes_visited(self):
+        return self.metrics.expansions
+
+    @property
+    def path_length(self):
+        return self.metrics.path_length
+
+    @property
+    def found(self):
+        return self.metrics.found
+
+    @property
+    def optimal(self):
+        return self.found and abs(self.path_length - self.scenario.optimal_length) < 1e-4
+
+def load_map(path):
+    with open(path) as file:
+        lines = file.read().splitlines()
+
+    # Header lines come before the "map" line, in any order
+    header = {}
+    for index, line in enumerate(lines):
+        if line.strip() == "map":
+            break
+        fields = line.split()
+        if len(fields) == 2:
+            header[fields[0]] = fields[1]
+        elif fields:
+            raise ValueError(f"{path}: malformed header line {line!r}")
+    else:
+        raise ValueError(f"{path} has no \"map\" line, it is not a MovingAI map")
+
+    try:
+        width, height = int(header["width"]), int(header["height"])
+    except (KeyError, ValueError):
+        raise ValueError(f"{path} has no valid width and height in its header") from None
+    if width < 1 or height < 1:
+        raise ValueError(f"{path} is {width}x{height}, a map needs at least one tile")
+    tile_rows = lines[index + 1:index + 1 + height]
+    if len(tile_rows) < height:
+        raise ValueError(f"{path} has {len(tile_rows)} rows of tiles, its header says {height}")
+
+    grid_map = GridMap(width, height)
+    for row, line in enumerate(tile_rows):
+        for col, tile in enumerate(line[:width]):
+            if tile not in PASSABLE_TERRAIN:
+                grid_map.set_blocked(col, row)
+    return grid_map
+
+def load_scenarios(path):
+    scenarios = []
+    with open(path) as file:
+        for line in file:
+            fields = line.split("\t")
+            if len(fields) != 9:  # Skips the "version" line and blank lines
+                continue
+            bucket, map_name, width, height, start_col, start_row, goal_col, goal_row, optimal_length = fields
+            scenarios.append(Scenario(
+                int(bucket), map_name, int(width), int(height),
+                (int(start_col), int(start_row)), (int(goal_col), int(goal_row)),
+                float(optimal_length)
+            ))
+    return scenarios
+
+def find_map_file(scenario_path, map_name):
+    # Scenario files name their map relative to the benchmark root, try next to the scenario file as well
+    directory = os.path.dirname(scenario_path)
+    for candidate in (os.path.join(directory, map_name), os.path.join(directory, os.path.basename(map_name))):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+# The published optimal lengths are for 8-way movement without corner cutting, diagonal steps costing sqrt(2)
+def run_scenarios(grid_map, scenarios, algorithm_name, heuristic, movement=MOVE_8_NO_CORNERS):
+    grid = Grid.from_map(grid_map)
+    grid.update_valid_neighbors(movement)
+
+    results = []
+    for scenario in scenarios:
+        metrics = run_search(grid, algorithm_name, scenario.start, scenario.goal, heuristic)
+        results.append(ScenarioResult(scenario, metrics))
+    return results
+
+# Groups the results by bucket, scenarios in a bucket have similar optimal lengths
+def summarize_by_bucket(results):
+    buckets = {}
+    for result in results:
+        buckets.setdefault(result.scenario.bucket, []).append(result)
+
+    summary = {}
+    for bucket, bucket_results in sorted(buckets.items()):
+        total_time = sum(result.elapsed for result in bucket_results)
+        length_ratios = [result.path_length / result.scenario.optimal_length for result in bucket_results if result.found and result.scenario.optimal_length > 0]
+        summary[bucket] = {
+            "scenarios": len(bucket_results),
+            "optimal": sum(result.optimal for result in bucket_results),
+            "not_found": sum(not result.found for result in bucket_results),
+            # A shorter path than the published optimum means the map or the algorithm is wrong
+            "too_short": sum(result.path_length < result.scenario.optimal_length - 1e-4 for result in bucket_results if result.found),
+            "mean_length_ratio": sum(length_ratios) / len(length_ratios) if length_ratios else 0,
+            "mean_expansions": sum(result.nodes_visited for result in bucket_results) / len(bucket_results),
+            "mean_peak_open": sum(result.metrics.peak_open for result in bucket_results) / len(bucket_results),
+            "total_time": total_time,
+            "mean_time": total_time / len(bucket_results),
+        }
+    return summary
+
+def print_summary(summary):
+    print(f"{'Bucket':>6} {'Runs':>5} {'Optimal':>8} {'Missing':>8} {'Short':>6} {'Len ratio':>10} {'Expansions':>11} {'Peak open':>10} {'Search ms':>10}")
+    for bucket, stats in summary.items():
+        print(f"{bucket:>6} {stats['scenarios']:>5} {stats['optimal']:>8} {stats['not_found']:>8} {stats['too_short']:>6} "
+              f"{stats['mean_length_ratio']:>10.3f} {stats['mean_expansions']:>11.1f} {stats['mean_peak_open']:>10.1f} {stats['mean_time'] * 1000:>10.2f}")
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Run a MovingAI scenario file with one of the pathfinding algorithms.")
+    parser.add_argument("scenarios", help="path to a .scen file")
+    parser.add_argument("--map", help="path to the .map file (looked up next to the .scen file by default)")
+    parser.add_argument("--algorithm", default="A*", choices=ALGORITHMS)
+    parser.add_argument("--heuristic", default="Octile", choices=HEURISTICS)
+    parser.add_argument("--movement", default=MOVE_8_NO_CORNERS, choices=MOVEMENTS)
+    args = parser.parse_args(args)
+
+    scenarios = load_scenarios(args.scenarios)
+    if not scenarios:
+        parser.error(f"no scenarios found in {args.scenarios}")
+
+    map_path = args.map or find_map_file(args.scenarios, scenarios[0].map_name)
+    if map_path is None:
+        parser.error(f"could not find {scenarios[0].map_name}, pass it with --map")
+
+    results = run_scenarios(load_map(map_path), scenarios, args.algorithm, HEURISTICS[args.heuristic], args.movement)
+    print_summary(summarize_by_bucket(results))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import heapq
+from collections import deque
+from .constants import BUCKET_QUEUE_MAX_COST
+
+# Open lists for the best-first searches. They all push(priority, item, tie) and pop() the item
+# with the lowest priority as (priority, item), equal priorities first in the order they were pushed.
+
+# Binary heap, for any priorities. Ties go lowest tie key first, then first pushed.
+class HeapOpenList:
+    name = "binary heap"
+
+    def __init__(self):
+        self.heap = []
+        self.count = 0
+
+    def push(self, priority, item, tie=0):
+        self.count += 1
+        heapq.heappush(self.heap, (priority, tie, self.count, item))
+
+    def pop(self):
+        priority, _, _, item = heapq.heappop(self.heap)
+        return priority, item
+
+    def __len__(self):
+        return len(self.heap)
+
+# Dial's bucket queue: a FIFO bucket for every integer priority, and a cursor on the lowest one that
+# may hold items. Pushes are O(1), and so are pops amortized as long as priorities don't go below
+# the last one popped, which holds for A* with a consistent heuristic (the cursor only moves forward).
+# The tie key is ignored, it only keeps the order of pushes.
+class BucketQueue:
+    name = "bucket queue"
+
+    def __init__(self):
+        self.buckets = []
+        self.cursor = 0
+        self.size = 0
+
+    def push(self, priority, item, tie=0):
+        if priority >= len(self.buckets):
+            self.buckets.extend(deque() for _ in range(priority + 1 - len(self.buckets)))
+        self.buckets[priority].append(item)
+        self.cursor = min(self.cursor, priority)  # Still right for a lower priority, just not O(1) anymore
+        self.size += 1
+
+    def pop(self):
+        if not self.size:
+            raise IndexError("pop from an empty open list")
+        buckets = self.buckets
+        while not buckets[self.cursor]:
+            self.cursor += 1
+        self.size -= 1
+        return self.cursor, buckets[self.cursor].popleft()
+
+    def __len__(self):
+        return self.size
+
+# Radix heap: bucket i holds the items whose priority first differs from the last popped one at bit i - 1,
+# bucket 0 the ones equal to it. A pop only spreads out the lowest non-empty bucket, so each item moves
+# down at most once per bit, O(log C) amortized per pop where C is the largest step cost, whatever the
+# priorities' range. Priorities must never go below the last one popped (a monotone queue).
+# Equal priorities can come off in any order.
+class RadixHeap:
+    name = "radix heap"
+
+    def __init__(self):
+        self.buckets = [deque() for _ in range(65)]  # Priorities up to 64 bits
+        self.last = 0
+        self.size = 0
+
+    def push(self, priority, item, tie=0):
+        if priority < self.last:
+            raise ValueError(f"Radix heap priorities can't go down, {priority} pushed after {self.last} was popped")
+        self.buckets[(priority ^ self.last).bit_length()].append((priority, item))
+        self.size += 1
+
+    def pop(self):
+        if not self.size:
+            raise IndexError("pop from an empty open list")
+        buckets = self.buckets
+        if not buckets[0]:
+            index = 1
+            while not buckets[index]:
+                index += 1
+            entries, buckets[index] = buckets[index], deque()
+            self.last = min(priority for priority, _ in entries)
+            for entry in entries:
+                buckets[(entry[0] ^ self.last).bit_length()].append(entry)
+        self.size -= 1
+        return buckets[0].popleft()
+
+    def __len__(self):
+        return self.size
+
+# Open list classes by name, for the searches that let it be chosen
+OPEN_LISTS = {open_list.name: open_list for open_list in (HeapOpenList, BucketQueue, RadixHeap)}
+
+# The open list for a search: with integer priorities a bucket queue when steps are cheap (it has a
+# bucket for every priority up to the largest), a radix heap when they can be expensive, otherwise a heap.
+def make_open_list(integral, max_cost=1):
+    if not integral:
+        return HeapOpenList()
+    return BucketQueue() if max_cost <= BUCKET_QUEUE_MAX_COST else RadixHeap()
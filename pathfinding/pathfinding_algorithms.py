@@ -1,25 +1,121 @@
 import pygame
-from queue import PriorityQueue
+import heapq
+import time
+from collections import deque
 import math
 from .constants import *
-from ui import COLORS
+from .grid import CELL_BARRIER
+from .heuristics import Heuristic, INTEGER_HEURISTICS
+from .line_of_sight import LineOfSight, line_cells
+from .metrics import SearchMetrics, MemoryTracker
+from .open_lists import OPEN_LISTS, HeapOpenList, make_open_list
+from .trace import *
+
+# Cost of a move between two neighboring cells
+def move_cost(cell, neighbor):
+    return DIAGONAL_COST if cell.col != neighbor.col and cell.row != neighbor.row else 1
 
 # Base class for pathfinding algorithms
 class PathfindingAlgorithm:
+    name = ""  # Name used in the menu and in the metrics
+
     def __init__(self, grid):
         self.grid = grid
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.verbose = True  # Turned off for headless batch runs
+        self.trace = None  # SearchTrace (or anything with a record method) that gets every color change
+        self.track_memory = False  # Measure the peak memory of each search with tracemalloc (slow)
+        self.recolor = True  # Off on worker threads, the grid is then only changed by replaying the recorded events
+        self.movement = MOVE_4  # Movement model the grid's neighbors were built with, JPS jumps follow it
+        self.metrics = None
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    # Every find_path starts with begin_search and returns end_search, which hands back the SearchMetrics
+    def begin_search(self):
+        self.metrics = SearchMetrics(self.name)
+        self.memory_tracker = MemoryTracker() if self.track_memory else None
+        if self.memory_tracker:
+            self.memory_tracker.start()
+        self.metrics.enter_phase("setup")
+        return self.metrics
+
+    def end_search(self, path_length=0, found=False):
+        metrics = self.metrics
+        metrics.enter_phase(None)
+        metrics.path_length = path_length
+        metrics.found = found
+        if self.memory_tracker:
+            metrics.memory_peak = self.memory_tracker.stop()
+        return metrics
+
+    # Searches color cells through these, so every change can be recorded and replayed later
+    def mark_open(self, cell):
+        if self.recolor:
+            cell.make_open()
+        self.record(TRACE_OPEN, cell)
+
+    def mark_closed(self, cell):
+        if self.recolor:
+            cell.make_closed()
+        self.record(TRACE_CLOSED, cell)
+
+    def mark_path(self, cell):
+        if self.recolor:
+            cell.make_path()
+        self.record(TRACE_PATH, cell)
+
+    def mark_start(self, cell):
+        if self.recolor:
+            cell.make_start()
+        self.record(TRACE_START, cell)
+
+    def mark_end(self, cell):
+        if self.recolor:
+            cell.make_end()
+        self.record(TRACE_END, cell)
+
+    def mark_jump(self, cell):
+        if self.recolor:
+            cell.make_jump()
+        self.record(TRACE_JUMP, cell)
+
+    def record(self, kind, cell):
+        if self.trace is not None:
+            self.trace.record(kind, cell.row * self.cols + cell.col)
+
+# Ways A* can order cells with the same f on its open list, with the description shown in the menu
+TIE_BREAKING = {
+    "FIFO": "Cells with equal f come off the open list in the order they were added.",
+    "LIFO": "The cell added last goes first, so the search keeps following its latest move.",
+    "High g": "The cell furthest from the start goes first, it's the one the heuristic puts closest to the goal.",
+    "Low h": "The cell with the lowest heuristic goes first, on equal f it's the same order as High g.",
+    "Cross": "The cell closest to the straight line from start to end goes first, the search and the path stay straighter.",
+}
 
 # A* algorithm 
 class AStarAlgorithm(PathfindingAlgorithm):
-    def __init__(self, grid, heuristic):
+    name = "A*"
+
+    def __init__(self, grid, heuristic, tie_breaking="FIFO", open_list=None):
         super().__init__(grid)
         self.heuristic = heuristic
+        self.tie_breaking = tie_breaking
+        self.open_list = open_list  # Name in OPEN_LISTS, None picks one from the costs and the heuristic
 
     def find_path(self, start_cell, end_cell, draw_callback):
+        metrics = self.begin_search()
+        draw_callback = metrics.timed(draw_callback)  # Drawing is timed apart from the search
         count = 0 
-        open_set = PriorityQueue()  # Priority queue for open nodes
-        open_set.put((0, count, start_cell)) 
+        tie_key = self.tie_breaker(start_cell, end_cell)
+        metrics.tie_breaking = self.tie_breaking
+        open_set = self.make_open_list()  # Open nodes, ordered by f, then the tie-breaking key, then insertion
+        metrics.open_list = open_set.name
         open_set_hash = {start_cell}  # Set to keep track of nodes in the open set
+        metrics.pushes = metrics.peak_open = 1
         
         # Initialize g_score and f_score dictionaries
         g_score = {cell: float("inf") for row in self.grid for cell in row}
@@ -28,292 +124,406 @@ class AStarAlgorithm(PathfindingAlgorithm):
         
         g_score[start_cell] = 0
         f_score[start_cell] = self.heuristic(start_cell.get_pos(), end_cell.get_pos())
-
-        nodes_visited = 0  # Counter for nodes visited
-        
-        while not open_set.empty():
-            current_cell = open_set.get()[2]
+        open_set.push(f_score[start_cell], start_cell)
+
+        metrics.enter_phase("search")
+        while open_set:
+            f, current_cell = open_set.pop()
+            metrics.pops += 1
+            if f != f_score[current_cell] or current_cell not in open_set_hash:
+                continue  # Left behind when a cheaper path to the cell was found
             open_set_hash.remove(current_cell)
-            nodes_visited += 1  # Increment nodes visited count
+            metrics.expansions += 1  # Increment nodes visited count
 
             if current_cell == end_cell:
-                end_cell.make_end()
+                metrics.enter_phase("path")
+                self.mark_end(end_cell)
                 path_length = self.reconstruct_path(came_from, end_cell, draw_callback)
-                start_cell.make_start()
-                print(f"Pathfinding completed. Nodes visited: {nodes_visited}, Path length: {path_length}")
+                self.mark_start(start_cell)
+                self.log(f"Pathfinding completed. Nodes visited: {metrics.expansions}, Path length: {path_length}")
 
-                return nodes_visited, path_length
+                return self.end_search(path_length, found=True)
 
             for neighbor in current_cell.valid_neighbors:
-                temp_g_score = g_score[current_cell] + 1
+                metrics.generated += 1
+                temp_g_score = g_score[current_cell] + move_cost(current_cell, neighbor)
 
                 if temp_g_score < g_score[neighbor]:
+                    reopened = g_score[neighbor] != float("inf")  # Already reached once, through a longer path
                     came_from[neighbor] = current_cell
                     g_score[neighbor] = temp_g_score
-                    f_score[neighbor] = g_score[neighbor] + self.heuristic(neighbor.get_pos(), end_cell.get_pos())
-
+                    h_score = self.heuristic(neighbor.get_pos(), end_cell.get_pos())
+                    f_score[neighbor] = temp_g_score + h_score
+
+                    # Pushed again even if it's already open, the entry with the old f is skipped when it comes off
+                    metrics.reopenings += reopened and neighbor not in open_set_hash
+                    count += 1
+                    open_set.push(f_score[neighbor], neighbor, tie_key(temp_g_score, h_score, count, neighbor))
+                    metrics.pushes += 1
                     if neighbor not in open_set_hash:
-                        count += 1
-                        open_set.put((f_score[neighbor], count, neighbor))
                         open_set_hash.add(neighbor)
-                        neighbor.make_open()
+                        self.mark_open(neighbor)
 
+            metrics.peak_open = max(metrics.peak_open, len(open_set_hash))
             draw_callback()
 
             if current_cell != start_cell:
-                current_cell.make_closed()
-
-        return nodes_visited, 0
+                self.mark_closed(current_cell)
+
+        return self.end_search()
+
+    # With 4-way moves every step costs 1, so with a whole-number heuristic all f are integers and
+    # FIFO ties are what the integer open lists keep anyway
+    def make_open_list(self):
+        if self.open_list is not None:
+            return OPEN_LISTS[self.open_list]()
+        integral = self.movement == MOVE_4 and self.heuristic in INTEGER_HEURISTICS and self.tie_breaking == "FIFO"
+        return make_open_list(integral)
+
+    # Returns the function giving the second sort key of the open list, cells with equal f go lowest key first
+    def tie_breaker(self, start_cell, end_cell):
+        if self.tie_breaking == "LIFO":
+            return lambda g, h, count, cell: -count
+        if self.tie_breaking == "High g":
+            return lambda g, h, count, cell: -g
+        if self.tie_breaking == "Low h":
+            return lambda g, h, count, cell: h
+        if self.tie_breaking == "Cross":
+            # Cross product of the cell to end and start to end vectors, zero on the straight line between them
+            dx2, dy2 = start_cell.col - end_cell.col, start_cell.row - end_cell.row
+            return lambda g, h, count, cell: abs((cell.col - end_cell.col) * dy2 - dx2 * (cell.row - end_cell.row))
+        return lambda g, h, count, cell: 0  # FIFO, the insertion count decides
 
     def reconstruct_path(self, came_from, current_cell, draw_callback):
         path_length = 0  # Initialize path length counter
         while current_cell in came_from:
+            previous_cell = current_cell
             current_cell = came_from[current_cell]
-            current_cell.make_path()
-            path_length += 1  # Increment path length
+            self.mark_path(current_cell)
+            path_length += move_cost(previous_cell, current_cell)  # Increment path length
             draw_callback()
         return path_length
 
 # Breadth-First Search (BFS) algorithm
 class BFSAlgorithm(PathfindingAlgorithm):
+    name = "BFS"
+
     def find_path(self, start_cell, end_cell, draw_callback):
+        metrics = self.begin_search()
+        draw_callback = metrics.timed(draw_callback)  # Drawing is timed apart from the search
         queue = [start_cell]
         came_from = {}
         visited = {start_cell}
+        metrics.pushes = metrics.peak_open = 1
 
-        nodes_visited = 0  # Counter for nodes visited
-
+        metrics.enter_phase("search")
         while queue:
             current_cell = queue.pop(0)
-            nodes_visited += 1  # Increment nodes visited count
+            metrics.pops += 1
+            metrics.expansions += 1  # Increment nodes visited count
 
             if current_cell == end_cell:
-                end_cell.make_end()
+                metrics.enter_phase("path")
+                self.mark_end(end_cell)
                 path_length = self.reconstruct_path(came_from, end_cell, draw_callback)
-                start_cell.make_start()
-                print(f"Pathfinding completed. Nodes visited: {nodes_visited}, Path length: {path_length}")
+                self.mark_start(start_cell)
+                self.log(f"Pathfinding completed. Nodes visited: {metrics.expansions}, Path length: {path_length}")
 
-                return nodes_visited, path_length
+                return self.end_search(path_length, found=True)
 
             for neighbor in current_cell.valid_neighbors:
+                metrics.generated += 1
                 if neighbor not in visited and not neighbor.is_barrier():
                     came_from[neighbor] = current_cell
                     queue.append(neighbor)
+                    metrics.pushes += 1
                     visited.add(neighbor)
-                    neighbor.make_open()
+                    self.mark_open(neighbor)
 
+            metrics.peak_open = max(metrics.peak_open, len(queue))
             draw_callback()
 
             if current_cell != start_cell:
-                current_cell.make_closed()
+                self.mark_closed(current_cell)
 
-        return nodes_visited, 0
+        return self.end_search()
 
     def reconstruct_path(self, came_from, current_cell, draw_callback):
         path_length = 0  # Initialize path length counter
         while current_cell in came_from:
+            previous_cell = current_cell
             current_cell = came_from[current_cell]
-            current_cell.make_path()
-            path_length += 1  # Increment path length
+            self.mark_path(current_cell)
+            path_length += move_cost(previous_cell, current_cell)  # Increment path length
             draw_callback()
         return path_length
 
 # Depth-First Search (DFS) algorithm
 class DFSAlgorithm(PathfindingAlgorithm):
+    name = "DFS"
+
     def find_path(self, start_cell, end_cell, draw_callback):
+        metrics = self.begin_search()
+        draw_callback = metrics.timed(draw_callback)  # Drawing is timed apart from the search
         stack = [start_cell]
         came_from = {}
         visited = {start_cell}
+        metrics.pushes = metrics.peak_open = 1
 
-        nodes_visited = 0  # Counter for nodes visited
-
+        metrics.enter_phase("search")
         while stack:
             current_cell = stack.pop()
-            nodes_visited += 1  # Increment nodes visited count
+            metrics.pops += 1
+            metrics.expansions += 1  # Increment nodes visited count
 
             if current_cell == end_cell:
-                end_cell.make_end()
+                metrics.enter_phase("path")
+                self.mark_end(end_cell)
                 path_length = self.reconstruct_path(came_from, end_cell, draw_callback)
-                start_cell.make_start()
-                print(f"Pathfinding completed. Nodes visited: {nodes_visited}, Path length: {path_length}")
+                self.mark_start(start_cell)
+                self.log(f"Pathfinding completed. Nodes visited: {metrics.expansions}, Path length: {path_length}")
 
-                return nodes_visited, path_length
+                return self.end_search(path_length, found=True)
 
             for neighbor in current_cell.valid_neighbors:
+                metrics.generated += 1
                 if neighbor not in visited and not neighbor.is_barrier():
                     came_from[neighbor] = current_cell
                     stack.append(neighbor)
+                    metrics.pushes += 1
                     visited.add(neighbor)
-                    neighbor.make_open()
+                    self.mark_open(neighbor)
 
+            metrics.peak_open = max(metrics.peak_open, len(stack))
             draw_callback()
 
             if current_cell != start_cell:
-                current_cell.make_closed()
+                self.mark_closed(current_cell)
 
-        return nodes_visited, 0
+        return self.end_search()
 
     def reconstruct_path(self, came_from, current_cell, draw_callback):
         path_length = 0  # Initialize path length counter
         while current_cell in came_from:
+            previous_cell = current_cell
             current_cell = came_from[current_cell]
-            current_cell.make_path()
-            path_length += 1  # Increment path length
+            self.mark_path(current_cell)
+            path_length += move_cost(previous_cell, current_cell)  # Increment path length
             draw_callback()
         return path_length
 
 # Greedy Best-First Search (GBFS) algorithm (uses heuristic only)
 class GBFSAlgorithm(PathfindingAlgorithm):
+    name = "GBFS"
+
     def __init__(self, grid, heuristic):
         super().__init__(grid)
         self.heuristic = heuristic
 
     def find_path(self, start_cell, end_cell, draw_callback):
-        count = 0  # This will act as a tie-breaker in the PriorityQueue
-        open_set = PriorityQueue()  # Priority queue for open nodes
-        open_set.put((0, count, start_cell))
+        metrics = self.begin_search()
+        draw_callback = metrics.timed(draw_callback)  # Drawing is timed apart from the search
+        open_set = HeapOpenList()  # Open nodes, ordered by heuristic, then insertion
+        open_set.push(0, start_cell)
+        metrics.open_list = open_set.name
         open_set_hash = {start_cell}  # Set to keep track of nodes in the open set
         closed_set = set()  # Set to keep track of nodes that have been visited and processed
         came_from = {}
+        metrics.pushes = metrics.peak_open = 1
 
-        nodes_visited = 0  # Counter for nodes visited
-
-        while not open_set.empty():
-            current_cell = open_set.get()[2]  # Get the cell with the highest priority (lowest heuristic)
+        metrics.enter_phase("search")
+        while open_set:
+            current_cell = open_set.pop()[1]  # Get the cell with the highest priority (lowest heuristic)
             open_set_hash.remove(current_cell)
-            nodes_visited += 1  # Increment nodes visited count
+            metrics.pops += 1
+            metrics.expansions += 1  # Increment nodes visited count
 
             if current_cell == end_cell:
                 # Path found, reconstruct it
-                end_cell.make_end()
+                metrics.enter_phase("path")
+                self.mark_end(end_cell)
                 path_length = self.reconstruct_path(came_from, end_cell, draw_callback)
-                start_cell.make_start()
-                print(f"Pathfinding completed. Nodes visited: {nodes_visited}, Path length: {path_length}")
-                return nodes_visited, path_length
+                self.mark_start(start_cell)
+                self.log(f"Pathfinding completed. Nodes visited: {metrics.expansions}, Path length: {path_length}")
+                return self.end_search(path_length, found=True)
 
             closed_set.add(current_cell)  # Mark this node as processed
 
             for neighbor in current_cell.valid_neighbors:
+                metrics.generated += 1
                 if neighbor not in open_set_hash and neighbor not in closed_set and not neighbor.is_barrier():
                     came_from[neighbor] = current_cell
                     priority = self.heuristic(neighbor.get_pos(), end_cell.get_pos())
-                    count += 1  # Increment count for tie-breaking
-                    open_set.put((priority, count, neighbor))
+                    open_set.push(priority, neighbor)
+                    metrics.pushes += 1
                     open_set_hash.add(neighbor)
-                    neighbor.make_open()
+                    self.mark_open(neighbor)
 
+            metrics.peak_open = max(metrics.peak_open, len(open_set_hash))
             draw_callback()
 
             if current_cell != start_cell:
-                current_cell.make_closed()
+                self.mark_closed(current_cell)
 
-        print("No path found.")
-        return nodes_visited, 0
+        self.log("No path found.")
+        return self.end_search()
 
     def reconstruct_path(self, came_from, current_cell, draw_callback):
         path_length = 0  # Initialize path length counter
         while current_cell in came_from:
+            previous_cell = current_cell
             current_cell = came_from[current_cell]
-            current_cell.make_path()
-            path_length += 1  # Increment path length
+            self.mark_path(current_cell)
+            path_length += move_cost(previous_cell, current_cell)  # Increment path length
             draw_callback()
         return path_length
 
 # Jump Point Search (JPS) algorithm
 class JPSAlgorithm(PathfindingAlgorithm):
+    name = "JPS"
+
     def __init__(self, grid, heuristic):
         super().__init__(grid)
         self.heuristic = heuristic
 
     def find_path(self, start_cell, end_cell, draw_callback):
-        count = 0
-        open_set = PriorityQueue()  # Priority queue for open nodes
-        open_set.put((0, count, start_cell))
+        metrics = self.begin_search()
+        draw_callback = metrics.timed(draw_callback)  # Drawing is timed apart from the search
+        open_set = HeapOpenList()  # Open nodes, ordered by f, then insertion
+        open_set.push(0, start_cell)
+        metrics.open_list = open_set.name
         open_set_hash = {start_cell}  # Set to keep track of nodes in the open set
         came_from = {}
 
         g_score = {cell: float("inf") for row in self.grid for cell in row}
         g_score[start_cell] = 0
+        f_score = {start_cell: 0}
 
-        nodes_visited = -1  # Start at -1 to account for off-by-one error
+        metrics.expansions = -1  # Start at -1 to account for off-by-one error
+        metrics.pushes = metrics.peak_open = 1
 
-        while not open_set.empty():
-            current_cell = open_set.get()[2]
+        metrics.enter_phase("search")
+        while open_set:
+            f, current_cell = open_set.pop()
+            metrics.pops += 1
+            if f != f_score[current_cell] or current_cell not in open_set_hash:
+                continue  # Left behind when a cheaper path to the jump point was found
             open_set_hash.remove(current_cell)
-            nodes_visited += 1  # Increment nodes visited count
+            metrics.expansions += 1  # Increment nodes visited count
 
             if current_cell == end_cell:
-                end_cell.make_end()
+                metrics.enter_phase("path")
+                self.mark_end(end_cell)
                 path_length, number_of_jumps = self.reconstruct_path(came_from, start_cell, end_cell, draw_callback)
-                start_cell.make_start()
-                print(f"Pathfinding completed. Nodes visited: {nodes_visited}, Number of jumps: {number_of_jumps + 1}, Path length: {path_length}")
-                return nodes_visited, path_length
+                self.mark_start(start_cell)
+                self.log(f"Pathfinding completed. Nodes visited: {metrics.expansions}, Number of jumps: {number_of_jumps + 1}, Path length: {path_length}")
+                return self.end_search(path_length, found=True)
 
             neighbors = self.get_neighbors(current_cell, start_cell, end_cell)
 
             for neighbor in neighbors:
+                metrics.generated += 1  # Jump points are the successors of JPS
                 tentative_g_score = g_score[current_cell] + self.distance(current_cell, neighbor)
 
                 if tentative_g_score < g_score[neighbor]:
+                    reopened = g_score[neighbor] != float("inf")
                     came_from[neighbor] = current_cell
                     g_score[neighbor] = tentative_g_score
-                    f_score = tentative_g_score + self.heuristic(neighbor.get_pos(), end_cell.get_pos())
-                    if neighbor not in open_set_hash:
-                        count += 1
-                        open_set.put((f_score, count, neighbor))
-                        open_set_hash.add(neighbor)
+                    f_score[neighbor] = tentative_g_score + self.heuristic(neighbor.get_pos(), end_cell.get_pos())
+                    metrics.reopenings += reopened and neighbor not in open_set_hash
+                    open_set.push(f_score[neighbor], neighbor)
+                    metrics.pushes += 1
+                    open_set_hash.add(neighbor)
 
+            metrics.peak_open = max(metrics.peak_open, len(open_set_hash))
             draw_callback()
 
             if current_cell != start_cell:
-                current_cell.make_closed()
+                self.mark_closed(current_cell)
 
-        print("No path found.")
-        return nodes_visited, 0
+        self.log("No path found.")
+        return self.end_search()
 
     def get_neighbors(self, current_cell, start_cell, end_cell):
         neighbors = []
-        for direction in [(-1, 0), (1, 0), (0, -1), (0, 1)]:  # Up, down, left, right
+        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Up, down, left, right
+        if self.movement != MOVE_4:
+            directions += [(-1, -1), (1, -1), (-1, 1), (1, 1)]  # And the diagonals
+        for direction in directions:
             jump_point = self.jump(current_cell, direction, end_cell)
             if jump_point:
                 neighbors.append(jump_point)
         return neighbors
 
     def jump(self, current_cell, direction, end_cell):
-        next_col = current_cell.col + direction[0]
-        next_row = current_cell.row + direction[1]
+        # Walks in a straight line instead of recursing, so long corridors on big maps can't hit the recursion limit
+        next_col = current_cell.col
+        next_row = current_cell.row
 
-        if not (0 <= next_col < COLS and 0 <= next_row < ROWS):
-            return None  # Out of bounds
+        while True:
+            if direction[0] != 0 and direction[1] != 0 and not self.can_move_diagonally(next_col, next_row, direction):
+                return None  # Blocked corner
 
-        next_cell = self.grid[next_row][next_col]
+            next_col += direction[0]
+            next_row += direction[1]
 
-        if next_cell.is_barrier():
-            return None  # Hit a barrier
+            if not (0 <= next_col < self.cols and 0 <= next_row < self.rows):
+                return None  # Out of bounds
 
-        if next_cell == end_cell:
-            return next_cell  # Reached the goal
+            next_cell = self.grid[next_row][next_col]
 
-        # Horizontal or vertical jumps
-        if direction[0] != 0 and direction[1] == 0:  # Horizontal
-            if (self.is_walkable(next_col, next_row - 1) and not self.is_walkable(next_col - direction[0], next_row - 1)) or \
-               (self.is_walkable(next_col, next_row + 1) and not self.is_walkable(next_col - direction[0], next_row + 1)):
-                return next_cell
+            if next_cell.is_barrier():
+                return None  # Hit a barrier
 
-        if direction[1] != 0 and direction[0] == 0:  # Vertical
-            if (self.is_walkable(next_col - 1, next_row) and not self.is_walkable(next_col - 1, next_row - direction[1])) or \
-               (self.is_walkable(next_col + 1, next_row) and not self.is_walkable(next_col + 1, next_row - direction[1])):
+            if next_cell == end_cell:
+                return next_cell  # Reached the goal
+
+            if self.has_forced_neighbor(next_col, next_row, direction):
                 return next_cell
 
-        return self.jump(next_cell, direction, end_cell)
+            # Diagonal jumps stop where a straight jump would find a jump point
+            if direction[0] != 0 and direction[1] != 0:
+                if self.jump(next_cell, (direction[0], 0), end_cell) or self.jump(next_cell, (0, direction[1]), end_cell):
+                    return next_cell
+            # Without diagonals, a path can only turn off a vertical line where a horizontal jump finds something
+            elif self.movement == MOVE_4 and direction[0] == 0:
+                if self.jump(next_cell, (1, 0), end_cell) or self.jump(next_cell, (-1, 0), end_cell):
+                    return next_cell
+
+    def can_move_diagonally(self, col, row, direction):
+        side_open = (self.is_walkable(col + direction[0], row), self.is_walkable(col, row + direction[1]))
+        return all(side_open) if self.movement == MOVE_8_NO_CORNERS else any(side_open)
+
+    # A neighbor that can only be reached optimally through this cell makes it a jump point
+    def has_forced_neighbor(self, next_col, next_row, direction):
+        if self.movement == MOVE_8:
+            # With corner cutting, a barrier beside the move opens a diagonal around it
+            if direction[0] != 0 and direction[1] != 0:  # Diagonal
+                return (self.is_walkable(next_col - direction[0], next_row + direction[1]) and not self.is_walkable(next_col - direction[0], next_row)) or \
+                       (self.is_walkable(next_col + direction[0], next_row - direction[1]) and not self.is_walkable(next_col, next_row - direction[1]))
+            if direction[0] != 0:  # Horizontal
+                return (self.is_walkable(next_col + direction[0], next_row + 1) and not self.is_walkable(next_col, next_row + 1)) or \
+                       (self.is_walkable(next_col + direction[0], next_row - 1) and not self.is_walkable(next_col, next_row - 1))
+            return (self.is_walkable(next_col + 1, next_row + direction[1]) and not self.is_walkable(next_col + 1, next_row)) or \
+                   (self.is_walkable(next_col - 1, next_row + direction[1]) and not self.is_walkable(next_col - 1, next_row))
+
+        # Without corner cutting only straight moves have forced neighbors, past the end of a barrier beside them
+        if direction[0] != 0 and direction[1] == 0:  # Horizontal
+            return (self.is_walkable(next_col, next_row - 1) and not self.is_walkable(next_col - direction[0], next_row - 1)) or \
+                   (self.is_walkable(next_col, next_row + 1) and not self.is_walkable(next_col - direction[0], next_row + 1))
+        if direction[1] != 0 and direction[0] == 0:  # Vertical
+            return (self.is_walkable(next_col - 1, next_row) and not self.is_walkable(next_col - 1, next_row - direction[1])) or \
+                   (self.is_walkable(next_col + 1, next_row) and not self.is_walkable(next_col + 1, next_row - direction[1]))
+        return False
 
     def is_walkable(self, col, row):
-        if 0 <= col < COLS and 0 <= row < ROWS:
-            return not self.grid[row][col].is_barrier()
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return self.grid[row][col].state != CELL_BARRIER  # Called for every step of a jump, skips the method call
         return False
 
+    # Jump points are joined by straight or diagonal lines, diagonal steps cost sqrt(2)
     def distance(self, cell1, cell2):
-        return int(math.sqrt((cell1.col - cell2.col) ** 2 + (cell1.row - cell2.row) ** 2))
+        return Heuristic.octile(cell1.get_pos(), cell2.get_pos())
 
     def reconstruct_path(self, came_from, start_cell, end_cell, draw_callback):
         path = []
@@ -329,19 +539,21 @@ class JPSAlgorithm(PathfindingAlgorithm):
 
         # Draw the path neighbor by neighbor
         full_path_length = 0
+        jump_points = set()  # Kept here rather than read back from the cells, which workers don't recolor
         for i in range(1, len(path)):
             if path[i] != end_cell:
                 if self.is_jump(path[i - 1], path[i]):
-                    path[i].color = COLORS["PINK"]  # Color jump points on the path as pink
+                    self.mark_jump(path[i])  # Color jump points on the path as pink
+                    jump_points.add(path[i])
                     number_of_jumps += 1  # Count this as a jump in the final path
                 else:
-                    path[i].make_path()  # Color regular path as purple
-            self.draw_full_path(path[i - 1], path[i], draw_callback)
+                    self.mark_path(path[i])  # Color regular path as purple
+            self.draw_full_path(path[i - 1], path[i], jump_points, draw_callback)
             full_path_length += self.distance(path[i - 1], path[i])
 
         return full_path_length, number_of_jumps
 
-    def draw_full_path(self, from_cell, to_cell, draw_callback):
+    def draw_full_path(self, from_cell, to_cell, jump_points, draw_callback):
         step_col = to_cell.col - from_cell.col
         step_row = to_cell.row - from_cell.row
 
@@ -355,8 +567,8 @@ class JPSAlgorithm(PathfindingAlgorithm):
             current_col += col_increment
             current_row += row_increment
             cell = self.grid[current_row][current_col]
-            if cell != to_cell and cell.color != COLORS["PINK"]:  # Avoid overwriting the pink jumps
-                cell.make_path()
+            if cell != to_cell and cell not in jump_points:  # Avoid overwriting the pink jumps
+                self.mark_path(cell)
             draw_callback()
 
     def is_jump(self, from_cell, to_cell):
@@ -364,16 +576,20 @@ class JPSAlgorithm(PathfindingAlgorithm):
 
 # Bidirectional A* Search algorithm
 class BiAStarAlgorithm(PathfindingAlgorithm):
+    name = "Bi-A*"
+
     def __init__(self, grid, heuristic):
         super().__init__(grid)
         self.heuristic = heuristic
 
     def find_path(self, start_cell, end_cell, draw_callback, delay=0):  # Added delay parameter
-        count = 0
-        open_set_start = PriorityQueue()  # Priority queue for nodes from start to goal
-        open_set_goal = PriorityQueue()   # Priority queue for nodes from goal to start
-        open_set_start.put((0, count, start_cell))
-        open_set_goal.put((0, count, end_cell))
+        metrics = self.begin_search()
+        draw_callback = metrics.timed(draw_callback)  # Drawing is timed apart from the search
+        open_set_start = HeapOpenList()  # Open nodes from start to goal
+        open_set_goal = HeapOpenList()   # Open nodes from goal to start
+        open_set_start.push(0, start_cell)
+        open_set_goal.push(0, end_cell)
+        metrics.open_list = open_set_start.name
         came_from_start = {}
         came_from_goal = {}
         open_set_hash_start = {start_cell}
@@ -383,15 +599,16 @@ class BiAStarAlgorithm(PathfindingAlgorithm):
         g_score_goal = {cell: float("inf") for row in self.grid for cell in row}
         g_score_start[start_cell] = 0
         g_score_goal[end_cell] = 0
+        metrics.pushes = metrics.peak_open = 2
 
-        nodes_visited = 0  # Counter for nodes visited
-
-        while not open_set_start.empty() and not open_set_goal.empty():
-            current_cell_start = open_set_start.get()[2]
+        metrics.enter_phase("search")
+        while open_set_start and open_set_goal:
+            current_cell_start = open_set_start.pop()[1]
             open_set_hash_start.remove(current_cell_start)
-            current_cell_goal = open_set_goal.get()[2]
+            current_cell_goal = open_set_goal.pop()[1]
             open_set_hash_goal.remove(current_cell_goal)
-            nodes_visited += 1  # Increment nodes visited count
+            metrics.pops += 2
+            metrics.expansions += 1  # Increment nodes visited count
 
             # Add a delay to visualize the process
             pygame.time.delay(delay)
@@ -401,49 +618,57 @@ class BiAStarAlgorithm(PathfindingAlgorithm):
             if current_cell_start in open_set_hash_goal or current_cell_goal in open_set_hash_start:
                 # Path found
                 intersection = current_cell_start if current_cell_start in open_set_hash_goal else current_cell_goal
+                metrics.enter_phase("path")
                 path_length = self.reconstruct_path(came_from_start, came_from_goal, start_cell, end_cell, intersection, draw_callback)
-                start_cell.make_start()
-                end_cell.make_end()
-                print(f"Pathfinding completed. Nodes visited: {nodes_visited}, Path length: {path_length}")
-                return nodes_visited, path_length
+                self.mark_start(start_cell)
+                self.mark_end(end_cell)
+                self.log(f"Pathfinding completed. Nodes visited: {metrics.expansions}, Path length: {path_length}")
+                return self.end_search(path_length, found=True)
 
             # Explore neighbors for the start side
             for neighbor in current_cell_start.valid_neighbors:
-                tentative_g_score = g_score_start[current_cell_start] + 1
+                metrics.generated += 1
+                tentative_g_score = g_score_start[current_cell_start] + move_cost(current_cell_start, neighbor)
 
                 if tentative_g_score < g_score_start[neighbor]:
+                    reopened = g_score_start[neighbor] != float("inf")
                     came_from_start[neighbor] = current_cell_start
                     g_score_start[neighbor] = tentative_g_score
                     f_score = tentative_g_score + self.heuristic(neighbor.get_pos(), end_cell.get_pos())
                     if neighbor not in open_set_hash_start:
-                        count += 1
-                        open_set_start.put((f_score, count, neighbor))
+                        metrics.reopenings += reopened
+                        open_set_start.push(f_score, neighbor)
+                        metrics.pushes += 1
                         open_set_hash_start.add(neighbor)
-                        neighbor.make_open()
+                        self.mark_open(neighbor)
 
             # Explore neighbors for the goal side
             for neighbor in current_cell_goal.valid_neighbors:
-                tentative_g_score = g_score_goal[current_cell_goal] + 1
+                metrics.generated += 1
+                tentative_g_score = g_score_goal[current_cell_goal] + move_cost(current_cell_goal, neighbor)
 
                 if tentative_g_score < g_score_goal[neighbor]:
+                    reopened = g_score_goal[neighbor] != float("inf")
                     came_from_goal[neighbor] = current_cell_goal
                     g_score_goal[neighbor] = tentative_g_score
                     f_score = tentative_g_score + self.heuristic(neighbor.get_pos(), start_cell.get_pos())
                     if neighbor not in open_set_hash_goal:
-                        count += 1
-                        open_set_goal.put((f_score, count, neighbor))
+                        metrics.reopenings += reopened
+                        open_set_goal.push(f_score, neighbor)
+                        metrics.pushes += 1
                         open_set_hash_goal.add(neighbor)
-                        neighbor.make_open()
+                        self.mark_open(neighbor)
 
+            metrics.peak_open = max(metrics.peak_open, len(open_set_hash_start) + len(open_set_hash_goal))
             draw_callback()
 
             if current_cell_start != start_cell:
-                current_cell_start.make_closed()
+                self.mark_closed(current_cell_start)
             if current_cell_goal != end_cell:
-                current_cell_goal.make_closed()
+                self.mark_closed(current_cell_goal)
 
-        print("No path found.")
-        return nodes_visited, 0
+        self.log("No path found.")
+        return self.end_search()
     
     def reconstruct_path(self, came_from_start, came_from_goal, start_cell, end_cell, intersection, draw_callback):
         # Reconstruct the path from start to intersection
@@ -467,8 +692,664 @@ class BiAStarAlgorithm(PathfindingAlgorithm):
         # Draw the path neighbor by neighbor
         full_path_length = 0
         for i in range(1, len(path)):
-            path[i].make_path()
+            self.mark_path(path[i])
             draw_callback()
-            full_path_length += 1
+            full_path_length += move_cost(path[i - 1], path[i])
 
         return full_path_length
+
+# Theta* algorithm, A* whose paths can turn at any angle: a cell's parent can be any cell it can see,
+# not just a neighbor, so paths are straight lines between the corners they go around
+class ThetaStarAlgorithm(PathfindingAlgorithm):
+    name = "Theta*"
+    lazy = False  # Lazy Theta* only checks line of sight when a cell is expanded
+
+    def __init__(self, grid, heuristic):
+        super().__init__(grid)
+        self.heuristic = heuristic
+
+    def find_path(self, start_cell, end_cell, draw_callback):
+        metrics = self.begin_search()
+        draw_callback = metrics.timed(draw_callback)  # Drawing is timed apart from the search
+        line_of_sight = LineOfSight(self.grid, corner_cutting=self.movement == MOVE_8)
+        open_set = HeapOpenList()  # Open nodes, stale entries are skipped like in A*
+        metrics.open_list = open_set.name
+        open_set_hash = {start_cell}
+        closed_set = set()
+        metrics.pushes = metrics.peak_open = 1
+
+        g_score = {start_cell: 0}
+        f_score = {start_cell: self.heuristic(start_cell.get_pos(), end_cell.get_pos())}
+        parent = {start_cell: start_cell}
+        open_set.push(f_score[start_cell], start_cell)
+
+        metrics.enter_phase("search")
+        while open_set:
+            f, current_cell = open_set.pop()
+            metrics.pops += 1
+            if f != f_score[current_cell] or current_cell not in open_set_hash:
+                continue
+            open_set_hash.remove(current_cell)
+            closed_set.add(current_cell)
+            metrics.expansions += 1
+
+            if self.lazy:
+                self.set_vertex(current_cell, parent, g_score, closed_set, line_of_sight)
+
+            if current_cell == end_cell:
+                metrics.enter_phase("path")
+                self.mark_end(end_cell)
+                path_length = self.reconstruct_path(parent, start_cell, end_cell, draw_callback)
+                self.mark_start(start_cell)
+                self.log(f"Pathfinding completed. Nodes visited: {metrics.expansions}, Path length: {path_length}")
+                return self.end_search_with_line_of_sight(line_of_sight, path_length, found=True)
+
+            for neighbor in current_cell.valid_neighbors:
+                if neighbor in closed_set:
+                    continue
+                metrics.generated += 1
+
+                # Path 2: straight from the current cell's parent, assumed visible by Lazy Theta*
+                grandparent = parent[current_cell]
+                if self.lazy or line_of_sight.visible(grandparent, neighbor):
+                    new_parent = grandparent
+                else:
+                    new_parent = current_cell
+                new_g_score = g_score[new_parent] + self.distance(new_parent, neighbor)
+
+                if new_g_score < g_score.get(neighbor, float("inf")):
+                    parent[neighbor] = new_parent
+                    g_score[neighbor] = new_g_score
+                    f_score[neighbor] = new_g_score + self.heuristic(neighbor.get_pos(), end_cell.get_pos())
+                    open_set.push(f_score[neighbor], neighbor)
+                    metrics.pushes += 1
+                    if neighbor not in open_set_hash:
+                        open_set_hash.add(neighbor)
+                        self.mark_open(neighbor)
+
+            metrics.peak_open = max(metrics.peak_open, len(open_set_hash))
+            draw_callback()
+
+            if current_cell != start_cell:
+                self.mark_closed(current_cell)
+
+        self.log("No path found.")
+        return self.end_search_with_line_of_sight(line_of_sight)
+
+    # Lazy Theta*: the parent given to a cell when it was opened may not be visible from it after all,
+    # then the cell takes the best of its expanded neighbors instead, like in A*
+    def set_vertex(self, cell, parent, g_score, closed_set, line_of_sight):
+        if parent[cell] is cell or line_of_sight.visible(parent[cell], cell):
+            return
+        best = min((neighbor for neighbor in cell.valid_neighbors if neighbor in closed_set),
+                   key=lambda neighbor: g_score[neighbor] + self.distance(neighbor, cell))
+        parent[cell] = best
+        g_score[cell] = g_score[best] + self.distance(best, cell)
+
+    def end_search_with_line_of_sight(self, line_of_sight, path_length=0, found=False):
+        self.metrics.line_of_sight_checks = line_of_sight.checks
+        self.metrics.line_of_sight_cache_hits = line_of_sight.cache_hits
+        return self.end_search(path_length, found)
+
+    # Segments of an any-angle path are straight lines of any slope
+    def distance(self, cell1, cell2):
+        return math.hypot(cell1.col - cell2.col, cell1.row - cell2.row)
+
+    def reconstruct_path(self, parent, start_cell, end_cell, draw_callback):
+        path = [end_cell]
+        while path[-1] != start_cell:
+            path.append(parent[path[-1]])
+        path.reverse()
+
+        # The turning points are drawn like jump points, the lines between them like a path
+        path_length = 0
+        for i in range(1, len(path)):
+            for col, row in line_cells(path[i - 1], path[i]):
+                cell = self.grid[row][col]
+                if cell == path[i] and cell != end_cell:
+                    self.mark_jump(cell)
+                elif cell != end_cell:
+                    self.mark_path(cell)
+                draw_callback()
+            path_length += self.distance(path[i - 1], path[i])
+        return path_length
+
+# Lazy Theta* algorithm, Theta* that checks line of sight once per expanded cell instead of once per neighbor
+class LazyThetaStarAlgorithm(ThetaStarAlgorithm):
+    name = "Lazy Theta*"
+    lazy = True
+
+# Iterative Deepening A* (IDA*), depth-first searches bounded by f that only keep the current path
+# in memory. Each round raises the bound to the lowest f that went over it, re-expanding the cells
+# of the earlier rounds.
+class IDAStarAlgorithm(PathfindingAlgorithm):
+    name = "IDA*"
+
+    def __init__(self, grid, heuristic, table_size=IDA_TABLE_SIZE, expansion_limit=IDA_EXPANSION_LIMIT):
+        super().__init__(grid)
+        self.heuristic = heuristic
+        self.table_size = table_size  # 0 keeps only the path, without it open areas take exponential time
+        self.expansion_limit = expansion_limit
+
+    def find_path(self, start_cell, end_cell, draw_callback):
+        metrics = self.begin_search()
+        draw_callback = metrics.timed(draw_callback)  # Drawing is timed apart from the search
+        metrics.iterations = metrics.reexpansions = 0
+        metrics.peak_stored = metrics.peak_open = 1
+        metrics.gave_up = False
+        expanded = set()  # Only for counting the re-expansions
+        threshold = self.heuristic(start_cell.get_pos(), end_cell.get_pos())
+
+        metrics.enter_phase("search")
+        while True:
+            metrics.iterations += 1
+            next_threshold = float("inf")  # Lowest f over the threshold, the next round's threshold
+
+            # The stack is the path from the start, with the neighbors of each cell left to try. The table
+            # has the lowest g each cell was reached with this round, a cell reached again by a path that
+            # isn't shorter has nothing new under it.
+            stack = [(start_cell, 0, self.successors(start_cell, end_cell))]
+            on_path = {start_cell}
+            table = {start_cell: 0} if self.table_size else {}
+            metrics.pushes += 1
+            metrics.expansions += 1
+            metrics.reexpansions += start_cell in expanded
+            expanded.add(start_cell)
+
+            while stack:
+                current_cell, g_score, successors = stack[-1]
+                neighbor = next(successors, None)
+
+                if neighbor is None:  # Every neighbor tried, backtrack
+                    stack.pop()
+                    on_path.remove(current_cell)
+                    metrics.pops += 1
+                    if current_cell != start_cell:
+                        self.mark_closed(current_cell)
+                    continue
+
+                metrics.generated += 1
+                if neighbor in on_path:
+                    continue
+                neighbor_g_score = g_score + move_cost(current_cell, neighbor)
+                f_score = neighbor_g_score + self.heuristic(neighbor.get_pos(), end_cell.get_pos())
+                if f_score > threshold:
+                    next_threshold = min(next_threshold, f_score)
+                    continue
+
+                if neighbor == end_cell:
+                    metrics.enter_phase("path")
+                    self.mark_end(end_cell)
+                    path_length = self.reconstruct_path(stack, neighbor_g_score, start_cell, draw_callback)
+                    self.mark_start(start_cell)
+                    self.log(f"Pathfinding completed. Nodes visited: {metrics.expansions}, Iterations: {metrics.iterations}, Path length: {path_length}")
+                    return self.end_search(path_length, found=True)
+
+                best_g_score = table.get(neighbor)
+                if best_g_score is not None and best_g_score <= neighbor_g_score:
+                    continue
+                if best_g_score is not None or len(table) < self.table_size:
+                    table[neighbor] = neighbor_g_score
+
+                if metrics.expansions >= self.expansion_limit:
+                    metrics.gave_up = True
+                    self.log(f"Gave up after {metrics.expansions} nodes visited.")
+                    return self.end_search()
+
+                stack.append((neighbor, neighbor_g_score, self.successors(neighbor, end_cell)))
+                on_path.add(neighbor)
+                metrics.pushes += 1
+                metrics.expansions += 1
+                metrics.reexpansions += neighbor in expanded
+                expanded.add(neighbor)
+                metrics.peak_open = max(metrics.peak_open, len(stack))
+                metrics.peak_stored = max(metrics.peak_stored, len(stack) + len(table))
+                self.mark_open(neighbor)
+                draw_callback()
+
+            if next_threshold == float("inf"):  # Nothing was cut off, the whole reachable area was searched
+                self.log("No path found.")
+                return self.end_search()
+            threshold = next_threshold
+
+    # Neighbors closest to the goal first, so a round that can reach the goal tends to find it early
+    def successors(self, cell, end_cell):
+        return iter(sorted(cell.valid_neighbors, key=lambda neighbor: self.heuristic(neighbor.get_pos(), end_cell.get_pos())))
+
+    # The path is what's left on the stack, it is popped from the goal back to the start
+    def reconstruct_path(self, stack, path_length, start_cell, draw_callback):
+        while stack:
+            cell = stack.pop()[0]
+            self.metrics.pops += 1
+            if cell != start_cell:
+                self.mark_path(cell)
+            draw_callback()
+        return path_length
+
+# Fringe Search, IDA*'s rounds without restarting from the start: the cells over the threshold are kept
+# on a "later" list for the next round, and a cache of g scores stops cells from being searched twice
+class FringeSearchAlgorithm(PathfindingAlgorithm):
+    name = "Fringe"
+
+    def __init__(self, grid, heuristic):
+        super().__init__(grid)
+        self.heuristic = heuristic
+
+    def find_path(self, start_cell, end_cell, draw_callback):
+        metrics = self.begin_search()
+        draw_callback = metrics.timed(draw_callback)  # Drawing is timed apart from the search
+        metrics.iterations = metrics.reexpansions = 0
+        expanded = set()  # Only for counting the re-expansions
+
+        # Entries are (g, cell), an entry whose g isn't the cell's cached g anymore is outdated and skipped
+        now = deque([(0, start_cell)])
+        later = deque()
+        g_cache = {start_cell: 0}
+        came_from = {}
+        threshold = self.heuristic(start_cell.get_pos(), end_cell.get_pos())
+        metrics.pushes = metrics.peak_open = 1
+
+        metrics.enter_phase("search")
+        while now:
+            metrics.iterations += 1
+            next_threshold = float("inf")
+
+            while now:
+                g_score, current_cell = now.popleft()
+                metrics.pops += 1
+                if g_score != g_cache[current_cell]:
+                    continue
+
+                f_score = g_score + self.heuristic(current_cell.get_pos(), end_cell.get_pos())
+                if f_score > threshold:
+                    next_threshold = min(next_threshold, f_score)
+                    later.append((g_score, current_cell))
+                    metrics.pushes += 1
+                    continue
+
+                if current_cell == end_cell:
+                    metrics.enter_phase("path")
+                    metrics.peak_stored = len(g_cache)
+                    self.mark_end(end_cell)
+                    path_length = self.reconstruct_path(came_from, end_cell, draw_callback)
+                    self.mark_start(start_cell)
+                    self.log(f"Pathfinding completed. Nodes visited: {metrics.expansions}, Iterations: {metrics.iterations}, Path length: {path_length}")
+                    return self.end_search(path_length, found=True)
+
+                metrics.expansions += 1
+                metrics.reexpansions += current_cell in expanded
+                expanded.add(current_cell)
+
+                # Children go to the front of the list, so they are searched next, in this round
+                for neighbor in reversed(current_cell.valid_neighbors):
+                    metrics.generated += 1
+                    neighbor_g_score = g_score + move_cost(current_cell, neighbor)
+                    if neighbor_g_score >= g_cache.get(neighbor, float("inf")):
+                        continue
+                    g_cache[neighbor] = neighbor_g_score
+                    came_from[neighbor] = current_cell
+                    now.appendleft((neighbor_g_score, neighbor))
+                    metrics.pushes += 1
+                    self.mark_open(neighbor)
+
+                metrics.peak_open = max(metrics.peak_open, len(now) + len(later))
+                draw_callback()
+
+                if current_cell != start_cell:
+                    self.mark_closed(current_cell)
+
+            now, later = later, deque()
+            threshold = next_threshold
+
+        metrics.peak_stored = len(g_cache)
+        self.log("No path found.")
+        return self.end_search()
+
+    def reconstruct_path(self, came_from, current_cell, draw_callback):
+        path_length = 0
+        while current_cell in came_from:
+            previous_cell = current_cell
+            current_cell = came_from[current_cell]
+            self.mark_path(current_cell)
+            path_length += move_cost(previous_cell, current_cell)
+            draw_callback()
+        return path_length
+
+# Node of SMA*'s search tree, a cell can be in the tree more than once through different paths
+class SMAStarNode:
+    __slots__ = ("cell", "g", "f", "depth", "parent", "children", "forgotten_f", "in_open", "version")
+
+    def __init__(self, cell, g, f, depth, parent):
+        self.cell = cell
+        self.g = g
+        self.f = f
+        self.depth = depth
+        self.parent = parent
+        self.children = []
+        self.forgotten_f = float("inf")  # Lowest f of the children dropped to free memory
+        self.in_open = False
+        self.version = 0  # Bumped when the node's f changes or it leaves the open list, older heap entries are skipped
+
+# Simplified Memory-bounded A* (SMA*), A* that never keeps more than node_limit nodes. When memory is
+# full it forgets the worst leaf, remembering its f in the parent, which regenerates it if the rest
+# of the search turns out worse. Finds the shortest path when that path fits in memory.
+class SMAStarAlgorithm(PathfindingAlgorithm):
+    name = "SMA*"
+
+    def __init__(self, grid, heuristic, node_limit=SMA_NODE_LIMIT):
+        super().__init__(grid)
+        self.heuristic = heuristic
+        self.node_limit = node_limit
+
+    def find_path(self, start_cell, end_cell, draw_callback):
+        metrics = self.begin_search()
+        draw_callback = metrics.timed(draw_callback)  # Drawing is timed apart from the search
+        metrics.reexpansions = 0
+        expanded = set()  # Only for counting the re-expansions
+        self.end_cell = end_cell
+        self.count = 0
+
+        # Best first on (f, deepest), worst first on (f, shallowest), both with lazy deletion
+        self.best = []
+        self.worst = []
+        root = SMAStarNode(start_cell, 0, self.heuristic(start_cell.get_pos(), end_cell.get_pos()), 0, None)
+        self.stored = {start_cell: root}  # Cheapest node of each cell in the tree
+        self.node_count = metrics.peak_stored = 1
+        self.add_open(root)
+
+        metrics.enter_phase("search")
+        while True:
+            node = self.pop_best()
+            if node is None or node.f == float("inf"):  # No path, or none that fits in memory
+                self.log("No path found.")
+                return self.end_search()
+
+            if node.cell == end_cell:
+                metrics.enter_phase("path")
+                self.mark_end(end_cell)
+                self.reconstruct_path(node, draw_callback)
+                self.mark_start(start_cell)
+                self.log(f"Pathfinding completed. Nodes visited: {metrics.expansions}, Path length: {node.g}")
+                return self.end_search(node.g, found=True)
+
+            metrics.expansions += 1
+            metrics.reexpansions += node.cell in expanded
+            expanded.add(node.cell)
+
+            # Generates the successors that aren't in the tree already, the forgotten ones come back
+            existing = {child.cell for child in node.children}
+            for neighbor in node.cell.valid_neighbors:
+                metrics.generated += 1
+                if neighbor in existing:
+                    continue
+                g_score = node.g + move_cost(node.cell, neighbor)
+                other = self.stored.get(neighbor)
+                if other is not None and other.g <= g_score:
+                    continue  # Also skips the cells on the node's own path
+
+                # A node at the memory limit can't have children, unless it's the goal it's a dead end
+                if node.depth + 2 < self.node_limit or neighbor == end_cell:
+                    f_score = max(node.f, g_score + self.heuristic(neighbor.get_pos(), end_cell.get_pos()))
+                else:
+                    f_score = float("inf")
+                child = SMAStarNode(neighbor, g_score, f_score, node.depth + 1, node)
+                node.children.append(child)
+                self.stored[neighbor] = child
+                self.node_count += 1
+                self.add_open(child)
+                self.mark_open(neighbor)
+            node.forgotten_f = float("inf")
+            metrics.peak_stored = max(metrics.peak_stored, self.node_count)
+
+            if node.children:
+                self.backup(node)
+            elif node is not root:
+                self.remove_node(node)  # Dead end
+
+            while self.node_count > self.node_limit and self.forget_worst():
+                pass
+            if len(self.best) + len(self.worst) > 4 * self.node_limit:
+                self.drop_stale_entries()  # Outdated heap entries would otherwise grow past the node limit
+
+            metrics.peak_open = max(metrics.peak_open, len(self.best))
+            draw_callback()
+            if node.cell != start_cell:
+                self.mark_closed(node.cell)
+
+    def add_open(self, node):
+        node.in_open = True
+        node.version += 1
+        self.count += 1
+        heapq.heappush(self.best, (node.f, -node.depth, self.count, node.version, node))
+        self.metrics.pushes += 1
+        if not node.children:
+            self.push_worst(node)
+
+    def push_worst(self, node):
+        self.count += 1
+        heapq.heappush(self.worst, (-node.f, node.depth, self.count, node.version, node))
+
+    def pop_best(self):
+        while self.best:
+            *_, version, node = heapq.heappop(self.best)
+            self.metrics.pops += 1
+            if node.in_open and version == node.version:
+                node.in_open = False
+                node.version += 1
+                return node
+        return None
+
+    def drop_stale_entries(self):
+        self.best = [entry for entry in self.best if entry[-1].in_open and entry[-2] == entry[-1].version]
+        self.worst = [entry for entry in self.worst if entry[-1].in_open and entry[-2] == entry[-1].version and not entry[-1].children]
+        heapq.heapify(self.best)
+        heapq.heapify(self.worst)
+
+    # A fully expanded node's f is the lowest f below it, which can only grow as leaves turn out worse
+    def backup(self, node):
+        while node is not None and (node.children or node.forgotten_f != float("inf")):
+            f_score = min([child.f for child in node.children] + [node.forgotten_f])
+            if f_score <= node.f:
+                return
+            node.f = f_score
+            if node.in_open:
+                self.add_open(node)  # Queued again with its new f, the old entries are skipped
+            node = node.parent
+
+    # Drops the worst leaf on the open list and hands its f to its parent
+    def forget_worst(self):
+        while self.worst:
+            *_, version, node = heapq.heappop(self.worst)
+            if node.in_open and version == node.version and not node.children and node.parent is not None:
+                break
+        else:
+            return False
+
+        node.in_open = False
+        node.version += 1
+        parent = node.parent
+        parent.forgotten_f = min(parent.forgotten_f, node.f)
+        self.remove_node(node)
+        if parent.forgotten_f == float("inf"):
+            return True  # The leaf couldn't reach the goal in memory, there's nothing to regenerate
+        if not parent.in_open:
+            self.add_open(parent)
+        elif not parent.children:
+            self.push_worst(parent)
+        return True
+
+    # Takes a leaf out of the tree, a parent left without children or anything to regenerate goes too
+    def remove_node(self, node):
+        while node.parent is not None:
+            parent = node.parent
+            parent.children.remove(node)
+            self.node_count -= 1
+            if self.stored.get(node.cell) is node:
+                del self.stored[node.cell]
+            if parent.children or parent.forgotten_f != float("inf") or parent.in_open:
+                self.backup(parent)
+                return
+            node = parent
+
+    def reconstruct_path(self, node, draw_callback):
+        node = node.parent
+        while node.parent is not None:
+            self.mark_path(node.cell)
+            node = node.parent
+            draw_callback()
+
+# Anytime Repairing A* (ARA*), weighted A* that finds a first path quickly with an inflated heuristic,
+# then lowers the weight and repairs it, reusing the g scores of the earlier rounds. Each solution is
+# at most "bound" times longer than the shortest path. Stops at weight 1 or when the time budget runs out.
+class ARAStarAlgorithm(PathfindingAlgorithm):
+    name = "ARA*"
+
+    def __init__(self, grid, heuristic, initial_weight=ARA_INITIAL_WEIGHT, weight_step=ARA_WEIGHT_STEP, time_budget=ARA_TIME_BUDGET):
+        super().__init__(grid)
+        self.heuristic = heuristic
+        self.initial_weight = initial_weight
+        self.weight_step = weight_step
+        self.time_budget = time_budget
+
+    def find_path(self, start_cell, end_cell, draw_callback):
+        metrics = self.begin_search()
+        draw_callback = metrics.timed(draw_callback)  # Drawing is timed apart from the search
+        started = time.perf_counter()
+        deadline = started + self.time_budget
+        metrics.improvements = []
+        metrics.gave_up = False
+        self.start_cell, self.end_cell = start_cell, end_cell
+        self.g_score = {start_cell: 0}
+        self.came_from = {}
+        self.open_set = []  # Heap of (key, count, cell), an entry whose key isn't in open_keys anymore is skipped
+        self.open_keys = {}
+        self.closed_set = set()
+        self.inconsistent = set()  # Closed cells whose g dropped during a round, reopened in the next one
+        self.count = 0
+
+        weight = self.initial_weight
+        self.push(start_cell, weight)
+        best_path = None
+
+        metrics.enter_phase("search")
+        while True:
+            # The budget also holds before the first path: a query that can't find one in time gets no path
+            if not self.improve_path(weight, deadline, draw_callback):
+                metrics.gave_up = best_path is None
+                break
+            if end_cell not in self.g_score:
+                break  # Everything reachable was searched
+
+            # The path can't be more than the goal's g over the lowest f of the cells not settled yet
+            unsettled = [self.g_score[cell] + self.heuristic(cell.get_pos(), end_cell.get_pos()) for cell in self.inconsistent.union(self.open_keys)]
+            bound = min(weight, self.g_score[end_cell] / min(unsettled)) if unsettled and min(unsettled) > 0 else 1.0
+            best_path = self.path_to(end_cell)
+            metrics.suboptimality_bound = bound
+            metrics.improvements.append({"weight": weight, "bound": bound, "path_length": self.g_score[end_cell],
+                                         "time": time.perf_counter() - started, "expansions": metrics.expansions})
+            self.log(f"Weight {weight:g}: path length {self.g_score[end_cell]:.2f}, at most {bound:.2f} times the shortest")
+            if bound <= 1 or time.perf_counter() >= deadline:
+                break
+
+            # Next round: lower weight, the inconsistent cells go back on the open list and every key is recomputed
+            weight = max(1.0, weight - self.weight_step)
+            cells = self.inconsistent.union(self.open_keys)
+            self.inconsistent.clear()
+            self.closed_set.clear()
+            self.open_set, self.open_keys = [], {}
+            for cell in cells:
+                self.push(cell, weight)
+
+        if best_path is None:
+            self.log("Out of time before a first path." if metrics.gave_up else "No path found.")
+            return self.end_search()
+
+        metrics.enter_phase("path")
+        self.mark_end(end_cell)
+        path_length = 0
+        for previous_cell, cell in zip(best_path, best_path[1:]):
+            if cell != end_cell:
+                self.mark_path(cell)
+            path_length += move_cost(previous_cell, cell)
+            draw_callback()
+        self.mark_start(start_cell)
+        self.log(f"Pathfinding completed. Nodes visited: {metrics.expansions}, Path length: {path_length}")
+        return self.end_search(path_length, found=True)
+
+    def push(self, cell, weight):
+        key = self.g_score[cell] + weight * self.heuristic(cell.get_pos(), self.end_cell.get_pos())
+        if cell not in self.open_keys:
+            self.mark_open(cell)
+        self.open_keys[cell] = key
+        self.count += 1
+        heapq.heappush(self.open_set, (key, self.count, cell))
+        self.metrics.pushes += 1
+        self.metrics.peak_open = max(self.metrics.peak_open, len(self.open_keys))
+
+    # One weighted A* round, until the goal's g is no worse than the best key on the open list.
+    # Returns False when the deadline cut it short.
+    def improve_path(self, weight, deadline, draw_callback):
+        metrics = self.metrics
+        while self.open_set:
+            key, _, cell = self.open_set[0]
+            if self.open_keys.get(cell) != key:
+                heapq.heappop(self.open_set)  # Outdated entry
+                metrics.pops += 1
+                continue
+            if self.g_score.get(self.end_cell, float("inf")) <= key:
+                return True
+            if time.perf_counter() >= deadline:
+                return False
+
+            heapq.heappop(self.open_set)
+            metrics.pops += 1
+            del self.open_keys[cell]
+            self.closed_set.add(cell)
+            metrics.expansions += 1
+
+            for neighbor in cell.valid_neighbors:
+                metrics.generated += 1
+                g_score = self.g_score[cell] + move_cost(cell, neighbor)
+                if g_score < self.g_score.get(neighbor, float("inf")):
+                    self.g_score[neighbor] = g_score
+                    self.came_from[neighbor] = cell
+                    if neighbor not in self.closed_set:
+                        self.push(neighbor, weight)
+                    else:
+                        metrics.reopenings += neighbor not in self.inconsistent
+                        self.inconsistent.add(neighbor)
+
+            draw_callback()
+            if cell != self.start_cell:
+                self.mark_closed(cell)
+        return True
+
+    def path_to(self, cell):
+        path = [cell]
+        while path[-1] in self.came_from:
+            path.append(self.came_from[path[-1]])
+        path.reverse()
+        return path
+
+# Algorithm classes by the name used in the menu, and whether they take a heuristic
+ALGORITHMS = {
+    "A*": (AStarAlgorithm, True),
+    "Bi-A*": (BiAStarAlgorithm, True),
+    "BFS": (BFSAlgorithm, False),
+    "DFS": (DFSAlgorithm, False),
+    "GBFS": (GBFSAlgorithm, True),
+    "JPS": (JPSAlgorithm, True),
+    "Theta*": (ThetaStarAlgorithm, True),
+    "Lazy Theta*": (LazyThetaStarAlgorithm, True),
+    "IDA*": (IDAStarAlgorithm, True),
+    "Fringe": (FringeSearchAlgorithm, True),
+    "SMA*": (SMAStarAlgorithm, True),
+    "ARA*": (ARAStarAlgorithm, True),
+}
+
+# Options are passed on to the algorithm's constructor, e.g. time_budget for ARA*
+def create_algorithm(name, grid, heuristic, **options):
+    algorithm_class, uses_heuristic = ALGORITHMS[name]
+    if uses_heuristic:
+        return algorithm_class(grid, heuristic, **options)
+    return algorithm_class(grid, **options)
@@ -0,0 +1,273 @@
+import argparse
+import json
+import math
+import os
+import socket
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import TCPServer
+from urllib.parse import unquote
+from .constants import *
+from .heuristics import HEURISTICS
+from .map_format import GridMap
+from .maze_algorithms import MAZE_ALGORITHMS, generate_maze_map
+from .movingai import load_map as load_movingai_map
+from .pathfinding_algorithms import ALGORITHMS
+from .shared_grid import QueryPool, SharedGrid
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, without it the server only speaks JSON
+    msgpack = None
+
+# Local server answering path queries over HTTP (localhost or a Unix socket), in JSON or msgpack.
+#   POST /maps/<name>           load a map: {"path": "file.aamap" or a MovingAI .map} or {"maze": "Kruskal", "width", "height", "seed"}
+#   POST /maps/<name>/barriers  edit it: {"set": [[col, row], ...], "clear": [...]}, cached answers are dropped
+#   POST /query                 {"map": name, "queries": [{"start": [col, row], "goal": [col, row], "algorithm", "heuristic", "movement", "time_budget"}, ...]}
+#   GET  /maps, GET /stats      loaded maps, and request counts, throughput and latency percentiles
+# The maps live in shared memory and a pool of worker processes searches them, each keeping its answers per map.
+
+# Request counts and times, the latency percentiles are over the last SERVER_STATS_WINDOW requests
+class ServerStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.queries = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=SERVER_STATS_WINDOW)
+        self.lock = threading.Lock()
+
+    def record(self, latency, queries=0, error=False):
+        with self.lock:
+            self.requests += 1
+            self.queries += queries
+            self.errors += error
+            self.latencies.append(latency)
+
+    def to_dict(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            requests, queries, errors = self.requests, self.queries, self.errors
+        uptime = time.perf_counter() - self.started
+        return {
+            "requests": requests,
+            "queries": queries,
+            "errors": errors,
+            "uptime": uptime,
+            "queries_per_second": queries / uptime,
+            "latency_ms": {f"p{percent}": percentile(latencies, percent) * 1000 for percent in (50, 90, 99)},
+        }
+
+# Nearest-rank percentile of sorted values
+def percentile(values, percent):
+    if not values:
+        return 0
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+class QueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, processes=None):
+        self.pool = QueryPool(processes)  # Started first, so the workers don't inherit the listening socket
+        self.maps = {}
+        self.map_references = {}  # One for the name a map is loaded under, plus one per request using it
+        self.maps_lock = threading.Lock()
+        self.stats = ServerStats()
+        super().__init__(address, QueryHandler)
+
+    def load_map(self, name, spec):
+        if "path" in spec:
+            if spec["path"].endswith(".map"):
+                grid_map = load_movingai_map(spec["path"])
+            else:
+                grid_map = GridMap.load(spec["path"])
+        else:
+            if spec["maze"] not in MAZE_ALGORITHMS:
+                raise ValueError(f"unknown maze algorithm {spec['maze']}")
+            width, height = int(spec["width"]), int(spec["height"])
+            if width < MIN_MAZE_SIZE or height < MIN_MAZE_SIZE:
+                raise ValueError(f"a maze needs at least {MIN_MAZE_SIZE}x{MIN_MAZE_SIZE} cells, not {width}x{height}")
+            grid_map = generate_maze_map(spec["maze"], width, height, seed=spec.get("seed"))
+
+        with grid_map:
+            shared = SharedGrid.create(grid_map)
+        with self.maps_lock:
+            previous = self.maps.get(name)
+            self.maps[name] = shared
+            self.map_references[shared] = 1
+        if previous is not None:
+            self.release_map(previous)  # Closed now, or by the last request still searching it
+        return self.describe(name, shared)
+
+    # One writer per map at a time, the workers see the edit as a new version
+    def edit_map(self, name, spec):
+        with self.use_map(name) as shared:
+            changes = [(col, row, blocked) for key, blocked in (("set", True), ("clear", False)) for col, row in spec.get(key, ())]
+            for col, row, _ in changes:
+                if not (0 <= col < shared.width and 0 <= row < shared.height):
+                    raise ValueError(f"({col}, {row}) is outside the map")
+            with self.maps_lock, shared.edit() as grid_map:
+                for col, row, blocked in changes:
+                    grid_map.set_blocked(col, row, blocked)
+            return self.describe(name, shared)
+
+    def query(self, spec):
+        queries = spec["queries"] if "queries" in spec else [spec]
+        for query in queries:
+            check_query(query)
+        with self.use_map(spec["map"]) as shared:
+            return self.pool.run(shared, queries)
+
+    # Holds a map for the length of a request. Reloading its name doesn't unlink the shared memory
+    # under the request, the workers attach to it by name while they search.
+    @contextmanager
+    def use_map(self, name):
+        with self.maps_lock:
+            if name not in self.maps:
+                raise KeyError(f"no map named {name}")
+            shared = self.maps[name]
+            self.map_references[shared] += 1
+        try:
+            yield shared
+        finally:
+            self.release_map(shared)
+
+    # Drops a reference to a map and closes it after the last one
+    def release_map(self, shared):
+        with self.maps_lock:
+            references = self.map_references.pop(shared, 0) - 1
+            if references > 0:
+                self.map_references[shared] = references
+        if references == 0:
+            shared.close()
+
+    def describe(self, name, shared):
+        return {"name": name, "width": shared.width, "height": shared.height, "version": shared.version}
+
+    def server_close(self):
+        super().server_close()
+        self.pool.close()
+        with self.maps_lock:
+            for shared in self.map_references:
+                shared.close()
+            self.maps.clear()
+            self.map_references.clear()
+
+# The same server on a Unix socket, the address is the socket's path
+class UnixQueryServer(QueryServer):
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        TCPServer.server_bind(self)  # HTTPServer's would look up a host name
+        self.server_name, self.server_port = "localhost", 0
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+# Checked before a query reaches the workers, so a bad one fails its request instead of a worker's batch
+def check_query(query):
+    for key in ("start", "goal"):
+        if len(query[key]) != 2 or not all(isinstance(value, int) for value in query[key]):
+            raise ValueError(f"{key} must be [col, row]")
+    for key, names in (("algorithm", ALGORITHMS), ("heuristic", HEURISTICS), ("movement", MOVEMENTS)):
+        if key in query and query[key] not in names:
+            raise ValueError(f"unknown {key} {query[key]}")
+    if "time_budget" in query:
+        if query.get("algorithm") != "ARA*":
+            raise ValueError("time_budget only applies to ARA*")
+        if not isinstance(query["time_budget"], (int, float)) or query["time_budget"] < 0:
+            raise ValueError("time_budget must be a number of seconds")
+
+class QueryHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/stats":
+            self.respond(self.server.stats.to_dict())
+        elif self.path == "/maps":
+            with self.server.maps_lock:
+                maps = [self.server.describe(name, shared) for name, shared in self.server.maps.items()]
+            self.respond({"maps": maps})
+        else:
+            self.respond({"error": f"no such endpoint {self.path}"}, 404)
+
+    def do_POST(self):
+        started = time.perf_counter()
+        parts = [unquote(part) for part in self.path.strip("/").split("/")]
+        try:
+            spec = self.read_body()
+            if parts == ["query"]:
+                results = self.server.query(spec)
+                response, queries = {"results": results}, len(results)
+            elif len(parts) == 2 and parts[0] == "maps":
+                response, queries = self.server.load_map(parts[1], spec), 0
+            elif len(parts) == 3 and parts[0] == "maps" and parts[2] == "barriers":
+                response, queries = self.server.edit_map(parts[1], spec), 0
+            else:
+                self.respond({"error": f"no such endpoint {self.path}"}, 404)
+                return
+        except (KeyError, ValueError, TypeError, OSError) as error:
+            self.server.stats.record(time.perf_counter() - started, error=True)
+            self.respond({"error": str(error).strip("'\"")}, 400)
+            return
+        except Exception as error:
+            # A bug, not a bad request. It's still answered and counted, the connection isn't just dropped.
+            traceback.print_exc()
+            self.server.stats.record(time.perf_counter() - started, error=True)
+            self.respond({"error": f"internal error: {error!r}"}, 500)
+            return
+        self.server.stats.record(time.perf_counter() - started, queries)
+        self.respond(response)
+
+    # msgpack requests get msgpack responses, everything else is JSON
+    def uses_msgpack(self):
+        return self.headers.get("Content-Type") == "application/msgpack"
+
+    def read_body(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.uses_msgpack():
+            if msgpack is None:
+                raise ValueError("msgpack isn't installed, send JSON")
+            return msgpack.unpackb(body)
+        return json.loads(body or b"{}")
+
+    def respond(self, data, status=200):
+        if self.uses_msgpack() and msgpack is not None:
+            body, content_type = msgpack.packb(data), "application/msgpack"
+        else:
+            body, content_type = json.dumps(data).encode(), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Quiet, /stats has the numbers
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Answer path queries on a local HTTP server or Unix socket.")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--socket", help="listen on this Unix socket instead of a TCP port")
+    parser.add_argument("--workers", type=int, help="worker processes (one per core by default)")
+    parser.add_argument("--map", action="append", default=[], metavar="NAME=PATH", help="map to load at start, .aamap or MovingAI .map")
+    args = parser.parse_args(args)
+
+    server = UnixQueryServer(args.socket, args.workers) if args.socket else QueryServer((args.host, args.port), args.workers)
+    with server:
+        for entry in args.map:
+            name, _, path = entry.partition("=")
+            server.load_map(name, {"path": path})
+        print(f"Serving path queries on {args.socket or f'http://{args.host}:{server.server_port}'}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
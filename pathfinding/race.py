@@ -0,0 +1,123 @@
+import time
+import pygame
+from .constants import *
+from .grid import PALETTE, TRACE_STATES
+from .pathfinding_algorithms import ALGORITHMS, create_algorithm
+from .search_worker import SearchWorker
+from ui import COLORS
+
+RACE_BACKGROUND = len(PALETTE)  # Palette index of the space around the mini views
+
+# One algorithm of a race. The searches share the grid read-only, each lane keeps its own copy of
+# the cell states and updates it from its search's events.
+class RaceLane:
+    def __init__(self, name, grid, heuristic, start_cell, end_cell):
+        self.name = name
+        algorithm = create_algorithm(name, grid.grid, heuristic)
+        algorithm.verbose = False
+        algorithm.movement = grid.movement
+        self.states = bytearray(cell.state for row in grid.grid for cell in row)
+        self.worker = SearchWorker(algorithm, start_cell, end_cell)
+
+    def advance(self, steps):
+        for kind, index in self.worker.drain(steps):
+            self.states[index] = TRACE_STATES[kind]
+
+    # Final metrics once the search is done, the live counters of the running search before that
+    @property
+    def metrics(self):
+        return self.worker.metrics or self.worker.algorithm.metrics
+
+# Runs several algorithms at once on the same grid, drawn as tiled mini views with a leaderboard
+class Race:
+    def __init__(self, grid, heuristic, start_cell, end_cell, names=None):
+        self.grid = grid
+        self.lanes = [RaceLane(name, grid, heuristic, start_cell, end_cell) for name in (names or ALGORITHMS)]
+        self.started = None
+
+        # All the mini views are drawn from one palette image (the atlas), a cell per pixel, scaled up in one go
+        self.columns = min(RACE_COLUMNS, len(self.lanes))
+        self.tile_width = grid.cols + RACE_TILE_GAP
+        self.tile_height = grid.rows + RACE_LABEL_ROWS
+        tile_rows = -(-len(self.lanes) // self.columns)
+        self.atlas_size = (self.columns * self.tile_width - RACE_TILE_GAP, tile_rows * self.tile_height)
+        self.atlas = bytearray([RACE_BACKGROUND]) * (self.atlas_size[0] * self.atlas_size[1])
+        self.scale = max(1, min(GRID_WIDTH // self.atlas_size[0], RACE_VIEW_HEIGHT // self.atlas_size[1]))
+        self.font = pygame.font.SysFont('Verdana', 12)
+
+    def start(self):
+        self.started = time.perf_counter()
+        for lane in self.lanes:
+            lane.worker.start()
+        return self
+
+    def advance(self, steps):
+        for lane in self.lanes:
+            lane.advance(steps)
+
+    def cancel(self):
+        for lane in self.lanes:
+            lane.worker.cancel()
+
+    # Every search has ended and every lane shows all of its events
+    @property
+    def finished(self):
+        return all(lane.worker.finished for lane in self.lanes)
+
+    # Searches that found a path, fastest first, then the ones without a path, then the ones still running
+    def leaderboard(self):
+        def rank(lane):
+            metrics = lane.worker.metrics
+            if metrics is None:
+                return 2, 0
+            return (0 if metrics.found else 1), metrics.total_time
+        return sorted(self.lanes, key=rank)
+
+    # Top left cell of a lane's tile in the atlas
+    def tile_origin(self, number):
+        column, row = number % self.columns, number // self.columns
+        return column * self.tile_width, row * self.tile_height + RACE_LABEL_ROWS
+
+    def draw(self, surface):
+        surface.fill(COLORS["DARK_GREEN"])
+        cols, rows = self.grid.cols, self.grid.rows
+        atlas_width, atlas_height = self.atlas_size
+
+        for number, lane in enumerate(self.lanes):
+            tile_x, tile_y = self.tile_origin(number)
+            for row in range(rows):
+                start = (tile_y + row) * atlas_width + tile_x
+                self.atlas[start:start + cols] = lane.states[row * cols:(row + 1) * cols]
+
+        atlas = pygame.image.frombuffer(self.atlas, self.atlas_size, "P")
+        atlas.set_palette(PALETTE + (COLORS["DARK_GREEN"],))
+        x = VISUALIZER_GRID_MARGIN + (GRID_WIDTH - atlas_width * self.scale) // 2
+        y = VISUALIZER_GRID_MARGIN
+        surface.blit(pygame.transform.scale(atlas, (atlas_width * self.scale, atlas_height * self.scale)), (x, y))
+
+        # Algorithm names in the space above each tile
+        for number, lane in enumerate(self.lanes):
+            tile_x, tile_y = self.tile_origin(number)
+            label = self.font.render(lane.name, True, COLORS["LIGHT_CREAM"])
+            surface.blit(label, (x + tile_x * self.scale, y + tile_y * self.scale - label.get_height() - 4))
+
+        self.draw_leaderboard(surface, y + atlas_height * self.scale + 10)
+
+    def draw_leaderboard(self, surface, y):
+        columns = ((0, "#"), (30, "Algorithm"), (140, "Expansions"), (260, "Time"), (380, "Path"))
+        line_height = self.font.get_height() + 8
+        x = VISUALIZER_GRID_MARGIN + 20
+
+        for offset, title in columns:
+            surface.blit(self.font.render(title, True, COLORS["LIGHT_CREAM"]), (x + offset, y))
+
+        for place, lane in enumerate(self.leaderboard(), start=1):
+            y += line_height
+            metrics = lane.metrics
+            if lane.worker.metrics is None:
+                elapsed, path = time.perf_counter() - self.started, "failed" if lane.worker.error else "running"
+            else:
+                elapsed, path = metrics.total_time, round(metrics.path_length, 2) if metrics.found else "no path"
+            values = (place, lane.name, metrics.expansions if metrics else 0, f"{elapsed * 1000:.1f} ms", path)
+            for (offset, title), value in zip(columns, values):
+                surface.blit(self.font.render(str(value), True, COLORS["LIGHT_CREAM"]), (x + offset, y))
@@ -0,0 +1,60 @@
+import threading
+from collections import deque
+
+class SearchCancelled(Exception):
+    pass
+
+# Runs a search on a background thread so the window keeps drawing and handling input.
+# The search doesn't touch the grid's colors, it only publishes its events (the same ones a
+# SearchTrace records) on a deque. Appending and popping from opposite ends of a deque is
+# thread-safe without a lock, the UI thread drains a few events every frame and applies them.
+class SearchWorker:
+    def __init__(self, algorithm, start_cell, end_cell):
+        self.algorithm = algorithm
+        self.start_cell = start_cell
+        self.end_cell = end_cell
+        self.events = deque()
+        self.metrics = None  # SearchMetrics, set when the search is done
+        self.error = None
+        self.cancelled = threading.Event()
+
+        algorithm.trace = self
+        algorithm.recolor = False
+        self.thread = threading.Thread(target=self.run, name=f"{algorithm.name} search", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def run(self):
+        try:
+            self.metrics = self.algorithm.find_path(self.start_cell, self.end_cell, self.check_cancelled)
+        except SearchCancelled:
+            pass
+        except Exception as error:  # Handed to the UI thread instead of dying silently
+            self.error = error
+
+    # Used as the search's draw callback, so the search stops at its next step once cancelled
+    def check_cancelled(self):
+        if self.cancelled.is_set():
+            raise SearchCancelled()
+
+    def cancel(self):
+        self.cancelled.set()
+        self.thread.join()
+
+    # Same method as SearchTrace, called by the search for every color change
+    def record(self, kind, index):
+        self.events.append((kind, index))
+
+    # Takes up to limit events off the queue, in the order the search made them
+    def drain(self, limit):
+        events = []
+        while len(events) < limit and self.events:
+            events.append(self.events.popleft())
+        return events
+
+    # The search has ended and every event it made has been taken off the queue
+    @property
+    def finished(self):
+        return not self.thread.is_alive() and not self.events
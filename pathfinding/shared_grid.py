@@ -0,0 +1,165 @@
+import struct
+import time
+from contextlib import contextmanager
+from multiprocessing import Pool, resource_tracker, shared_memory
+from .constants import *
+from .grid import Grid
+from .headless import run_search
+from .heuristics import HEURISTICS
+from .map_format import GridMap, MAP_HEADER, MAP_MAGIC, MAP_VERSION
+
+# Shared memory layout: an 8-byte write counter, then the map in its file layout (header and bits, no cost layer)
+COUNTER = struct.Struct("<Q")
+BITS_OFFSET = COUNTER.size + MAP_HEADER.size
+
+# A grid's barriers in shared memory, written by the process that created it (the owner, e.g. the UI)
+# and read by query workers. Writes follow a seqlock: the counter goes odd before the bits change and
+# even again after, so a reader that saw the same even counter before and after copying the bits has
+# a consistent snapshot. The version is the number of finished writes.
+class SharedGrid:
+    def __init__(self, memory, owner):
+        self.memory = memory
+        self.owner = owner
+        _, _, _, self.width, self.height = MAP_HEADER.unpack_from(memory.buf, COUNTER.size)
+        self.bits = memory.buf[BITS_OFFSET:BITS_OFFSET + (self.width + 7) // 8 * self.height]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @classmethod
+    def create(cls, grid_map):
+        memory = shared_memory.SharedMemory(create=True, size=BITS_OFFSET + len(grid_map.bits))
+        COUNTER.pack_into(memory.buf, 0, 0)
+        MAP_HEADER.pack_into(memory.buf, COUNTER.size, MAP_MAGIC, MAP_VERSION, 0, grid_map.width, grid_map.height)
+        memory.buf[BITS_OFFSET:BITS_OFFSET + len(grid_map.bits)] = grid_map.bits
+        return cls(memory, owner=True)
+
+    # Workers attach by name and only ever read
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    @property
+    def counter(self):
+        return COUNTER.unpack_from(self.memory.buf, 0)[0]
+
+    @property
+    def version(self):
+        return self.counter // 2
+
+    # Changes the barriers through a GridMap over the shared bits: with grid.edit() as grid_map: ...
+    @contextmanager
+    def edit(self):
+        if not self.owner:
+            raise PermissionError("only the process that created the shared grid can change it")
+        counter = self.counter
+        COUNTER.pack_into(self.memory.buf, 0, counter + 1)  # Odd, readers wait or retry
+        try:
+            yield GridMap(self.width, self.height, self.bits)
+        finally:
+            COUNTER.pack_into(self.memory.buf, 0, counter + 2)
+
+    # Copies the barriers of a Grid (the visualizer's), the version only moves when they changed
+    def sync(self, grid):
+        bits = grid.to_map().bits
+        if self.bits != bits:
+            with self.edit() as grid_map:
+                grid_map.bits[:] = bits
+
+    # Copies the barriers out, retrying while a write is under way. Returns (version, GridMap).
+    def snapshot(self):
+        while True:
+            counter = self.counter
+            if counter % 2 == 0:
+                bits = bytearray(self.bits)
+                if self.counter == counter:
+                    return counter // 2, GridMap(self.width, self.height, bits)
+            time.sleep(0)  # Let the writer finish
+
+    # The owner also removes the shared memory, workers only let go of it
+    def close(self):
+        if self.memory is None:
+            return
+        self.bits.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+        self.memory = None
+
+# State of a query worker process, for each shared grid it attached to (by name): the Grid built from
+# the grid's last snapshot and the answers found on that version. When the version moves, the Grid is
+# rebuilt and the answers dropped. Only the grids used last stay attached.
+worker_grids = {}
+
+# Answers a batch of queries on the shared grid with this name. Queries are dicts with start and goal
+# (col, row) and optionally the algorithm, heuristic and movement names, and ARA*'s time_budget in seconds. Every answer is the search's
+# metrics as a dict, with the grid version it was found on, or an error for a query that can't be searched.
+def run_batch(name, queries):
+    state = worker_grids.pop(name, None)
+    if state is None:
+        state = {"shared": SharedGrid.attach(name), "version": None}
+        if len(worker_grids) >= QUERY_WORKER_GRIDS:
+            worker_grids.pop(next(iter(worker_grids)))["shared"].close()  # The least recently used one
+    worker_grids[name] = state  # Most recently used last
+
+    if state["shared"].version != state["version"]:
+        version, grid_map = state["shared"].snapshot()
+        state.update(version=version, grid=Grid.from_map(grid_map), movement=None, answers={})
+    answers = state["answers"]
+
+    results = []
+    for query in queries:
+        key = query_key(query)
+        if key not in answers:
+            if len(answers) >= QUERY_CACHE_SIZE:
+                answers.clear()
+            answers[key] = answer_query(state, *key)
+        results.append(dict(answers[key], version=state["version"]))
+    return results
+
+def query_key(query):
+    return (query.get("algorithm", "A*"), tuple(query["start"]), tuple(query["goal"]),
+            query.get("heuristic", "Manhattan"), query.get("movement", MOVE_4), query.get("time_budget"))
+
+def answer_query(state, algorithm, start, goal, heuristic, movement, time_budget=None):
+    grid = state["grid"]
+    for col, row in (start, goal):
+        if not (0 <= col < grid.cols and 0 <= row < grid.rows) or grid.grid[row][col].is_barrier():
+            return {"error": f"({col}, {row}) is a barrier or outside the grid"}
+    if state["movement"] != movement:
+        grid.update_valid_neighbors(movement)
+        state["movement"] = movement
+    options = {} if time_budget is None else {"time_budget": time_budget}
+    return run_search(grid, algorithm, start, goal, HEURISTICS[heuristic], **options).to_dict()
+
+# Worker processes that answer path queries on shared grids in batches. Only the grid's name is sent,
+# the workers attach to it themselves, and check its version once per batch.
+class QueryPool:
+    def __init__(self, processes=None, batch_size=QUERY_BATCH_SIZE):
+        self.batch_size = batch_size
+        # The workers must share this process's resource tracker, with their own ones each would
+        # report the shared grids they attached to as leaked when it exits
+        resource_tracker.ensure_running()
+        self.pool = Pool(processes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Answers in the order of the queries
+    def run(self, shared_grid, queries):
+        batches = [(shared_grid.name, queries[start:start + self.batch_size]) for start in range(0, len(queries), self.batch_size)]
+        return [result for batch in self.pool.starmap(run_batch, batches) for result in batch]
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
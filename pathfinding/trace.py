@@ -0,0 +1,193 @@
+import os
+import struct
+import zlib
+from array import array
+
+# Kinds of events recorded by a search, one per color change made on the grid
+TRACE_OPEN = 0
+TRACE_CLOSED = 1
+TRACE_PATH = 2
+TRACE_START = 3
+TRACE_END = 4
+TRACE_JUMP = 5  # Jump points on a JPS path
+TRACE_KIND_BITS = 3
+
+# On-disk trace layout (little endian):
+#   header  -> magic, format version, grid width, grid height, number of events (18 bytes)
+#   blocks  -> block header (flags, number of events, payload size) followed by the payload
+# Each event is a varint holding the kind in its low bits and the zigzag encoded difference from the
+# previous cell index above them. Searches mostly move to nearby cells, so an event is one or two
+# bytes, less once a block is compressed. Blocks decode on their own, the index restarts at 0.
+TRACE_MAGIC = b"AATR"
+TRACE_VERSION = 2
+TRACE_HEADER = struct.Struct("<4sHIII")
+TRACE_BLOCK_HEADER = struct.Struct("<BII")
+BLOCK_ZLIB = 1
+TRACE_BLOCK_EVENTS = 65536
+
+# Compact in-memory record of a search, five bytes per event. Replaying it recolors the grid exactly
+# like the search did, without doing any of the search work.
+class SearchTrace:
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.kinds = array("B")
+        self.cells = array("I")
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        return zip(self.kinds, self.cells)
+
+    def record(self, kind, index):
+        self.kinds.append(kind)
+        self.cells.append(index)
+
+    def save(self, path, compress=True):
+        with TraceWriter(path, self.cols, self.rows, compress) as writer:
+            for start in range(0, len(self), TRACE_BLOCK_EVENTS):
+                writer.write_block(self.kinds[start:start + TRACE_BLOCK_EVENTS], self.cells[start:start + TRACE_BLOCK_EVENTS])
+
+    @classmethod
+    def load(cls, path):
+        reader = TraceReader(path)
+        trace = cls(reader.cols, reader.rows)
+        for kinds, cells in reader.blocks():
+            trace.kinds.extend(kinds)
+            trace.cells.extend(cells)
+        return trace
+
+# Streams a trace to disk while the search runs, only one block of events is held in memory.
+# It has the same record method as SearchTrace, so it can be attached to a search directly.
+class TraceWriter:
+    def __init__(self, path, cols, rows, compress=True):
+        self.cols = cols
+        self.rows = rows
+        self.compress = compress
+        self.count = 0
+        self.kinds = array("B")
+        self.cells = array("I")
+        self.file = open(path, "wb")
+        self.file.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, cols, rows, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, kind, index):
+        self.kinds.append(kind)
+        self.cells.append(index)
+        if len(self.kinds) >= TRACE_BLOCK_EVENTS:
+            self.flush()
+
+    def flush(self):
+        if self.kinds:
+            self.write_block(self.kinds, self.cells)
+            self.kinds = array("B")
+            self.cells = array("I")
+
+    def write_block(self, kinds, cells):
+        payload = encode_events(kinds, cells)
+        flags = 0
+        if self.compress:
+            payload = zlib.compress(payload)
+            flags |= BLOCK_ZLIB
+
+        self.file.write(TRACE_BLOCK_HEADER.pack(flags, len(kinds), len(payload)))
+        self.file.write(payload)
+        self.count += len(kinds)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+
+        # The event count is filled in last, a trace cut short by a crash still reads up to its last block
+        self.file.seek(0)
+        self.file.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, self.cols, self.rows, self.count))
+        self.file.close()
+
+# Reads a trace file lazily, one block at a time. Every iteration reads the file from the start,
+# so it can be replayed any number of times without ever holding more than a block in memory.
+class TraceReader:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            header = file.read(TRACE_HEADER.size)
+        if len(header) < TRACE_HEADER.size:
+            raise ValueError(f"{path} is not a trace file")
+
+        magic, version, self.cols, self.rows, self.count = TRACE_HEADER.unpack(header)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            raise ValueError(f"{path} is not a version {TRACE_VERSION} trace file")
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for kinds, cells in self.blocks():
+            yield from zip(kinds, cells)
+
+    # Writes the trace out again a block at a time. It goes through a temporary file, so a trace
+    # can be saved over the file it's read from.
+    def save(self, path, compress=True):
+        temporary_path = f"{path}.tmp"
+        with TraceWriter(temporary_path, self.cols, self.rows, compress) as writer:
+            for kinds, cells in self.blocks():
+                writer.write_block(kinds, cells)
+        os.replace(temporary_path, path)
+
+    def blocks(self):
+        with open(self.path, "rb") as file:
+            file.seek(TRACE_HEADER.size)
+            while True:
+                block_header = file.read(TRACE_BLOCK_HEADER.size)
+                if len(block_header) < TRACE_BLOCK_HEADER.size:
+                    return  # End of the trace
+
+                flags, count, size = TRACE_BLOCK_HEADER.unpack(block_header)
+                payload = file.read(size)
+                if len(payload) < size:
+                    raise ValueError(f"{self.path} is truncated")
+                if flags & BLOCK_ZLIB:
+                    payload = zlib.decompress(payload)
+                yield decode_events(payload, count)
+
+# Encodes a block of events as varints, see the file layout above
+def encode_events(kinds, cells):
+    encoded = bytearray()
+    previous = 0
+    for kind, index in zip(kinds, cells):
+        delta = index - previous
+        previous = index
+        value = ((delta << 1) if delta >= 0 else (-delta << 1) - 1) << TRACE_KIND_BITS | kind
+        while value >= 0x80:
+            encoded.append(value & 0x7F | 0x80)
+            value >>= 7
+        encoded.append(value)
+    return encoded
+
+def decode_events(encoded, count):
+    kinds = array("B")
+    cells = array("I")
+    kind_mask = (1 << TRACE_KIND_BITS) - 1
+    previous = 0
+    value = shift = 0
+    for byte in encoded:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+
+        zigzag = value >> TRACE_KIND_BITS
+        previous += (zigzag >> 1) if not zigzag & 1 else -((zigzag + 1) >> 1)
+        kinds.append(value & kind_mask)
+        cells.append(previous)
+        value = shift = 0
+
+    if len(kinds) != count:
+        raise ValueError("corrupt trace block")
+    return kinds, cells
@@ -1,15 +1,48 @@
 import pygame
+import random
+import traceback
+from itertools import islice
 from .constants import *
 from .grid import *
 from .pathfinding_algorithms import *
 from .heuristics import *
 from .maze_algorithms import *
+from .map_format import GridMap
+from .race import Race
+from .search_worker import SearchWorker
+from .trace import SearchTrace, TraceReader
 from ui import *
 from menu_states import *
 from algorithms_info import *
 
+# Menu buttons as rows of (name, text), the name is what the button handlers and algorithms_info use
+ALGORITHM_BUTTON_ROWS = [
+    [("A*", "A*"), ("Bi-A*", "Bi-A*"), ("BFS", "BFS"), ("DFS", "DFS")],
+    [("GBFS", "GBFS"), ("JPS", "JPS"), ("Theta*", "Theta*"), ("Lazy Theta*", "Lazy Theta*")],
+    [("IDA*", "IDA*"), ("Fringe", "Fringe"), ("SMA*", "SMA*"), ("ARA*", "ARA*")],
+]
+HEURISTIC_BUTTON_ROWS = [
+    [("Manhattan", "Manhattan"), ("Euclidean", "Euclidean"), ("Diagonal", "Diagonal")],
+    [("Octile", "Octile"), ("Dijkstra", "Dijkstra")],
+    [("Movement", "Moves: 4-way"), ("Tie Breaking", "A* Ties: FIFO")],
+]
+MAZE_BUTTON_ROWS = [
+    [("Recursive DFS", "DFS Maze"), ("Growing Tree", "Growing Tree"), ("Binary Tree", "Binary Tree")],
+    [("Sidewinder", "Sidewinder"), ("Eller", "Eller"), ("Kruskal", "Kruskal")],
+    [("Prim", "Prim"), ("Wilson", "Wilson"), ("Custom", "Custom")],
+]
+CONTROL_BUTTON_ROWS = [
+    [("Clear Path", "Clear Path"), ("Reset Grid", "Reset Grid")],
+    [("Start", "Start"), ("Race", "Race")],
+    [("Back to Menu", "Back to Menu"), ("Algo Details", "Algo Details"), ("Instructions", "Instructions")],
+]
+
+ALGORITHM_BUTTONS = [name for row in ALGORITHM_BUTTON_ROWS for name, text in row]
+HEURISTIC_BUTTONS = [name for row in HEURISTIC_BUTTON_ROWS for name, text in row if name in HEURISTICS]
+MAZE_BUTTONS = [name for row in MAZE_BUTTON_ROWS for name, text in row]
+
 class PathfindingVisualizer:
-    def __init__(self, window):
+    def __init__(self, window, seed=None):
         self.window = window
         self.visualizer_grid_area = pygame.Surface((VISUALIZER_GRID_WIDTH, VISUALIZER_GRID_HEIGHT))
         self.visualizer_menu_area = pygame.Surface((VISUALIZER_MENU_WIDTH, VISUALIZER_MENU_HEIGHT))
@@ -19,7 +52,25 @@ class PathfindingVisualizer:
         self.end_cell = None
         self.algorithm = AStarAlgorithm(self.grid.grid, Heuristic.manhattan)  # Default algorithm
         self.heuristic = Heuristic.manhattan  # Default heuristic
+        self.tie_breaking = "FIFO"  # A* tie-breaking policy, cycled with its button
+        self.movement = MOVE_4  # Movement model the searches use, cycled with its button
         self.maze_algorithm = "custom"  # Default maze algorithm
+        self.maze_stream = None  # Rows of an endless Eller maze scrolling through the grid, toggled with 'E'
+        self.seed = seed  # Seed given on the command line, every maze reuses it so runs can be reproduced
+        self.maze_seed = None  # Seed of the last generated maze
+
+        # Trace of the last search and where its replay is, the grid shows the first replay_position events
+        self.trace = None
+        self.replay_events = None  # Iterator over the trace, positioned at replay_position
+        self.replay_position = 0
+        self.replay_playing = False
+        self.replay_speed = REPLAY_DEFAULT_SPEED
+        self.replay_budget = 0  # Fraction of an event carried over between frames at slow speeds
+        self.last_metrics = None  # SearchMetrics of the last search, saved with 'J'
+        self.track_memory = False  # Measure each search's peak memory, toggled with 'M' (tracing slows every thread down)
+        self.search_worker = None  # Running search, its events are shown at the replay speed
+        self.race = None  # Race of the selected algorithms, shown instead of the grid until the path is cleared
+        self.race_algorithms = list(RACE_DEFAULT_ALGORITHMS)  # Lanes of the next race, shift-click an algorithm to add or remove it
 
         # Variables to keep track of the selected buttons
         self.selected_algorithm = "A*"
@@ -32,27 +83,15 @@ class PathfindingVisualizer:
         """Creates the buttons for the menu using ButtonPrimary."""
         font = pygame.font.SysFont('Verdana', 12)  # Smaller font for buttons
         large_font = pygame.font.SysFont('Verdana', 16)
-        
-        button_height = 40
-        button_x_gap = 10
-        button_y_gap = 10
-        button_width_3_col = (VISUALIZER_MENU_WIDTH - 30 - 2 * button_x_gap) // 3  # 3 columns
-        button_width_2_col = (VISUALIZER_MENU_WIDTH - 30 - button_x_gap) // 2  # 3 columns
-        button_width_1_col = (VISUALIZER_MENU_WIDTH - 30)      # 1 columns
-
-        x_absolute_offset = WINDOW_WIDTH - VISUALIZER_MENU_WIDTH
-        y_absolute_offset = 150 
 
+        button_height = MENU_BUTTON_HEIGHT
+        button_width_1_col = (VISUALIZER_MENU_WIDTH - 30)      # 1 columns
         x_menu_center = VISUALIZER_MENU_WIDTH // 2 - VISUALIZER_GRID_MARGIN // 2
 
-        x_relative_offset_button_3_col = x_menu_center - 3 * (button_width_3_col // 2) - button_x_gap
-        x_relative_offset_button_2_col = x_menu_center - button_width_2_col - button_x_gap // 2
-        x_relative_offset_button_1_col = x_menu_center - button_width_1_col // 2
-
         self.buttons = {
             "Prompt": ButtonPrimary(
-                x_relative_offset_button_1_col, 
-                5 + button_height + button_y_gap, 
+                x_menu_center - button_width_1_col // 2, 
+                5 + button_height + MENU_BUTTON_Y_GAP, 
                 button_width_1_col, 
                 button_height * 1.4, 
                 text=self.prompt, 
@@ -62,200 +101,51 @@ class PathfindingVisualizer:
                 hover_button_color=COLORS['DARK_GREEN'], # Since hover_x and y = None isn't removing the hover ability. 
                 text_color=COLORS['LIGHT_CREAM'],
                 border_color=COLORS['LIGHT_CREAM']
-
-            ),
-            "A*": ButtonPrimary(
-                x_relative_offset_button_3_col, 
-                y_absolute_offset, 
-                button_width_3_col, 
-                button_height,
-                "A*", font, 
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col, 
-                hovered_y=y_absolute_offset
-            ),
-            "Bi-A*": ButtonPrimary(
-                x_relative_offset_button_3_col + button_width_3_col + button_x_gap, 
-                y_absolute_offset, button_width_3_col, 
-                button_height, 
-                "Bi-A*", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col + button_width_3_col + button_x_gap, 
-                hovered_y=y_absolute_offset
-            ),
-            "BFS": ButtonPrimary(
-                x_relative_offset_button_3_col + 2 * (button_width_3_col + button_x_gap), 
-                y_absolute_offset, button_width_3_col, 
-                button_height, 
-                "BFS", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col + 2 * (button_width_3_col + button_x_gap), 
-                hovered_y=y_absolute_offset
-            ),
-            "DFS": ButtonPrimary(
-                x_relative_offset_button_3_col, 
-                y_absolute_offset + button_y_gap + button_height, 
-                button_width_3_col, 
-                button_height, 
-                "DFS", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col, 
-                hovered_y=y_absolute_offset + button_y_gap + button_height
-            ),
-            "GBFS": ButtonPrimary(
-                x_relative_offset_button_3_col + button_width_3_col + button_x_gap, 
-                y_absolute_offset + button_y_gap + button_height, 
-                button_width_3_col, 
-                button_height, 
-                "GBFS", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col + button_width_3_col + button_x_gap, 
-                hovered_y=y_absolute_offset + button_y_gap + button_height
-            ),
-            "JPS": ButtonPrimary(
-                x_relative_offset_button_3_col + 2 * (button_width_3_col + button_x_gap), 
-                y_absolute_offset + button_y_gap + button_height, button_width_3_col, 
-                button_height, 
-                "JPS", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col + 2 * (button_width_3_col + button_x_gap), 
-                hovered_y=y_absolute_offset + button_y_gap + button_height
-            ),
-
-            # Heuristics Section
-            "Manhattan": ButtonPrimary(
-                x_relative_offset_button_2_col, 
-                y_absolute_offset + 140, 
-                button_width_2_col, 
-                button_height, 
-                "Manhattan", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_2_col, 
-                hovered_y=y_absolute_offset + 140
-            ),
-            "Euclidean": ButtonPrimary(
-                x_relative_offset_button_2_col + button_width_2_col + button_x_gap, 
-                y_absolute_offset + 140, 
-                button_width_2_col, 
-                button_height, 
-                "Euclidean", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_2_col + button_width_2_col + button_x_gap, 
-                hovered_y=y_absolute_offset + 140
-            ),
-            "Diagonal": ButtonPrimary(
-                x_relative_offset_button_2_col,
-                y_absolute_offset + 140 + button_y_gap + button_height, 
-                button_width_2_col, 
-                button_height,
-                "Diagonal", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_2_col , 
-                hovered_y=y_absolute_offset + 140 + button_y_gap + button_height
-            ),
-            "Dijkstra": ButtonPrimary(
-                x_relative_offset_button_2_col + button_width_2_col + button_x_gap, 
-                y_absolute_offset + 140 + button_y_gap + button_height, 
-                button_width_2_col, 
-                button_height, 
-                "Dijkstra", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_2_col + button_width_2_col + button_x_gap, 
-                hovered_y=y_absolute_offset + 140 + button_y_gap + button_height
             ),
+        }
 
+        # Each section is a title followed by rows of equally sized buttons, laid out top to bottom
+        sections = [
+            ("Pathfinding Algorithms", ALGORITHM_BUTTON_ROWS, font),
+            ("Heuristics", HEURISTIC_BUTTON_ROWS, font),
+            ("Maze Generation Algorithms", MAZE_BUTTON_ROWS, font),
+        ]
+
+        self.section_titles = []
+        y = MENU_FIRST_SECTION_Y
+        for title, rows, section_font in sections:
+            self.section_titles.append((title, y))
+            y += MENU_SECTION_TITLE_HEIGHT
+            for row in rows:
+                self.add_button_row(row, y, button_height, section_font)
+                y += button_height + MENU_BUTTON_Y_GAP
+            y += MENU_BUTTON_Y_GAP
+
+        # Control Buttons
+        y += MENU_BUTTON_Y_GAP
+        for row, row_font in zip(CONTROL_BUTTON_ROWS, (large_font, large_font, font)):
+            self.add_button_row(row, y, button_height, row_font)
+            y += button_height + MENU_BUTTON_Y_GAP
+
+    def add_button_row(self, row, y, height, font):
+        """Adds a row of equally sized buttons, given as (name, text) pairs, centered in the menu."""
+        columns = len(row)
+        width = (VISUALIZER_MENU_WIDTH - 30 - (columns - 1) * MENU_BUTTON_X_GAP) // columns
+        x_menu_center = VISUALIZER_MENU_WIDTH // 2 - VISUALIZER_GRID_MARGIN // 2
+        x = x_menu_center - (columns * width + (columns - 1) * MENU_BUTTON_X_GAP) // 2
+        x_absolute_offset = WINDOW_WIDTH - VISUALIZER_MENU_WIDTH
 
-            # Maze Generation Algorithms Section
-            "Recursive DFS": ButtonPrimary(
-                x_relative_offset_button_3_col, 
-                y_absolute_offset + 280, 
-                button_width_3_col, 
-                button_height, 
-                "DFS Maze", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col, 
-                hovered_y=y_absolute_offset + 280
-            ),
-            "Growing Tree": ButtonPrimary(
-                x_relative_offset_button_3_col + button_width_3_col + 10, 
-                y_absolute_offset + 280, button_width_3_col, 
-                button_height, 
-                "Growing Tree", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col + button_width_3_col + 10, 
-                hovered_y=y_absolute_offset + 280
-            ),
-            "Custom": ButtonPrimary(
-                x_relative_offset_button_3_col + 2 * (button_width_3_col + 10), 
-                y_absolute_offset + 280, 
-                button_width_3_col, 
-                button_height * 2 + button_y_gap, 
-                "Custom", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col + 2 * (button_width_3_col + 10), 
-                hovered_y=y_absolute_offset + 280
-            ),
-            "Sidewinder": ButtonPrimary(
-                x_relative_offset_button_3_col, y_absolute_offset + 280 + button_height + button_y_gap, 
-                button_width_3_col, 
-                button_height, 
-                "Sidewinder", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col, 
-                hovered_y=y_absolute_offset + 280 + button_height + button_y_gap
-            ),
-            "Binary Tree": ButtonPrimary(
-                x_relative_offset_button_3_col + button_width_3_col + 10, 
-                y_absolute_offset + 280 + button_height + button_y_gap, 
-                button_width_3_col, 
-                button_height, 
-                "Binary Tree", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col + button_width_3_col + 10, 
-                hovered_y=y_absolute_offset + 280 + button_height + button_y_gap
-            ),
-
-            # Control Buttons
-            "Clear Path": ButtonPrimary(
-                x_relative_offset_button_2_col, 
-                y_absolute_offset + 400, 
-                button_width_2_col, 
-                button_height, 
-                "Clear Path", large_font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_1_col,
-                hovered_y=y_absolute_offset + 400
-            ),
-            "Reset Grid": ButtonPrimary(
-                x_relative_offset_button_2_col + button_width_2_col + button_x_gap,
-                y_absolute_offset + 400, 
-                button_width_2_col, 
-                button_height, 
-                "Reset Grid", large_font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_2_col + button_width_2_col + button_x_gap, 
-                hovered_y=y_absolute_offset + 400
-            ),
-            "Start": ButtonPrimary(
-                x_relative_offset_button_1_col, 
-                y_absolute_offset + 400 + button_height + button_y_gap, 
-                button_width_1_col, 
-                button_height, 
-                "Start", large_font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_1_col,
-                hovered_y=y_absolute_offset + 400 + button_height + button_y_gap
-            ),
-            "Back to Menu": ButtonPrimary(
-                x_relative_offset_button_3_col,
-                y_absolute_offset + 400 + 2* (button_height + button_y_gap), 
-                button_width_3_col, 
-                button_height, 
-                "Back to Menu", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col, 
-                hovered_y=y_absolute_offset + 400 + 2* (button_height + button_y_gap)
-            ),
-            "Algo Details": ButtonPrimary(
-                x_relative_offset_button_3_col + button_width_3_col + button_x_gap, 
-                y_absolute_offset + 400 + 2* (button_height + button_y_gap), 
-                button_width_3_col, 
-                button_height, 
-                "Algo Details", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col + button_width_3_col + button_x_gap, 
-                hovered_y=y_absolute_offset + 400 + 2* (button_height + button_y_gap)
-            ),
-            "Instructions": ButtonPrimary(
-                x_relative_offset_button_3_col + 2 * (button_width_3_col + 10), 
-                y_absolute_offset + 400 + 2 * (button_height + button_y_gap), 
-                button_width_3_col, 
-                button_height, 
-                "Instructions", font,
-                hovered_x=x_absolute_offset + x_relative_offset_button_3_col + 2 * (button_width_3_col + 10), 
-                hovered_y=y_absolute_offset + 400 + 2* (button_height + button_y_gap)
-            ),
-        }
+        for name, text in row:
+            self.buttons[name] = ButtonPrimary(
+                x, 
+                y, 
+                width, 
+                height, 
+                text, font,
+                hovered_x=x_absolute_offset + x, 
+                hovered_y=y
+            )
+            x += width + MENU_BUTTON_X_GAP
 
     def run(self):
         # Initial draw with white background
@@ -275,6 +165,14 @@ class PathfindingVisualizer:
                 return PATHFINDER_DETAILS_MENU
             elif input == PATHFINDER_INSTRUCTIONS_MENU:
                 return PATHFINDER_INSTRUCTIONS_MENU
+            if self.maze_stream:
+                self.grid.scroll_row(next(self.maze_stream))
+            if self.search_worker:
+                self.advance_search()
+            if self.race and not self.race.finished:
+                self.advance_race()
+            if self.replay_playing:
+                self.advance_replay()
             self.draw_grid()
             self.draw_menu()
             pygame.display.update()
@@ -292,7 +190,7 @@ class PathfindingVisualizer:
 
             if pygame.mouse.get_pressed()[0]:
                 mouse_pos = pygame.mouse.get_pos()
-                if self.is_within_grid(mouse_pos):  # Only interact if within grid area
+                if self.is_within_grid(mouse_pos) and not self.grid_in_use():  # Only interact if within grid area, and not while a search reads it
                     cell = self.grid.get_clicked_cell(mouse_pos)
                     if cell:
                         if not self.start_cell and cell != self.end_cell:
@@ -306,7 +204,7 @@ class PathfindingVisualizer:
 
             elif pygame.mouse.get_pressed()[2]:
                 mouse_pos = pygame.mouse.get_pos()
-                if self.is_within_grid(mouse_pos):
+                if self.is_within_grid(mouse_pos) and not self.grid_in_use():
                     cell = self.grid.get_clicked_cell(mouse_pos)
                     if cell:
                         cell.reset()
@@ -323,10 +221,37 @@ class PathfindingVisualizer:
                     self.clear_path()
                 if event.key == pygame.K_r:
                     self.reset_grid()
+                if event.key == pygame.K_s:
+                    self.save_map()
+                if event.key == pygame.K_l:
+                    self.load_map()
+                if event.key == pygame.K_e:
+                    self.toggle_maze_stream()
+                if event.key == pygame.K_p:
+                    self.toggle_replay()
+                if event.key == pygame.K_LEFT:
+                    self.seek_replay(self.replay_position - self.replay_scrub_step())
+                if event.key == pygame.K_RIGHT:
+                    self.seek_replay(self.replay_position + self.replay_scrub_step())
+                if event.key == pygame.K_UP:
+                    self.change_replay_speed(2)
+                if event.key == pygame.K_DOWN:
+                    self.change_replay_speed(0.5)
+                if event.key == pygame.K_x:
+                    self.export_trace()
+                if event.key == pygame.K_t:
+                    self.load_trace()
+                if event.key == pygame.K_j:
+                    self.export_metrics()
+                if event.key == pygame.K_m:
+                    self.toggle_memory_tracking()
 
     def handle_button_click(self, name):
         if name in self.buttons:
-            if name in ["A*", "Bi-A*", "BFS", "DFS", "GBFS", "JPS"]:
+            if name in ALGORITHM_BUTTONS and pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                self.toggle_race_lane(name)
+
+            elif name in ALGORITHM_BUTTONS:
                 self.selected_algorithm = name
                 self.algorithm = self.get_algorithm_by_name(name)
 
@@ -336,9 +261,9 @@ class PathfindingVisualizer:
                 self.buttons["Prompt"].update_text(self.prompt)
                 self.highlight_selected_buttons()
 
-            elif name in ["Manhattan", "Euclidean", "Diagonal", "Dijkstra"]:
+            elif name in HEURISTIC_BUTTONS:
                 self.selected_heuristic = name
-                self.heuristic = getattr(Heuristic, name.lower())
+                self.heuristic = HEURISTICS[name]
                 self.algorithm = self.get_algorithm_by_name(self.selected_algorithm)
 
                 # Access the short description from algorithms_info
@@ -347,7 +272,12 @@ class PathfindingVisualizer:
                 self.buttons["Prompt"].update_text(self.prompt)
                 self.highlight_selected_buttons()
 
-            elif name in ["Recursive DFS", "Growing Tree", "Binary Tree", "Sidewinder", "Custom"]:
+            elif name == "Tie Breaking":
+                self.cycle_tie_breaking()
+            elif name == "Movement":
+                self.cycle_movement()
+
+            elif name in MAZE_BUTTONS:
                 self.selected_maze_algorithm = name
                 self.maze_algorithm = name.replace(" ", "")
                 print(self.maze_algorithm)
@@ -355,11 +285,12 @@ class PathfindingVisualizer:
 
                 # Access the short description from algorithms_info
                 short_description = algorithms_info.get(name, {}).get("short_description", "Description not available")
-                self.prompt = f"{short_description}"
+                self.maze_seed = self.next_maze_seed()
+                self.prompt = f"{short_description}" if name == "Custom" else f"{short_description} Seed: {self.maze_seed}"
                 self.buttons["Prompt"].update_text(self.prompt)
 
                 self.draw_menu()
-                self.start_maze_generation(self.maze_algorithm)
+                self.start_maze_generation(self.maze_algorithm, self.maze_seed)
 
             elif name == "Clear Path":
                 self.clear_path()
@@ -367,6 +298,8 @@ class PathfindingVisualizer:
                 self.reset_grid()
             elif name == "Start":
                 self.start_pathfinding()
+            elif name == "Race":
+                self.start_race()
             elif name == "Back to Menu":
                 return self.go_to_main_menu()
             elif name == "Algo Details":
@@ -376,17 +309,17 @@ class PathfindingVisualizer:
 
     def highlight_selected_buttons(self):
         """Update the colors of the buttons based on selections."""
-        for name in ["A*", "Bi-A*", "BFS", "DFS", "GBFS", "JPS"]:
+        for name in ALGORITHM_BUTTONS:
             button = self.buttons[name]
             button.button_color = COLORS['MEDIUM_GREEN'] if name == self.selected_algorithm else COLORS['LIGHT_GREEN']
             button.text_color = COLORS['LIGHT_TEXT'] if name == self.selected_algorithm else COLORS['DARK_TEXT']
 
-        for name in ["Manhattan", "Euclidean", "Diagonal", "Dijkstra"]:
+        for name in HEURISTIC_BUTTONS:
             button = self.buttons[name]
             button.button_color = COLORS['MEDIUM_GREEN'] if name == self.selected_heuristic else COLORS['LIGHT_GREEN']
             button.text_color = COLORS['LIGHT_TEXT'] if name == self.selected_heuristic else COLORS['DARK_TEXT']
 
-        for name in ["Recursive DFS", "Growing Tree", "Binary Tree", "Sidewinder", "Custom"]:
+        for name in MAZE_BUTTONS:
             button = self.buttons[name]
             button.button_color = COLORS['MEDIUM_GREEN'] if name == self.selected_maze_algorithm else COLORS['LIGHT_GREEN']
             button.text_color = COLORS['LIGHT_TEXT'] if name == self.selected_maze_algorithm else COLORS['DARK_TEXT']
@@ -403,55 +336,292 @@ class PathfindingVisualizer:
             print("Select starting and ending point!")
         else:
             print("Starting pathfinding...")
-            for row in self.grid.grid:
-                for cell in row:
-                    cell.update_valid_neighbors(self.grid.grid)
+            self.discard_trace()  # Also stops a search that is still running
+            self.maze_stream = None  # Freeze the grid while searching
+            self.grid.update_valid_neighbors(self.movement)
+
+            # Record the search so it can be replayed, the grid already shows all of its events afterwards
+            self.trace = SearchTrace(self.grid.cols, self.grid.rows)
+            self.replay_budget = 0
+
+            # The search runs on a worker thread, the main loop shows its events as they come in
+            self.algorithm.track_memory = self.track_memory
+            self.search_worker = SearchWorker(self.algorithm, self.start_cell, self.end_cell).start()
+            self.update_search_prompt()
+
+    def advance_search(self):
+        # Applies the events the search has made so far, at most replay speed events per frame
+        for kind, index in self.search_worker.drain(self.next_replay_steps()):
+            self.grid.apply_trace_event(kind, index)
+            self.trace.record(kind, index)
+        self.replay_position = len(self.trace)
+
+        if self.search_worker.finished:
+            self.finish_search()
+
+    def finish_search(self):
+        worker = self.search_worker
+        self.search_worker = None
+        if worker.error:
+            # The search crashed, the app carries on: the grid keeps the events shown so far and can be cleared
+            traceback.print_exception(worker.error)
+            self.prompt = f"{worker.algorithm.name} failed: {worker.error!r}. Clear Path to try again."
+            self.buttons["Prompt"].update_text(self.prompt)
+            return
+
+        # Update the prompt text with pathfinding details, the metrics hold nodes visited, path length and the search counters
+        self.last_metrics = worker.metrics
+        self.prompt = self.last_metrics.summary()
+        self.buttons["Prompt"].update_text(self.prompt)  # Update the button with the new prompt text
+        print("Pathfinding completed.")
 
-            # Find the path and get nodes visited and path length
-            nodes_visited, path_length = self.algorithm.find_path(self.start_cell, self.end_cell, self.draw_grid)
+    # Stops a running search, or a race and its view
+    def cancel_search(self):
+        if self.search_worker:
+            self.search_worker.cancel()
+            self.search_worker = None
+        if self.race:
+            self.race.cancel()
+            self.race = None
+            self.grid.drawn_grid = False  # Clears the leaderboard from around the grid
+
+    def grid_in_use(self):
+        return self.search_worker is not None or self.race is not None
+
+    def start_race(self):
+        if not self.start_cell or not self.end_cell:
+            print("Select starting and ending point!")
+            return
 
-            if path_length > 0:
-                # Update the prompt text with pathfinding details
-                self.prompt = f"Nodes Visited: {nodes_visited} Path Length: {path_length}"
-                self.buttons["Prompt"].update_text(self.prompt)  # Update the button with the new prompt text
+        # Every algorithm runs on its own thread and reads the same grid, which is left as it is
+        self.discard_trace()
+        self.maze_stream = None
+        self.grid.clear_path()
+        self.grid.update_valid_neighbors(self.movement)
+        self.replay_budget = 0
+        self.race = Race(self.grid, self.heuristic, self.start_cell, self.end_cell, self.race_algorithms).start()
+        self.prompt = f"Racing {len(self.race.lanes)} algorithms, up/down arrows change the speed."
+        self.buttons["Prompt"].update_text(self.prompt)
+
+    def toggle_race_lane(self, name):
+        if name not in self.race_algorithms:
+            self.race_algorithms = [algorithm for algorithm in ALGORITHMS if algorithm in self.race_algorithms or algorithm == name]
+        elif len(self.race_algorithms) > 1:
+            self.race_algorithms.remove(name)
+        self.prompt = f"Race: {', '.join(self.race_algorithms)}. Shift-click an algorithm to add or remove it."
+        self.buttons["Prompt"].update_text(self.prompt)
+
+    def advance_race(self):
+        self.race.advance(self.next_replay_steps())
+        if self.race.finished:
+            winner = self.race.leaderboard()[0].worker.metrics
+            if winner is None:
+                self.prompt = "Every search failed! Clear Path to go back to the grid."
+            elif winner.found:
+                self.prompt = f"{winner.algorithm} wins in {winner.total_time * 1000:.1f} ms, {winner.expansions} nodes visited. Clear Path to go back to the grid."
             else:
-                # Update prompt text to indicate path not found
-                self.prompt = f"No path found! Nodes Visited: {nodes_visited}"
-                self.buttons["Prompt"].update_text(self.prompt)
+                self.prompt = "No path found! Clear Path to go back to the grid."
+            self.buttons["Prompt"].update_text(self.prompt)
 
-        print("Pathfinding completed.")
+    def update_search_prompt(self):
+        self.prompt = f"Searching with {self.algorithm.name}: {self.replay_position} events shown, {self.replay_speed:g} events per frame."
+        self.buttons["Prompt"].update_text(self.prompt)
         
     def clear_path(self):
+        self.cancel_search()
         self.grid.clear_path()
         print("Path cleared. Start, end, and barriers remain.")
         self.prompt = "Nodes Visited:  Path Length: "
 
+        # The trace is kept, the replay starts over on the cleared grid
+        self.replay_playing = False
+        self.replay_events = None
+        self.replay_position = 0
+
     def reset_grid(self):
+        self.maze_stream = None
+        self.discard_trace()
         self.grid = Grid()
         self.start_cell = None
         self.end_cell = None
         self.algorithm = self.get_algorithm_by_name(self.selected_algorithm)
         self.prompt = "Nodes Visited:  Path Length: "
 
-    def start_maze_generation(self, maze_algorithm):
+    def save_map(self):
+        self.grid.to_map().save(MAP_FILE)
+        print(f"Grid saved to {MAP_FILE}.")
+        self.prompt = f"Grid saved to {MAP_FILE}."
+        self.buttons["Prompt"].update_text(self.prompt)
+
+    def load_map(self):
+        self.cancel_search()
+        try:
+            with GridMap.load(MAP_FILE) as grid_map:
+                self.grid.load_map(grid_map)
+        except (OSError, ValueError) as error:
+            print(f"Could not load {MAP_FILE}: {error}")
+            return
+
+        self.start_cell = None
+        self.end_cell = None
+        self.discard_trace()
+        print(f"Grid loaded from {MAP_FILE}.")
+        self.prompt = f"Grid loaded from {MAP_FILE}."
+        self.buttons["Prompt"].update_text(self.prompt)
+
+    def toggle_maze_stream(self):
+        if self.maze_stream:
+            self.maze_stream = None
+            return
+
+        # The start and end cells would scroll off the grid, so they are cleared
+        self.discard_trace()
+        self.grid.clear_grid()
+        self.start_cell = None
+        self.end_cell = None
+        self.maze_seed = self.next_maze_seed()
+        self.maze_stream = Eller(self.grid.cols, None, self.maze_seed).generate_rows()
+        self.prompt = f"Endless Eller maze. Seed: {self.maze_seed}"
+        self.buttons["Prompt"].update_text(self.prompt)
+
+    def toggle_memory_tracking(self):
+        self.track_memory = not self.track_memory
+        self.prompt = "Peak memory is measured from the next search, searches run much slower." if self.track_memory else "Peak memory is no longer measured."
+        self.buttons["Prompt"].update_text(self.prompt)
+
+    def start_maze_generation(self, maze_algorithm, seed=None):
+        self.maze_stream = None
+        self.discard_trace()
         self.start_cell = None
         self.end_cell = None  
-        self.grid.generate_maze(self.window, maze_algorithm)
+        self.grid.generate_maze(self.window, maze_algorithm, seed)
+
+    def next_maze_seed(self):
+        # Without a seed from the command line each maze gets a fresh one, shown in the prompt
+        return self.seed if self.seed is not None else random.randrange(2 ** 32)
+
+    def toggle_replay(self):
+        if self.grid_in_use():
+            return
+        if self.trace is None:
+            self.prompt = "Run a search first, or press 'T' to load a trace."
+            self.buttons["Prompt"].update_text(self.prompt)
+            return
+
+        if self.replay_position >= len(self.trace):
+            self.seek_replay(0)  # Start over from the beginning
+        self.replay_playing = not self.replay_playing
+        self.update_replay_prompt()
+
+    def advance_replay(self):
+        self.seek_replay(self.replay_position + self.next_replay_steps())
+        if self.replay_position >= len(self.trace):
+            self.replay_playing = False
+            self.update_replay_prompt()
+
+    def seek_replay(self, position):
+        if self.trace is None or self.grid_in_use():
+            return
+
+        # The replay only moves forward through the events, going back rebuilds the grid from the start
+        position = max(0, min(position, len(self.trace)))
+        if position < self.replay_position or self.replay_events is None:
+            self.grid.clear_path()
+            self.replay_events = iter(self.trace)
+            self.replay_position = 0
+
+        for kind, index in islice(self.replay_events, position - self.replay_position):
+            self.grid.apply_trace_event(kind, index)
+        self.replay_position = position
+        self.update_replay_prompt()
+
+    # Number of events to show this frame, slow speeds carry the fraction of an event over to the next frame
+    def next_replay_steps(self):
+        self.replay_budget += self.replay_speed
+        steps = int(self.replay_budget)
+        self.replay_budget -= steps
+        return steps
+
+    def replay_scrub_step(self):
+        return max(1, int(self.replay_speed * REPLAY_SCRUB_FRAMES))
+
+    def change_replay_speed(self, factor):
+        self.replay_speed = max(REPLAY_MIN_SPEED, min(REPLAY_MAX_SPEED, self.replay_speed * factor))
+        self.replay_budget = 0
+        if self.search_worker:
+            self.update_search_prompt()
+        elif self.trace is not None:
+            self.update_replay_prompt()
+
+    def update_replay_prompt(self):
+        state = "Playing" if self.replay_playing else "Paused"
+        self.prompt = f"{state} replay: event {self.replay_position} of {len(self.trace)}, {self.replay_speed:g} events per frame."
+        self.buttons["Prompt"].update_text(self.prompt)
+
+    def discard_trace(self):
+        self.cancel_search()  # A running search would keep adding to the trace
+        self.trace = None
+        self.replay_events = None
+        self.replay_position = 0
+        self.replay_playing = False
+
+    def export_metrics(self):
+        if self.last_metrics is None:
+            return
+
+        self.last_metrics.save(METRICS_FILE)
+        print(f"Metrics saved to {METRICS_FILE}.")
+        self.prompt = f"Metrics of the {self.last_metrics.algorithm} search saved to {METRICS_FILE}."
+        self.buttons["Prompt"].update_text(self.prompt)
+
+    def export_trace(self):
+        if self.trace is None:
+            return
+
+        self.trace.save(TRACE_FILE)
+        print(f"Trace saved to {TRACE_FILE}.")
+        self.prompt = f"Trace of {len(self.trace)} events saved to {TRACE_FILE}."
+        self.buttons["Prompt"].update_text(self.prompt)
+
+    def load_trace(self):
+        # Read lazily, a block at a time, big traces never have to fit in memory
+        try:
+            trace = TraceReader(TRACE_FILE)
+        except (OSError, ValueError) as error:
+            print(f"Could not load {TRACE_FILE}: {error}")
+            return
+
+        if (trace.cols, trace.rows) != (self.grid.cols, self.grid.rows):
+            self.prompt = f"{TRACE_FILE} was recorded on a {trace.cols}x{trace.rows} grid."
+            self.buttons["Prompt"].update_text(self.prompt)
+            return
+
+        # Replays on top of the current barriers, load the matching map with 'L' first
+        self.discard_trace()
+        self.maze_stream = None
+        self.trace = trace
+        self.seek_replay(0)
 
     def go_to_main_menu(self):
+        self.cancel_search()
         print("Going back to the main menu...")
         return WELCOME_MENU
 
     def go_to_algo_details(self):
+        self.cancel_search()
         print("Going to the algorithm details page...")
         return PATHFINDER_DETAILS_MENU
 
     def go_to_instructions(self):
+        self.cancel_search()
         print("Going to the instructions page...")
         return PATHFINDER_INSTRUCTIONS_MENU
     
     def draw_grid(self):
-        self.grid.draw_grid(self.visualizer_grid_area)
+        if self.race:
+            self.race.draw(self.visualizer_grid_area)
+        else:
+            self.grid.draw_grid(self.visualizer_grid_area)
         self.window.blit(self.visualizer_grid_area, (0, 0))
         pygame.display.update()
 
@@ -467,9 +637,8 @@ class PathfindingVisualizer:
 
         draw_text(self.visualizer_menu_area, font_title, "Algo Assist - Pathfinder Visualizer", COLORS['LIGHT_CREAM'], 25, center_x=text_center_x)
         # Draw mini titles for each section
-        draw_text(self.visualizer_menu_area, mini_title_font, "Pathfinding Algorithms", COLORS['LIGHT_CREAM'], 120, center_x=text_center_x)
-        draw_text(self.visualizer_menu_area, mini_title_font, "Heuristics", COLORS['LIGHT_CREAM'], 260, center_x=text_center_x)
-        draw_text(self.visualizer_menu_area, mini_title_font, "Maze Generation Algorithms", COLORS['LIGHT_CREAM'], 400, center_x=text_center_x)
+        for title, y in self.section_titles:
+            draw_text(self.visualizer_menu_area, mini_title_font, title, COLORS['LIGHT_CREAM'], y, center_x=text_center_x)
 
         # Draw all buttons
         for button in self.buttons.values():
@@ -481,15 +650,29 @@ class PathfindingVisualizer:
         self.window.blit(self.visualizer_menu_area, (WINDOW_WIDTH - VISUALIZER_MENU_WIDTH, 0))
 
     def get_algorithm_by_name(self, name):
-        algorithms = {
-            "A*": AStarAlgorithm(self.grid.grid, self.heuristic),
-            "Bi-A*": BiAStarAlgorithm(self.grid.grid, self.heuristic),
-            "BFS": BFSAlgorithm(self.grid.grid),
-            "DFS": DFSAlgorithm(self.grid.grid),
-            "GBFS": GBFSAlgorithm(self.grid.grid, self.heuristic),
-            "JPS": JPSAlgorithm(self.grid.grid, self.heuristic)
-        }
-        return algorithms.get(name)
+        if name not in ALGORITHMS:
+            return None
+        algorithm = create_algorithm(name, self.grid.grid, self.heuristic)
+        if isinstance(algorithm, AStarAlgorithm):
+            algorithm.tie_breaking = self.tie_breaking
+        algorithm.movement = self.movement
+        return algorithm
+
+    def cycle_tie_breaking(self):
+        policies = list(TIE_BREAKING)
+        self.tie_breaking = policies[(policies.index(self.tie_breaking) + 1) % len(policies)]
+        self.algorithm = self.get_algorithm_by_name(self.selected_algorithm)
+        self.buttons["Tie Breaking"].update_text(f"A* Ties: {self.tie_breaking}")
+        self.prompt = f"A* tie breaking: {self.tie_breaking}. {TIE_BREAKING[self.tie_breaking]}"
+        self.buttons["Prompt"].update_text(self.prompt)
+
+    def cycle_movement(self):
+        movements = list(MOVEMENTS)
+        self.movement = movements[(movements.index(self.movement) + 1) % len(movements)]
+        self.algorithm = self.get_algorithm_by_name(self.selected_algorithm)
+        self.buttons["Movement"].update_text(f"Moves: {self.movement}")
+        self.prompt = f"{self.movement} movement: {MOVEMENTS[self.movement]}"
+        self.buttons["Prompt"].update_text(self.prompt)
 
     def is_within_grid(self, mouse_pos):
         x, y = mouse_pos
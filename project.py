@@ -1,3 +1,4 @@
+import argparse
 import pygame
 from pages import *
 
@@ -5,17 +6,24 @@ WINDOW_WIDTH, WINDOW_HEIGHT = 1060, 720
 
 def main():
     """Main function to run the AlgoAssist program."""
+    args = parse_arguments()
     screen = initialize_pygame()
     current_menu = WELCOME_MENU
     running = True
 
     while running:
-        current_menu = switch_menu(current_menu, screen)
+        current_menu = switch_menu(current_menu, screen, args.seed)
         handle_events(screen, current_menu)
         pygame.display.update()
 
     pygame.quit()
 
+def parse_arguments(args=None):
+    """Parses the command line options."""
+    parser = argparse.ArgumentParser(description="AlgoAssist, a sorting and pathfinding algorithm visualizer.")
+    parser.add_argument("--seed", type=int, help="seed for the generated lists and mazes, the same seed gives the same inputs")
+    return parser.parse_args(args)
+
 def initialize_pygame():
     """Initializes pygame and sets up the display window."""
     pygame.init()
@@ -23,14 +31,14 @@ def initialize_pygame():
     pygame.display.set_caption("AlgoAssist")
     return screen
 
-def switch_menu(current_menu, screen):
+def switch_menu(current_menu, screen, seed=None):
     """Switches between different menus based on user input."""
     if current_menu == WELCOME_MENU:
         return main_menu(screen)
     elif current_menu == PATHFINDER_MENU:
-        return pathfinder_menu(screen)
+        return pathfinder_menu(screen, seed)
     elif current_menu == SORTING_MENU:
-        return sorting_menu(screen)
+        return sorting_menu(screen, seed)
     elif current_menu == PATHFINDER_DETAILS_MENU:
         return pathfinder_details_menu(screen)
     elif current_menu == PATHFINDER_INSTRUCTIONS_MENU:
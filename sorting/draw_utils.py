@@ -15,6 +15,9 @@ def draw_list(visualizer, color_positions=None, persistent_colors=None, comparis
     Also displays the number of comparisons, array accesses, swaps, and the height (value) of each element under the bar
     if the array size is 30 or less.
     """
+    if visualizer.window is None:
+        return persistent_colors  # Headless runs only count, there's nothing to draw on
+
     if color_positions is None:
         color_positions = {}
     if persistent_colors is None:
@@ -98,6 +101,10 @@ def draw_title(visualizer):
     )
     visualizer.window.blit(title, (SORTING_VISUALISER_START_X + 15, SORTING_SECTION_MARGIN * 2))  # Adjusted y position
 
+    # Seed of the current list under the title, so the run can be reproduced with --seed
+    seed_text = visualizer.FONT.render(f"Seed: {visualizer.state.seed}", True, visualizer.TEXT_COLOR)
+    visualizer.window.blit(seed_text, (SORTING_VISUALISER_START_X + 15, SORTING_SECTION_MARGIN * 2 + title.get_height()))
+
 def draw_size_speed(visualizer):
     """Draws the number of comparisons, array accesses, and swaps with a fixed left alignment above the bars."""
     text_y_position = SORTING_SECTION_MARGIN * 2 - 5 # Adjust this value to move the text just above the bars
@@ -0,0 +1,55 @@
+import time
+from .constants import LIST_MIN, LIST_MAX
+from .helpers import generate_starting_list
+from .sorting_algorithms import SORTING_ALGORITHMS, start_sort
+
+class HeadlessVisualization:
+    """Stands in for the SortingVisualizer when nothing is drawn: the sorts still set their colors,
+    and draw_list skips drawing since there's no window."""
+
+    SORTED_COLOR = "sorted"
+    COMPARISON_COLOR = "comparison"
+    PRIMARY_ACTIVE_COLOR = "primary"
+    SECONDARY_ACTIVE_COLOR = "secondary"
+    BAR_COLOR = "bar"
+
+    def __init__(self, lst):
+        self.lst = lst
+        self.window = None
+
+    def get_color_for_depth(self, depth):
+        return depth
+
+def run_sort(algorithm_name, lst, ascending=True, seed=None):
+    """Sorts lst in place without drawing anything, the seed drives the random choices of Quick Sort and Bogo Sort.
+    Returns the final counters (comparisons, array accesses, and swaps for the sorts that count them),
+    the number of steps the visualizer would have drawn, and the time taken."""
+    visualization = HeadlessVisualization(lst)
+    persistent_colors = {i: visualization.BAR_COLOR for i in range(len(lst))}
+    generator = start_sort(SORTING_ALGORITHMS[algorithm_name], lst, visualization, persistent_colors, ascending, seed)
+
+    counters, steps = (), 0
+    start_time = time.perf_counter()
+    while True:
+        try:
+            counters = next(generator)
+        except StopIteration as stop:
+            counters = stop.value or counters  # The recursive sorts return their totals
+            break
+        steps += 1
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        "algorithm": algorithm_name,
+        "size": len(lst),
+        "comparisons": counters[0] if counters else 0,
+        "array_accesses": counters[1] if counters else 0,
+        "swaps": counters[2] if len(counters) > 2 else None,
+        "steps": steps,
+        "time": elapsed,
+        "sorted": lst == sorted(lst, reverse=not ascending),
+    }
+
+def run_generated_sort(algorithm_name, size, seed=None, ascending=True):
+    """Runs a sort on a generated list, the same seed and size always give the same list and the same counters."""
+    return run_sort(algorithm_name, generate_starting_list(size, LIST_MIN, LIST_MAX, seed, verbose=False), ascending, seed)
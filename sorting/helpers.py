@@ -8,15 +8,18 @@ from menu_states import *
 from algorithms_info import *
 
 # Utility Functions
-def generate_starting_list(n, min_val, max_val):
-    """Generates a list of random integers between min_val and max_val and prints the array."""
-    lst = [random.randint(min_val, max_val) for _ in range(n)]
-    print(f"Generated array: {lst}")
+def generate_starting_list(n, min_val, max_val, seed=None, verbose=True):
+    """Generates a list of random integers between min_val and max_val and prints the array (unless verbose is off).
+    The seed can be an int or a random.Random instance, the same seed always gives the same list."""
+    rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+    lst = [rng.randint(min_val, max_val) for _ in range(n)]
+    if verbose:
+        print(f"Generated array: {lst}")
     return lst
 
 def reset_list(visualizer):
     """Resets the list in the visualizer with a new randomly generated list."""
-    lst = generate_starting_list(visualizer.state.size, LIST_MIN, LIST_MAX)
+    lst = generate_starting_list(visualizer.state.size, LIST_MIN, LIST_MAX, visualizer.state.seed)
     visualizer.set_list(lst)
     visualizer.state.step_mode = False # Reset to regular mode
 
@@ -34,11 +37,13 @@ def initialize_sorting_algorithm(visualizer):
     # Initialize persistent_colors if it's not already or if the list size changed
     visualizer.state.persistent_colors = {i: visualizer.BAR_COLOR for i in range(len(visualizer.lst))}
     
-    generator = visualizer.state.sorting_algorithm(
+    generator = start_sort(
+        visualizer.state.sorting_algorithm,
         visualizer.lst,
         visualizer,
         visualizer.state.persistent_colors,
-        visualizer.state.ascending
+        visualizer.state.ascending,
+        visualizer.state.seed
     )
     
     return generator
@@ -46,6 +51,9 @@ def initialize_sorting_algorithm(visualizer):
 # Action Functions
 def reset_action(visualizer):
     """Resets the list and reinitializes the sorting algorithm."""
+    # A new list needs a new seed, unless the seed was given on the command line
+    if not visualizer.state.fixed_seed:
+        visualizer.state.seed = random.randrange(2 ** 32)
     reset_list(visualizer)
     
     visualizer.state.sorting_algorithm_generator = initialize_sorting_algorithm(visualizer)
@@ -5,13 +5,14 @@ from ui import *
 from .constants import *
 from .visualizer import initialize_sorting_visualizer
 
-def launch_visualizer():
+def launch_visualizer(seed=None):
     # Initialize visualization settings and state
     visualizer = initialize_sorting_visualizer(
         size=LIST_MIN_SIZE, 
         speed=MIN_SPEED, 
         sorting_algorithm=bubble_sort, 
-        sorting_algo_name="Bubble Sort"
+        sorting_algo_name="Bubble Sort",
+        seed=seed
     )
 
     return visualizer.run(visualizer)
@@ -484,7 +484,7 @@ def merge_sort(lst, visualization, persistent_colors=None, ascending=True, left=
 
     return comparisons, array_accesses
 
-def quick_sort(lst, visualization, persistent_colors=None, ascending=True, left=0, right=None, comparisons=0, array_accesses=0):
+def quick_sort(lst, visualization, persistent_colors=None, ascending=True, left=0, right=None, comparisons=0, array_accesses=0, rng=None):
     """
     Quick sort with detailed visualization.
 
@@ -516,6 +516,7 @@ def quick_sort(lst, visualization, persistent_colors=None, ascending=True, left=
     - right: The ending index of the subarray (default is None, which means the full array).
     - comparisons: The running total of comparisons made so far.
     - array_accesses: The running total of array accesses made so far.
+    - rng: The random.Random the pivots are drawn from (default is the global random module).
 
     Yields:
     - comparisons: The updated number of comparisons after each significant step.
@@ -527,13 +528,15 @@ def quick_sort(lst, visualization, persistent_colors=None, ascending=True, left=
 
     if right is None:
         right = len(lst) - 1
+    if rng is None:
+        rng = random
 
     # Only proceed if the subarray has more than one element
     if left < right:
         # Initialize boundaries and the pivot
         i = left
         j = right - 1
-        pivot_index = random.randint(left, right)
+        pivot_index = rng.randint(left, right)
 
         # Highlight the pivot before swapping
         persistent_colors[pivot_index] = visualization.PRIMARY_ACTIVE_COLOR
@@ -682,8 +685,8 @@ def quick_sort(lst, visualization, persistent_colors=None, ascending=True, left=
         persistent_colors[pivot_index] = visualization.BAR_COLOR
 
         # Recursive calls to sort the subarrays
-        comparisons, array_accesses = yield from quick_sort(lst, visualization, persistent_colors, ascending, left, i - 1, comparisons, array_accesses)
-        comparisons, array_accesses = yield from quick_sort(lst, visualization, persistent_colors, ascending, i + 1, right, comparisons, array_accesses)
+        comparisons, array_accesses = yield from quick_sort(lst, visualization, persistent_colors, ascending, left, i - 1, comparisons, array_accesses, rng)
+        comparisons, array_accesses = yield from quick_sort(lst, visualization, persistent_colors, ascending, i + 1, right, comparisons, array_accesses, rng)
 
     # Final pass to mark all elements as sorted
     if left == 0 and right == len(lst) - 1:
@@ -1581,7 +1584,7 @@ def comb_sort(lst, visualization, persistent_colors, ascending=True):
         draw_list(visualization, persistent_colors=persistent_colors, comparisons=comparisons, array_accesses=array_accesses, swaps=swaps)
         yield comparisons, array_accesses, swaps
 
-def bogo_sort(lst, visualization, persistent_colors, ascending=True):
+def bogo_sort(lst, visualization, persistent_colors, ascending=True, rng=None):
     """
     Bogo Sort with detailed visualization.
     Bogo Sort is an extremely inefficient sorting algorithm that generates random permutations of the list
@@ -1604,11 +1607,14 @@ def bogo_sort(lst, visualization, persistent_colors, ascending=True):
     visualization -- the visualization object to handle drawing.
     persistent_colors -- a dictionary to track the colors of each element in the visualization.
     ascending -- whether to sort the list in ascending order (default is True).
+    rng -- the random.Random the shuffles are drawn from (default is the global random module).
 
     Returns:
     Yields comparisons and array_accesses for each step of the visualization.
     """
 
+    if rng is None:
+        rng = random
     comparisons = 0
     array_accesses = 0
 
@@ -1634,7 +1640,7 @@ def bogo_sort(lst, visualization, persistent_colors, ascending=True):
         yield comparisons, array_accesses
 
         # Randomly shuffle the list
-        random.shuffle(lst)
+        rng.shuffle(lst)
         array_accesses += len(lst)  # Shuffling involves accessing each element once
 
         # Revert the colors after checking the permutation
@@ -1649,4 +1655,28 @@ def bogo_sort(lst, visualization, persistent_colors, ascending=True):
     draw_list(visualization, persistent_colors=persistent_colors, comparisons=comparisons, array_accesses=array_accesses)
     yield comparisons, array_accesses
 
-
+# Sorting algorithms by the name used in the menu
+SORTING_ALGORITHMS = {
+    "Bubble Sort": bubble_sort,
+    "Insertion Sort": insertion_sort,
+    "Selection Sort": selection_sort,
+    "Cocktail Shaker Sort": cocktail_shaker_sort,
+    "Comb Sort": comb_sort,
+    "Shell Sort": shell_sort,
+    "Merge Sort": merge_sort,
+    "Quick Sort": quick_sort,
+    "Tim Sort": tim_sort,
+    "Heap Sort": heap_sort,
+    "Tree Sort": tree_sort,
+    "Bogo Sort": bogo_sort,
+}
+
+# Sorts that make random choices (pivots, shuffles), they take an rng so seeded runs repeat exactly
+RANDOMIZED_SORTS = {quick_sort, bogo_sort}
+
+def start_sort(sorting_algorithm, lst, visualization, persistent_colors, ascending=True, seed=None):
+    """Creates the generator of a sort. Randomized sorts get a random.Random from the seed,
+    so the same seed and list always give the same steps and counters."""
+    if sorting_algorithm in RANDOMIZED_SORTS:
+        return sorting_algorithm(lst, visualization, persistent_colors, ascending, rng=random.Random(seed))
+    return sorting_algorithm(lst, visualization, persistent_colors, ascending)
@@ -1,5 +1,6 @@
 import pygame
 import math
+import random
 from dataclasses import dataclass
 from .sorting_algorithms import *
 from .helpers import *
@@ -433,10 +434,14 @@ class SortingState:
     size: int
     step_mode: bool = False
     persistent_colors: dict = None 
-
-def initialize_sorting_visualizer(size, speed, sorting_algorithm, sorting_algo_name):
-    "Initializes and returns the sorting visualizer and its state."
-    lst = generate_starting_list(size, LIST_MIN, LIST_MAX)
+    seed: int = None  # Seed of the current list, the same seed and size always give the same list
+    fixed_seed: bool = False  # Set when the seed comes from the command line, resets then keep it
+
+def initialize_sorting_visualizer(size, speed, sorting_algorithm, sorting_algo_name, seed=None, verbose=True):
+    "Initializes and returns the sorting visualizer and its state, verbose prints the generated list."
+    fixed_seed = seed is not None
+    seed = seed if fixed_seed else random.randrange(2 ** 32)
+    lst = generate_starting_list(size, LIST_MIN, LIST_MAX, seed, verbose)
     state = SortingState(
         sorting=False,
         sorting_algorithm_generator=None,
@@ -447,6 +452,8 @@ def initialize_sorting_visualizer(size, speed, sorting_algorithm, sorting_algo_n
         size=size,
         step_mode=False,
         persistent_colors=None,
+        seed=seed,
+        fixed_seed=fixed_seed,
     )
     visualizer = SortingVisualizer(WINDOW_WIDTH, WINDOW_HEIGHT, lst, state)
     
@@ -1,5 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import urllib.error
+import urllib.request
 import pygame
-from project import initialize_pygame, handle_events
+import pytest
+import algoassist
+from export import export_frames, render_search_frames, render_sorting_frames
+from project import initialize_pygame, handle_events, parse_arguments
+from pathfinding.constants import MOVEMENTS, MOVE_4, MOVE_8, MOVE_8_NO_CORNERS, TRACE_FILE
+from pathfinding.graph import CSRGraph, GraphAStar, GraphBFS, GraphDijkstra, GridGraph
+from pathfinding.grid import Grid
+from pathfinding.heuristics import Heuristic
+from pathfinding.map_format import GridMap
+from pathfinding.maze_algorithms import MAZE_ALGORITHMS, MazeAlgorithm, generate_maze_map
+from pathfinding.maze_cache import MazeCache
+from pathfinding.movingai import load_map as load_movingai_map, load_scenarios, run_scenarios, summarize_by_bucket
+from pathfinding.open_lists import BucketQueue, RadixHeap
+from pathfinding.query_server import QueryServer
+from pathfinding.headless import run_search
+from pathfinding.pathfinding_algorithms import ALGORITHMS, TIE_BREAKING, AStarAlgorithm, ARAStarAlgorithm, IDAStarAlgorithm, SMAStarAlgorithm, create_algorithm
+from pathfinding.race import Race
+from pathfinding.search_worker import SearchWorker
+from pathfinding.shared_grid import QueryPool, SharedGrid
+from pathfinding.trace import TRACE_BLOCK_EVENTS, SearchTrace, TraceReader
+from pathfinding.visualizer import PathfindingVisualizer
+from sorting.headless import run_generated_sort
+from sorting.helpers import generate_starting_list
 
 def test_initialize_pygame():
     """Test if Pygame is initialized and screen is created."""
@@ -21,3 +50,439 @@ def test_handle_events_no_quit():
     pygame.event.post(test_event)
     assert handle_events(screen, "WELCOME_MENU") == True, "Handle events should return True if no QUIT event."
 
+
+def test_grid_map_round_trip(tmp_path):
+    """Test if a saved map loads back with the same barriers and costs."""
+    grid_map = GridMap(13, 5)
+    grid_map.set_blocked(12, 4)
+    grid_map.set_cost(3, 2, 7)
+    grid_map.save(tmp_path / "test.aamap")
+
+    with GridMap.load(tmp_path / "test.aamap") as loaded:
+        assert (loaded.width, loaded.height) == (13, 5)
+        assert loaded.is_blocked(12, 4) and not loaded.is_blocked(11, 4)
+        assert loaded.get_cost(3, 2) == 7
+
+def test_movingai_scenarios_are_checked_against_their_optimal_lengths(tmp_path):
+    """Test if MovingAI maps and scenarios load, and the summary counts optimal and too short paths."""
+    # Trees (T), water (W) and out of bounds (@) are barriers, the extra column past the width is ignored
+    (tmp_path / "tiny.map").write_text("type octile\nheight 4\nwidth 5\nmap\n.....T\n.T...\n.W@.S\nG....\n")
+    (tmp_path / "tiny.scen").write_text("version 1\n" + "".join(
+        f"{bucket}\ttiny.map\t5\t4\t{start[0]}\t{start[1]}\t{goal[0]}\t{goal[1]}\t{optimal}\n"
+        for bucket, start, goal, optimal in [
+            (0, (0, 0), (2, 1), 3),  # 2.41 with corner cutting, 3 without
+            (0, (0, 0), (4, 3), 5.82842712),
+            (1, (0, 3), (4, 0), 6.41421356),
+            (1, (0, 3), (4, 0), 7),  # A wrong published length, the search beats it
+        ]))
+
+    grid_map = load_movingai_map(tmp_path / "tiny.map")
+    blocked = [(col, row) for row in range(4) for col in range(5) if grid_map.is_blocked(col, row)]
+    assert (grid_map.width, grid_map.height) == (5, 4) and blocked == [(1, 1), (1, 2), (2, 2)]
+
+    scenarios = load_scenarios(tmp_path / "tiny.scen")
+    assert len(scenarios) == 4
+    assert (scenarios[1].bucket, scenarios[1].map_name, scenarios[1].start, scenarios[1].goal) == (0, "tiny.map", (0, 0), (4, 3))
+
+    results = run_scenarios(grid_map, scenarios, "A*", Heuristic.octile)
+    assert all(result.elapsed == result.metrics.phase_times["search"] for result in results), "only the search is timed"
+    summary = summarize_by_bucket(results)
+    assert (summary[0]["scenarios"], summary[0]["optimal"], summary[0]["too_short"]) == (2, 2, 0)
+    assert (summary[1]["scenarios"], summary[1]["optimal"], summary[1]["too_short"], summary[1]["not_found"]) == (2, 1, 1, 0)
+
+    for text in ("type octile\nheight 4\nwidth 5\n", "type octile\nheight 4\nmap\n.....\n", "height 4\nwidth 5\nmap\n.....\n"):
+        (tmp_path / "broken.map").write_text(text)
+        with pytest.raises(ValueError):
+            load_movingai_map(tmp_path / "broken.map")
+
+def test_generated_mazes_are_perfect():
+    """Test if every maze generator carves a spanning tree over the odd cells."""
+    with pytest.raises(TypeError):
+        type("NoGenerate", (MazeAlgorithm,), {})(21, 21)  # A generator has to implement generate
+    for name in MAZE_ALGORITHMS:
+        grid_map = generate_maze_map(name, 41, 21)
+        open_cells = {(col, row) for row in range(21) for col in range(41) if not grid_map.is_blocked(col, row)}
+        assert len(open_cells) == 2 * 20 * 10 - 1, f"{name} should carve a tree"
+
+        reached, stack = {(1, 1)}, [(1, 1)]
+        while stack:
+            col, row = stack.pop()
+            for neighbor in ((col + 1, row), (col - 1, row), (col, row + 1), (col, row - 1)):
+                if neighbor in open_cells and neighbor not in reached:
+                    reached.add(neighbor)
+                    stack.append(neighbor)
+        assert reached == open_cells, f"{name} should connect every open cell"
+
+def test_seeded_generation_is_reproducible():
+    """Test if the same seed always gives the same maze and the same list."""
+    for name in MAZE_ALGORITHMS:
+        assert generate_maze_map(name, 41, 21, seed=7).bits == generate_maze_map(name, 41, 21, seed=7).bits, f"{name} should follow its seed"
+        # The animated maze (generate) is the headless one for the same seed, which is vectorized for Binary
+        # Tree and Sidewinder, so with or without NumPy a seed gives the same maze
+        for cols, rows in ((21, 21), (40, 15)):
+            carved = set(MAZE_ALGORITHMS[name](cols, rows, seed=3).generate())
+            headless = generate_maze_map(name, cols, rows, seed=3)
+            assert carved == {(col, row) for row in range(rows) for col in range(cols) if not headless.is_blocked(col, row)}, f"{name} should draw the maze of its seed"
+    assert generate_starting_list(50, 1, 100, seed=7) == generate_starting_list(50, 1, 100, seed=7)
+    for name in ("Quick Sort", "Bogo Sort"):
+        counters = [(run["comparisons"], run["array_accesses"], run["steps"]) for run in (run_generated_sort(name, 6, seed=7) for _ in range(2))]
+        assert counters[0] == counters[1], f"{name} should follow its seed"
+    assert parse_arguments(["--seed", "7"]).seed == 7
+
+def test_maze_cache_reuses_and_evicts(tmp_path):
+    """Test if cached mazes come back unchanged and old ones are evicted past the size limit."""
+    cache = MazeCache(tmp_path, max_bytes=1000)
+    first = cache.get_or_generate("Kruskal", 41, 21, seed=1)
+    assert cache.get("Kruskal", 41, 21, 1).bits == first.bits == generate_maze_map("Kruskal", 41, 21, seed=1).bits
+
+    for seed in range(2, 20):
+        cache.get_or_generate("Kruskal", 41, 21, seed)
+    assert cache.get("Kruskal", 41, 21, 1) is None, "the oldest maze should have been evicted"
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= 1000
+
+def test_search_trace_replays_the_search(tmp_path):
+    """Test if replaying a saved trace recolors the grid exactly like the search did."""
+    grid = Grid.from_map(generate_maze_map("RecursiveDFS", 21, 21, seed=3))
+    grid.update_valid_neighbors()
+    algorithm = create_algorithm("A*", grid.grid, Heuristic.manhattan)
+    algorithm.verbose = False
+    algorithm.trace = SearchTrace(grid.cols, grid.rows)
+    algorithm.find_path(grid.grid[1][1], grid.grid[19][19], lambda: None)
+    searched = [cell.color for row in grid.grid for cell in row]
+
+    algorithm.trace.save(tmp_path / "test.aatrace", compress=False)
+    assert (tmp_path / "test.aatrace").stat().st_size < 3 * len(algorithm.trace), "events should take a few bytes each"
+
+    grid.clear_search()
+    for kind, index in TraceReader(tmp_path / "test.aatrace"):
+        grid.apply_trace_event(kind, index)
+    assert [cell.color for row in grid.grid for cell in row] == searched
+
+def test_export_search_frames(tmp_path, capsys):
+    """Test if a trace exports one PNG per frame, plus the frame before the first event, and a sort exports quietly."""
+    grid = Grid(5, 5)
+    trace = SearchTrace(5, 5)
+    for index in range(6):
+        trace.record(0, index)
+
+    assert export_frames(render_search_frames(grid, trace, events_per_frame=4), str(tmp_path / "frames"), processes=1) == 3
+    assert sorted(path.name for path in (tmp_path / "frames").iterdir()) == ["frame_000000.png", "frame_000001.png", "frame_000002.png"]
+
+    capsys.readouterr()
+    assert export_frames(render_sorting_frames("Bubble Sort", 5, seed=1), str(tmp_path / "sort"), processes=1, max_frames=3) == 3
+    assert capsys.readouterr().out == "", "a headless export shouldn't print the list"
+
+def test_search_metrics(tmp_path):
+    """Test if every search returns metrics with consistent counters, and saves them as JSON."""
+    grid = Grid.from_map(generate_maze_map("Prim", 41, 41, seed=5))
+    grid.update_valid_neighbors()
+    for name in ALGORITHMS:
+        metrics = run_search(grid, name, (1, 1), (39, 39), track_memory=True)
+        assert metrics.found and metrics.algorithm == name
+        assert 0 < metrics.peak_open <= metrics.pushes and metrics.pops <= metrics.pushes
+        assert metrics.expansions <= metrics.pops and metrics.generated >= metrics.expansions
+        assert metrics.phase_times["search"] > 0 and metrics.memory_peak > 0
+
+    metrics.save(tmp_path / "metrics.json")
+    assert json.loads((tmp_path / "metrics.json").read_text())["path_length"] == metrics.path_length
+
+def test_search_worker_publishes_the_search():
+    """Test if a search on a worker thread leaves the grid alone and publishes the same events as a direct search."""
+    grid = Grid.from_map(generate_maze_map("Wilson", 21, 21, seed=2))
+    grid.update_valid_neighbors()
+    algorithm = create_algorithm("JPS", grid.grid, Heuristic.manhattan)
+    algorithm.verbose = False
+    worker = SearchWorker(algorithm, grid.grid[1][1], grid.grid[19][19]).start()
+    worker.thread.join()
+    assert worker.metrics.found and all(not (cell.is_open() or cell.is_closed()) for row in grid.grid for cell in row)
+
+    trace = SearchTrace(grid.cols, grid.rows)
+    algorithm = create_algorithm("JPS", grid.grid, Heuristic.manhattan)
+    algorithm.verbose = False
+    algorithm.trace = trace
+    algorithm.find_path(grid.grid[1][1], grid.grid[19][19], lambda: None)
+    assert worker.drain(len(trace) + 1) == list(trace)
+    assert worker.finished
+
+def test_failed_search_leaves_the_visualizer_usable(capsys):
+    """Test if a search that raises on its worker shows the error in the prompt instead of crashing the app."""
+    visualizer = PathfindingVisualizer(initialize_pygame())
+    visualizer.trace = SearchTrace(visualizer.grid.cols, visualizer.grid.rows)
+    visualizer.search_worker = SearchWorker(visualizer.algorithm, None, None).start()  # No start cell to search from
+    visualizer.search_worker.thread.join()
+
+    visualizer.advance_search()
+    assert not visualizer.grid_in_use() and "failed" in visualizer.prompt
+    assert "Traceback" in capsys.readouterr().err
+
+def test_loaded_trace_can_be_exported_again(tmp_path, monkeypatch):
+    """Test if a trace loaded from disk by the visualizer exports again, over the file it was read from."""
+    monkeypatch.chdir(tmp_path)
+    visualizer = PathfindingVisualizer(initialize_pygame())
+    trace = SearchTrace(visualizer.grid.cols, visualizer.grid.rows)
+    for index in range(TRACE_BLOCK_EVENTS + 10):  # Spans two blocks
+        trace.record(index % 3, index % (visualizer.grid.cols * visualizer.grid.rows))
+    trace.save(TRACE_FILE)
+
+    visualizer.load_trace()
+    assert isinstance(visualizer.trace, TraceReader)
+    visualizer.export_trace()
+    assert list(SearchTrace.load(TRACE_FILE)) == list(trace)
+    assert os.listdir(tmp_path) == [TRACE_FILE]
+
+def test_race_runs_every_algorithm_on_a_shared_grid():
+    """Test if a race finishes every algorithm in its own lane without recoloring the shared grid."""
+    pygame.init()
+    grid = Grid.from_map(generate_maze_map("Kruskal", 33, 33, seed=4))
+    grid.update_valid_neighbors()
+    start, end = grid.grid[1][1], grid.grid[31][31]
+    start.make_start()
+    end.make_end()
+    states = [cell.state for row in grid.grid for cell in row]
+
+    race = Race(grid, Heuristic.manhattan, start, end).start()
+    for lane in race.lanes:
+        lane.worker.thread.join()
+    race.advance(100000)
+    assert race.finished and [cell.state for row in grid.grid for cell in row] == states
+    assert [lane.name for lane in race.lanes] == list(ALGORITHMS)
+    assert all(lane.metrics.found for lane in race.leaderboard())
+    race.draw(pygame.Surface((720, 720)))
+
+def test_race_lanes_follow_the_selection():
+    """Test if the visualizer races the selected algorithms, the six basic ones by default."""
+    visualizer = PathfindingVisualizer(initialize_pygame())
+    visualizer.start_cell, visualizer.end_cell = visualizer.grid.grid[0][0], visualizer.grid.grid[5][5]
+    visualizer.toggle_race_lane("Theta*")
+    visualizer.toggle_race_lane("BFS")
+    visualizer.start_race()
+    assert [lane.name for lane in visualizer.race.lanes] == ["A*", "Bi-A*", "DFS", "GBFS", "JPS", "Theta*"]
+    visualizer.cancel_search()
+
+    for name in list(visualizer.race_algorithms):
+        visualizer.toggle_race_lane(name)
+    assert visualizer.race_algorithms == ["Theta*"], "the last lane can't be removed"
+
+def test_tie_breaking_cuts_expansions_on_open_grids():
+    """Test if every A* tie-breaking policy finds an optimal path, and the informed ones expand fewer cells on an empty grid."""
+    grid = Grid(41, 41)
+    grid.update_valid_neighbors()
+    expansions = {}
+    for policy in TIE_BREAKING:
+        grid.clear_search()
+        algorithm = AStarAlgorithm(grid.grid, Heuristic.manhattan, policy)
+        algorithm.verbose = False
+        metrics = algorithm.find_path(grid.grid[2][3], grid.grid[37][35], lambda: None)
+        assert metrics.path_length == 67 and metrics.tie_breaking == policy
+        expansions[policy] = metrics.expansions
+    assert max(expansions["High g"], expansions["Low h"], expansions["Cross"]) < expansions["FIFO"] / 4
+
+def test_jps_matches_a_star_in_every_movement_model():
+    """Test if JPS finds paths as short as A* with 4-way, 8-way and strict 8-way moves."""
+    grid = Grid.from_map(generate_maze_map("Kruskal", 31, 31, seed=6))
+    for row in grid.grid[8:23]:
+        for cell in row[8:23]:
+            cell.reset()  # An open room in the middle of the maze, where diagonal moves pay off
+    lengths = {}
+    for movement in MOVEMENTS:
+        grid.update_valid_neighbors(movement)
+        heuristic = Heuristic.manhattan if movement == MOVE_4 else Heuristic.octile
+        a_star = run_search(grid, "A*", (1, 1), (29, 29), heuristic)
+        jps = run_search(grid, "JPS", (1, 1), (29, 29), heuristic)
+        assert a_star.found and jps.found
+        assert abs(jps.path_length - a_star.path_length) < 1e-9, movement
+        lengths[movement] = a_star.path_length
+    assert lengths[MOVE_8] < lengths[MOVE_8_NO_CORNERS] < lengths[MOVE_4]
+
+def test_theta_star_finds_shorter_any_angle_paths():
+    """Test if Theta* and Lazy Theta* cut corners A* can't, and Lazy Theta* checks line of sight less often."""
+    grid = Grid(31, 31)
+    for row in range(4, 27):
+        grid.grid[row][15].make_barrier()
+    grid.update_valid_neighbors(MOVE_8_NO_CORNERS)
+    a_star = run_search(grid, "A*", (3, 3), (27, 26), Heuristic.octile)
+    theta = run_search(grid, "Theta*", (3, 3), (27, 26), Heuristic.euclidean)
+    lazy = run_search(grid, "Lazy Theta*", (3, 3), (27, 26), Heuristic.euclidean)
+    assert lazy.path_length < a_star.path_length and theta.path_length < a_star.path_length
+    assert theta.path_length > 2 ** 0.5 * 23, "the wall is in the way of the straight line"
+    assert lazy.line_of_sight_checks < theta.line_of_sight_checks and theta.line_of_sight_cache_hits > 0
+
+def test_memory_bounded_searches_stay_within_their_memory():
+    """Test if IDA*, Fringe Search and SMA* find A*'s path length, and report the memory they kept and their re-expansions."""
+    grid = Grid.from_map(generate_maze_map("Kruskal", 33, 33, seed=4))
+    grid.update_valid_neighbors()
+    optimal = run_search(grid, "A*", (1, 1), (31, 31)).path_length
+    ida_star, fringe = run_search(grid, "IDA*", (1, 1), (31, 31)), run_search(grid, "Fringe", (1, 1), (31, 31))
+    assert ida_star.found and fringe.found and ida_star.path_length == fringe.path_length == optimal
+    assert ida_star.iterations > 1 and ida_star.reexpansions > 0 and fringe.peak_stored > optimal
+    algorithm = IDAStarAlgorithm(grid.grid, Heuristic.manhattan, table_size=0)
+    algorithm.verbose = False
+    metrics = algorithm.find_path(grid.grid[1][1], grid.grid[31][31], lambda: None)
+    assert metrics.path_length == optimal and metrics.peak_stored == optimal, "without its table IDA* only keeps the path up to the goal"
+
+    # A walled off goal on an open grid: the table keeps IDA* from retrying every path, the limit stops it
+    grid = Grid(5, 5)
+    for col, row in ((3, 4), (3, 3), (4, 3)):
+        grid.grid[row][col].make_barrier()
+    grid.update_valid_neighbors(MOVE_8)
+    unreachable = run_search(grid, "IDA*", (0, 0), (4, 4), Heuristic.octile)
+    assert not unreachable.found and not unreachable.gave_up
+    algorithm = IDAStarAlgorithm(grid.grid, Heuristic.octile, expansion_limit=1000)
+    algorithm.verbose = False
+    assert algorithm.find_path(grid.grid[0][0], grid.grid[4][4], lambda: None).gave_up
+
+    # SMA* has to forget and regenerate cells to fit an open grid in 100 nodes
+    grid = Grid(15, 15)
+    for row in range(3, 12, 4):
+        for col in range(1 + row % 8, 14, 3):
+            grid.grid[row][col].make_barrier()
+    grid.update_valid_neighbors()
+    algorithm = SMAStarAlgorithm(grid.grid, Heuristic.euclidean, node_limit=100)
+    algorithm.verbose = False
+    metrics = algorithm.find_path(grid.grid[0][0], grid.grid[14][14], lambda: None)
+    assert metrics.found and metrics.path_length == run_search(grid, "A*", (0, 0), (14, 14)).path_length
+    assert metrics.peak_stored <= 100 + 4 and metrics.reexpansions > 0, "at most one expansion's neighbors over the limit"
+
+def test_ara_star_improves_its_path_within_the_bound():
+    """Test if ARA* ends with the shortest path given time, every path is within its bound, and the budget holds before the first path."""
+    grid = Grid.from_map(generate_maze_map("Prim", 31, 31, seed=1))
+    for row in range(8, 23):
+        for col in range(8, 23):
+            grid.grid[row][col].reset()  # An open room, so the inflated heuristic has a detour to take
+    grid.update_valid_neighbors()
+    optimal = run_search(grid, "A*", (1, 1), (29, 29)).path_length
+
+    algorithm = ARAStarAlgorithm(grid.grid, Heuristic.manhattan, time_budget=60)
+    algorithm.verbose = False
+    metrics = algorithm.find_path(grid.grid[1][1], grid.grid[29][29], lambda: None)
+    assert metrics.found and metrics.path_length == optimal and metrics.suboptimality_bound == 1
+    lengths, bounds = [s["path_length"] for s in metrics.improvements], [s["bound"] for s in metrics.improvements]
+    assert lengths[0] > optimal, "the inflated heuristic's first path takes a detour"
+    assert lengths == sorted(lengths, reverse=True) and bounds == sorted(bounds, reverse=True)
+    assert all(optimal <= length <= bound * optimal for length, bound in zip(lengths, bounds))
+
+    # No time at all: the search stops before its first path, the budget goes through run_search
+    metrics = run_search(grid, "ARA*", (1, 1), (29, 29), time_budget=0)
+    assert not metrics.found and metrics.gave_up and metrics.improvements == []
+
+def test_integer_open_lists_match_the_heap():
+    """Test if A* picks an integer open list on 4-way grids, and every open list gives the heap's search."""
+    grid = Grid.from_map(generate_maze_map("Wilson", 31, 31, seed=3))
+    grid.update_valid_neighbors()
+    searches = {}
+    for open_list in ("binary heap", "bucket queue", "radix heap"):
+        algorithm = AStarAlgorithm(grid.grid, Heuristic.manhattan, open_list=open_list)
+        algorithm.verbose = False
+        searches[open_list] = algorithm.find_path(grid.grid[1][1], grid.grid[29][29], lambda: None)
+    assert len({metrics.path_length for metrics in searches.values()}) == 1
+    assert searches["bucket queue"].expansions == searches["binary heap"].expansions, "both keep FIFO ties"
+    assert run_search(grid, "A*", (1, 1), (29, 29)).open_list == "bucket queue"
+
+    grid.update_valid_neighbors(MOVE_8)
+    assert run_search(grid, "A*", (1, 1), (29, 29), Heuristic.octile).open_list == "binary heap"
+
+    for queue in (BucketQueue(), RadixHeap()):
+        for priority in (5, 3, 900, 3, 70):
+            queue.push(priority, priority)
+        assert [queue.pop()[0] for _ in range(len(queue))] == [3, 3, 5, 70, 900]
+
+def test_query_pool_answers_from_the_shared_grid():
+    """Test if pool workers answer queries like run_search, and see the owner's edits as a new version."""
+    grid_map = generate_maze_map("Kruskal", 21, 21, seed=5)
+    grid = Grid.from_map(grid_map)
+    grid.update_valid_neighbors()
+    queries = [{"start": (1, 1), "goal": (col, 19)} for col in range(1, 20, 2)]
+    with SharedGrid.create(grid_map) as shared, QueryPool(processes=2, batch_size=3) as pool:
+        answers = pool.run(shared, queries)
+        assert [answer["path_length"] for answer in answers] == [run_search(grid, "A*", query["start"], query["goal"]).path_length for query in queries]
+        assert {answer["version"] for answer in answers} == {0}
+
+        grid.grid[19][19].make_barrier()
+        shared.sync(grid)
+        shared.sync(grid)  # Nothing changed, same version
+        answers = pool.run(shared, queries)
+        assert shared.version == 1 and {answer["version"] for answer in answers} == {1}
+        assert "error" in answers[-1] and answers[0]["found"]
+
+def test_query_server_answers_batches_and_reports_stats(tmp_path):
+    """Test if the query server loads a maze, answers a batch of queries, takes edits, rejects bad maps and reports latency percentiles."""
+    def request(path, data=None):
+        body = json.dumps(data).encode() if data is not None else None
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}{path}", body) as response:
+            return json.loads(response.read())
+
+    with QueryServer(("127.0.0.1", 0), processes=1) as server:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        assert request("/maps/maze", {"maze": "Kruskal", "width": 21, "height": 21, "seed": 5})["version"] == 0
+        results = request("/query", {"map": "maze", "queries": [{"start": [1, 1], "goal": [col, 19]} for col in range(1, 20, 2)]})["results"]
+        assert len(results) == 10 and all(result["found"] for result in results)
+
+        assert request("/maps/maze/barriers", {"set": [[19, 19]]})["version"] == 1
+        assert "error" in request("/query", {"map": "maze", "start": [1, 1], "goal": [19, 19]})["results"][0]
+        queries = [{"start": [1, 1], "goal": [17, 19], "algorithm": "ARA*", "time_budget": budget} for budget in (0, 10)]
+        no_time, enough_time = request("/query", {"map": "maze", "queries": queries})["results"]
+        assert no_time["gave_up"] and not no_time["found"] and enough_time["found"]
+
+        (tmp_path / "broken.map").write_text("type octile\nheight 4\nwidth 5\n")
+        (tmp_path / "broken.aamap").write_bytes(b"AAMP")
+        for spec in ({"maze": "RecursiveDFS", "width": 2, "height": 21}, {"path": str(tmp_path / "broken.map")}, {"path": str(tmp_path / "broken.aamap")}):
+            with pytest.raises(urllib.error.HTTPError) as error:
+                request("/maps/broken", spec)
+            assert error.value.code == 400
+
+        stats = request("/stats")
+        assert stats["requests"] == 8 and stats["errors"] == 3 and stats["queries"] == 13
+        assert 0 < stats["latency_ms"]["p50"] <= stats["latency_ms"]["p90"] <= stats["latency_ms"]["p99"]
+        server.shutdown()
+
+def test_query_server_closes_a_reloaded_map_after_its_last_request():
+    """Test if reloading a map's name keeps the old shared memory until the requests still searching it are done."""
+    with QueryServer(("127.0.0.1", 0), processes=1) as server:
+        server.load_map("maze", {"maze": "Kruskal", "width": 21, "height": 21, "seed": 5})
+        with server.use_map("maze") as previous:
+            server.load_map("maze", {"maze": "Prim", "width": 21, "height": 21, "seed": 5})
+            assert server.pool.run(previous, [{"start": [1, 1], "goal": [19, 19]}])[0]["found"]
+        assert previous.memory is None, "the replaced map should be closed after its last request"
+        assert server.query({"map": "maze", "start": [1, 1], "goal": [19, 19]})[0]["found"]
+
+def test_command_line_prints_counters_as_json(capsys):
+    """Test if the headless command line sorts and searches without a window and prints only JSON."""
+    output = subprocess.run([sys.executable, "-m", "algoassist", "sort", "Merge Sort", "--size", "40", "--seed", "3"], capture_output=True, text=True, check=True).stdout
+    result = json.loads(output)
+    assert result["sorted"] and result["comparisons"] > 0 and result["array_accesses"] > 0 and result["time"] > 0
+
+    algoassist.main(["path", "A*", "--maze", "Prim", "--width", "21", "--height", "21", "--seed", "2", "--repeat", "2"])
+    results = json.loads(capsys.readouterr().out)
+    assert len(results) == 2 and results[0]["found"] and results[0]["nodes_visited"] == results[1]["nodes_visited"] > 0
+    assert results[0]["start"] == [1, 1] and results[0]["goal"] == [19, 19]
+
+def test_graph_searches_run_on_grids_and_csr_graphs(tmp_path, monkeypatch):
+    """Test if the graph searches match the grid A* through a GridGraph and its CSR copy, and search a DIMACS graph."""
+    grid = Grid.from_map(generate_maze_map("Prim", 31, 31, seed=3))
+    grid.update_valid_neighbors(MOVE_8_NO_CORNERS)
+    optimal = run_search(grid, "A*", (1, 1), (29, 29), Heuristic.octile).path_length
+    grid_graph = GridGraph(grid)
+    for graph in (grid_graph, CSRGraph.from_provider(grid_graph)):
+        source, target = grid_graph.node(1, 1), grid_graph.node(29, 29)
+        assert abs(GraphAStar(graph, Heuristic.octile).find_path(source, target).path_length - optimal) < 1e-9
+        assert abs(GraphDijkstra(graph).find_path(source, target).path_length - optimal) < 1e-9
+
+    # 1 -> 3 -> 4 -> 5 costs 30 and 1 -> 2 -> 5 costs 200 but has fewer edges, which BFS takes
+    (tmp_path / "tiny.gr").write_text("c tiny graph\np sp 5 6\na 1 2 100\na 2 5 100\na 1 3 10\na 3 4 10\na 4 5 10\na 5 1 1\n")
+    graph = CSRGraph.load_dimacs(tmp_path / "tiny.gr")
+    assert graph.node_count == 5 and graph.edge_count == 6 and graph.integral
+    dijkstra = GraphDijkstra(graph)
+    metrics = dijkstra.find_path(0, 4)
+    assert metrics.path_length == 30 and dijkstra.path == [0, 2, 3, 4] and metrics.open_list == "radix heap"
+    bfs = GraphBFS(graph)
+    assert bfs.find_path(0, 4).path_length == 200 and bfs.path == [0, 1, 4]
+    assert GraphDijkstra(graph).find_path(1, 2).path_length == 111  # 2 -> 5 -> 1 -> 3
+
+    # Whole-number float weights are stored as integers, with or without NumPy
+    for numpy_missing in (False, True):
+        if numpy_missing:
+            monkeypatch.setattr("pathfinding.graph.np", None)
+        graph = CSRGraph.from_edges(3, [(0, 1, 1.0), (1, 2, 2.0)])
+        assert graph.integral and list(graph.weights) == [1, 2]
+        assert GraphDijkstra(graph).find_path(0, 2).path_length == 3
+